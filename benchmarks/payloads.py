@@ -0,0 +1,101 @@
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List
+
+
+_TITLES = [
+    "Python-разработчик", "Backend Developer", "Java Developer", "Аналитик данных", "QA Engineer",
+    "DevOps-инженер", "Frontend Developer (React)", "Data Scientist", "Тестировщик", "Go Developer",
+    "Системный администратор", "Product Manager", "Менеджер проектов", "1С-программист",
+]
+_LEVELS = ["Junior", "Middle", "Senior", "Lead", "Стажёр", "Ведущий", "Старший", ""]
+_EMPLOYERS = [f"{name} {suffix}" for name in ("Яндекс", "Сбер", "Ozon", "VK", "Тинькофф", "Avito",
+                                             "Ромашка", "Альфа", "Kaspersky", "МТС")
+              for suffix in ("", "Технологии", "Digital", "Lab", "Group")]
+_WORDS = (
+    "опыт работы python django flask sql postgresql docker kubernetes linux git rest api "
+    "микросервисы высоконагруженные системы английский язык командная работа тестирование "
+    "asyncio kafka redis celery ci/cd аналитическое мышление ответственность java spring "
+    "react typescript go clickhouse airflow pandas numpy machine learning разработка поддержка"
+).split()
+_CURRENCIES = ["RUR"] * 8 + ["USD", "EUR", "KZT"]
+_AREAS = [(1, "Москва"), (2, "Санкт-Петербург"), (4, "Новосибирск"), (88, "Казань"), (113, "Россия")]
+
+
+def _sentence(rng: random.Random, low: int, high: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(low, high))).capitalize() + "."
+
+
+def generate_item(rng: random.Random, vacancy_id: int, published: datetime) -> Dict[str, Any]:
+    """Одна вакансия в формате ответа hh.ru /vacancies."""
+    salary = None
+    if rng.random() < 0.6:
+        low = rng.randrange(30, 400) * 1000
+        salary = {
+            "from": low if rng.random() < 0.85 else None,
+            "to": low + rng.randrange(0, 200) * 1000 if rng.random() < 0.6 else None,
+            "currency": rng.choice(_CURRENCIES),
+            "gross": rng.random() < 0.5,
+        }
+    employer_id = rng.randrange(len(_EMPLOYERS))
+    area_id, area_name = rng.choice(_AREAS)
+    title = f"{rng.choice(_LEVELS)} {rng.choice(_TITLES)}".strip()
+    return {
+        "id": str(vacancy_id),
+        "premium": False,
+        "name": title,
+        "department": None,
+        "has_test": rng.random() < 0.1,
+        "response_letter_required": False,
+        "area": {"id": str(area_id), "name": area_name, "url": f"https://api.hh.ru/areas/{area_id}"},
+        "salary": salary,
+        "type": {"id": "open", "name": "Открытая"},
+        "address": None,
+        "response_url": None,
+        "published_at": published.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "created_at": published.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "archived": False,
+        "apply_alternate_url": f"https://hh.ru/applicant/vacancy_response?vacancyId={vacancy_id}",
+        "url": f"https://api.hh.ru/vacancies/{vacancy_id}?host=hh.ru",
+        "alternate_url": f"https://hh.ru/vacancy/{vacancy_id}",
+        "employer": {
+            "id": str(1000 + employer_id),
+            "name": _EMPLOYERS[employer_id].strip(),
+            "url": f"https://api.hh.ru/employers/{1000 + employer_id}",
+            "alternate_url": f"https://hh.ru/employer/{1000 + employer_id}",
+            "trusted": True,
+        },
+        "snippet": {
+            "requirement": _sentence(rng, 8, 25) if rng.random() < 0.95 else None,
+            "responsibility": _sentence(rng, 8, 25),
+        },
+        "schedule": {"id": "fullDay", "name": "Полный день"},
+        "professional_roles": [{"id": "96", "name": "Программист, разработчик"}],
+        "experience": {"id": "between1And3", "name": "От 1 года до 3 лет"},
+        "employment": {"id": "full", "name": "Полная занятость"},
+    }
+
+
+def generate_items(count: int, seed: int = 42) -> Iterator[Dict[str, Any]]:
+    """Детерминированный (по seed) поток из count вакансий, от новых к старым."""
+    rng = random.Random(seed)
+    published = datetime(2024, 1, 1, tzinfo=timezone(timedelta(hours=3)))
+    for i in range(count):
+        published -= timedelta(seconds=rng.randint(1, 120))
+        yield generate_item(rng, 10_000_000 + i, published)
+
+
+def generate_pages(count: int, per_page: int = 100, seed: int = 42) -> List[Dict[str, Any]]:
+    """Ответы /vacancies постранично: items, found, pages, page, per_page."""
+    items = list(generate_items(count, seed))
+    pages = max((count + per_page - 1) // per_page, 1)
+    return [
+        {
+            "items": items[page * per_page:(page + 1) * per_page],
+            "found": count,
+            "pages": pages,
+            "page": page,
+            "per_page": per_page,
+        }
+        for page in range(pages)
+    ]
@@ -0,0 +1,230 @@
+"""
+Набор бенчмарков без доступа к сети.
+
+    python -m benchmarks.run --sizes 1000 100000 --output bench.json
+
+Для каждого размера генерируется детерминированный набор вакансий в формате hh.ru
+и замеряются: разбор (from_hh_json / cast_to_object_list), операции JSONSaver,
+функции utils/filters.py, загрузку дампов (ingest_dumps), время запуска CLI и HeadHunterAPI.get_vacancies против локального сервера.
+Результаты пишутся в JSON, чтобы сравнивать прогоны между собой.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from vacancy_app.models.vacancy import Vacancy
+from vacancy_app.pipeline.dumps import ingest_dumps
+from vacancy_app.storage.json_saver import JSONSaver
+from vacancy_app.utils.filters import (
+    filter_vacancies_by_keyword,
+    filter_vacancies_by_salary_range,
+    sort_vacancies_by_salary,
+)
+from .payloads import generate_items, generate_pages
+from .stub_server import StubHHServer
+
+
+HH_MAX_RESULTS = 2000  # hh.ru отдаёт не больше 2000 вакансий на один запрос
+
+
+def measure(
+    name: str,
+    size: int,
+    func: Callable[[], Any],
+    setup: Optional[Callable[[], None]] = None,
+    repeat: int = 3,
+    items: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Запускает func repeat раз (setup не входит в замер) и возвращает сводку по времени."""
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    result = {
+        "name": name,
+        "size": size,
+        "repeat": repeat,
+        "seconds_min": best,
+        "seconds_median": statistics.median(timings),
+    }
+    if items:
+        result["items_per_second"] = items / best if best else None
+    return result
+
+
+def bench_parsing(size: int, raw: List[Dict[str, Any]], repeat: int) -> List[Dict[str, Any]]:
+    return [
+        measure("vacancy.from_hh_json", size, lambda: [Vacancy.from_hh_json(i) for i in raw], repeat=repeat, items=size),
+        measure("vacancy.cast_to_object_list", size, lambda: Vacancy.cast_to_object_list(raw), repeat=repeat, items=size),
+    ]
+
+
+def bench_storage(size: int, vacancies: List[Vacancy], repeat: int, workdir: str) -> List[Dict[str, Any]]:
+    path = os.path.join(workdir, f"bench_{size}.json")
+
+    def fresh() -> None:
+        if os.path.exists(path):
+            os.remove(path)
+
+    def filled() -> None:
+        fresh()
+        JSONSaver(path).add_vacancies(vacancies)
+
+    probe = vacancies[size // 2]
+    results = [
+        measure("json_saver.add_vacancies", size, lambda: JSONSaver(path).add_vacancies(vacancies),
+                setup=fresh, repeat=repeat, items=size),
+        measure("json_saver.add_vacancy_one", size, lambda: JSONSaver(path).add_vacancy(probe),
+                setup=filled, repeat=repeat),
+    ]
+    filled()
+    results += [
+        measure("json_saver.get_vacancies", size, lambda: JSONSaver(path).get_vacancies(),
+                repeat=repeat, items=size),
+        measure("json_saver.iter_vacancies", size, lambda: sum(1 for _ in JSONSaver(path).iter_vacancies()),
+                repeat=repeat, items=size),
+        measure("json_saver.delete_vacancy", size, lambda: JSONSaver(path).delete_vacancy(probe.url),
+                setup=filled, repeat=repeat),
+    ]
+    return results
+
+
+def bench_filters(size: int, vacancies: List[Vacancy], repeat: int) -> List[Dict[str, Any]]:
+    return [
+        measure("filters.by_keyword", size, lambda: filter_vacancies_by_keyword(vacancies, ["python", "sql"]),
+                repeat=repeat, items=size),
+        measure("filters.by_salary_range", size, lambda: filter_vacancies_by_salary_range(vacancies, 100000, 200000),
+                repeat=repeat, items=size),
+        measure("filters.sort_by_salary", size, lambda: sort_vacancies_by_salary(vacancies),
+                repeat=repeat, items=size),
+    ]
+
+
+def bench_dumps(size: int, repeat: int, workdir: str) -> List[Dict[str, Any]]:
+    dump_dir = os.path.join(workdir, f"dumps_{size}")
+    os.makedirs(dump_dir, exist_ok=True)
+    per_file = max(size // 16, 1)
+    for n, page in enumerate(generate_pages(size, per_page=per_file)):
+        with open(os.path.join(dump_dir, f"page{n:04d}.json"), "w", encoding="utf-8") as f:
+            json.dump(page, f, ensure_ascii=False)
+    path = os.path.join(workdir, f"dumps_{size}.json")
+
+    def fresh() -> None:
+        if os.path.exists(path):
+            os.remove(path)
+
+    results = []
+    for n in sorted({1, os.cpu_count() or 1}):
+        results.append(measure(f"dumps.ingest[workers={n}]", size,
+                               lambda: ingest_dumps([dump_dir], JSONSaver(path), max_workers=n),
+                               setup=fresh, repeat=repeat, items=size))
+    return results
+
+
+def bench_cli_startup(size: int, vacancies: List[Vacancy], repeat: int, workdir: str) -> List[Dict[str, Any]]:
+    """Полное время запуска `python -m vacancy_app.cli` (интерпретатор, импорты, чтение хранилища)."""
+    path = os.path.join(workdir, f"cli_{size}.json")
+    if not os.path.exists(path):
+        JSONSaver(path).add_vacancies(vacancies)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    def run_cli(*args: str) -> Callable[[], None]:
+        command = [sys.executable, "-m", "vacancy_app.cli", "--store", path, *args]
+        return lambda: subprocess.run(command, cwd=root, stdout=subprocess.DEVNULL, check=True)
+
+    return [
+        measure("cli.python_startup", size, lambda: subprocess.run([sys.executable, "-c", "pass"], check=True),
+                repeat=repeat),
+        measure("cli.top_10", size, run_cli("top", "10"), repeat=repeat),
+        measure("cli.stats", size, run_cli("stats"), repeat=repeat),
+    ]
+
+
+def bench_api(size: int, repeat: int, workers: List[int]) -> List[Dict[str, Any]]:
+    try:
+        from vacancy_app.api.hh_api import HeadHunterAPI
+        from vacancy_app.api.scheduler import RequestScheduler
+    except ImportError as exc:  # requests не установлен
+        return [{"name": "hh_api.get_vacancies", "size": size, "skipped": str(exc)}]
+
+    count = min(size, HH_MAX_RESULTS)
+    per_page = 100
+    pages = generate_pages(count, per_page=per_page)
+    results = []
+    with StubHHServer(pages) as server:
+        for n in workers:
+            api = HeadHunterAPI(max_workers=n, scheduler=RequestScheduler(rate=None, max_concurrency=n))
+            api.BASE_URL = server.url
+            result = measure(
+                f"hh_api.get_vacancies[workers={n}]", size,
+                lambda: api.get_vacancies("python", per_page=per_page, pages=len(pages)),
+                repeat=repeat, items=count,
+            )
+            api.close()
+            results.append(result)
+    return results
+
+
+def run(sizes: List[int], repeat: int = 3, seed: int = 42, workers: Optional[List[int]] = None) -> Dict[str, Any]:
+    """Прогоняет все бенчмарки и возвращает отчёт в виде словаря."""
+    results = []
+    with tempfile.TemporaryDirectory(prefix="vacancy-bench-") as workdir:
+        for size in sizes:
+            raw = list(generate_items(size, seed))
+            vacancies = Vacancy.cast_to_object_list(raw)
+            results += bench_parsing(size, raw, repeat)
+            results += bench_storage(size, vacancies, repeat, workdir)
+            results += bench_filters(size, vacancies, repeat)
+            results += bench_dumps(size, repeat, workdir)
+            results += bench_cli_startup(size, vacancies, repeat, workdir)
+            results += bench_api(size, repeat, workers or [1, 8])
+            del raw, vacancies
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "seed": seed,
+            "sizes": sizes,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Бенчмарки vacancy_app без доступа к сети")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000],
+                        help="размеры наборов вакансий (например: 1000 100000 1000000)")
+    parser.add_argument("--repeat", type=int, default=3, help="число повторов каждого замера")
+    parser.add_argument("--seed", type=int, default=42, help="seed генератора данных")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8],
+                        help="число потоков для HeadHunterAPI.get_vacancies")
+    parser.add_argument("--output", default="benchmark_results.json", help="файл для результатов (JSON)")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, repeat=args.repeat, seed=args.seed, workers=args.workers)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    for r in report["results"]:
+        if "skipped" in r:
+            print(f"{r['name']:<40} {r['size']:>9}  skipped: {r['skipped']}")
+        else:
+            print(f"{r['name']:<40} {r['size']:>9}  {r['seconds_min'] * 1000:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
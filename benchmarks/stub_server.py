@@ -0,0 +1,44 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+from urllib.parse import parse_qs, urlparse
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        params = parse_qs(urlparse(self.path).query)
+        page = int(params.get("page", ["0"])[0])
+        bodies = self.server.bodies
+        body = bodies[page] if page < len(bodies) else json.dumps({"items": [], "pages": len(bodies)}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubHHServer:
+    """Локальный HTTP-сервер, отдающий заранее сгенерированные страницы /vacancies."""
+
+    def __init__(self, pages: List[Dict[str, Any]]):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.bodies = [json.dumps(p, ensure_ascii=False).encode("utf-8") for p in pages]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def __enter__(self) -> "StubHHServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
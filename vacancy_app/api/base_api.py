@@ -1,6 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
-import requests
+import time
+from typing import List, Dict, Any, Optional, Iterator
+from urllib.parse import urlparse
+
+from vacancy_app.models.vacancy import Vacancy
+from vacancy_app.utils.metrics import registry as metrics
+from .cache import ResponseCache
 
 
 class BaseJobsAPI(ABC):
@@ -9,19 +14,75 @@ class BaseJobsAPI(ABC):
     """
 
     BASE_URL: Optional[str] = None
+    cache: Optional[ResponseCache] = None  # кэш ответов; None — без кэширования
+
+
+    def _send(self, url: str, params: Dict[str, Any], headers: Dict[str, str]) -> "requests.Response":
+        """
+        Выполняет HTTP GET-запрос. Подклассы переопределяют метод,
+        чтобы добавить свои заголовки, пул соединений и т. п.
+        requests импортируется здесь, а не в модуле, чтобы операции без сети его не загружали.
+        """
+        import requests
+
+        return requests.get(url, params=params, headers=headers)
+
+
+    def _request(self, url: str, params: Dict[str, Any], headers: Dict[str, str]) -> "requests.Response":
+        """
+        Вызывает _send и при включённых метриках записывает задержку, статус,
+        размер ответа и номер страницы запроса.
+        """
+        if not metrics.enabled:
+            return self._send(url, params, headers)
+
+        endpoint = urlparse(url).path
+        start = time.perf_counter()
+        try:
+            response = self._send(url, params, headers)
+        except Exception:
+            metrics.inc("api_errors_total", endpoint=endpoint)
+            raise
+        metrics.observe("api_request_seconds", time.perf_counter() - start, endpoint=endpoint)
+        metrics.inc("api_requests_total", endpoint=endpoint, status=response.status_code)
+        metrics.inc("api_response_bytes_total", len(response.content), endpoint=endpoint)
+        if "page" in params:
+            metrics.inc("api_pages_total", endpoint=endpoint)
+            metrics.set("api_last_page", params["page"], endpoint=endpoint)
+        return response
 
 
     def _connect(self, endpoint: str = "", params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Приватный метод подключения к API.
+        Если задан кэш, свежий ответ берётся из него, а устаревший перепроверяется по ETag.
         """
         if not self.BASE_URL:
             raise ValueError("BASE_URL не определён в дочернем классе API.")
 
         url = f"{self.BASE_URL.rstrip('/')}/{endpoint.lstrip('/')}"
-        response = requests.get(url, params=params or {})
+        params = params or {}
+        if self.cache is None:
+            response = self._request(url, params, {})
+            response.raise_for_status()
+            return response.json()
+
+        key = self.cache.make_key(url, params)
+        entry = self.cache.lookup(key)
+        if entry is not None and entry.fresh:
+            metrics.inc("api_cache_hits_total")
+            return entry.data
+
+        headers = {"If-None-Match": entry.etag} if entry is not None and entry.etag else {}
+        response = self._request(url, params, headers)
+        if response.status_code == 304 and entry is not None:
+            self.cache.revalidated(key)
+            return entry.data
+
         response.raise_for_status()
-        return response.json()
+        data = response.json()
+        self.cache.store(key, data, response.headers.get("ETag"))
+        return data
 
 
     @abstractmethod
@@ -30,3 +91,20 @@ class BaseJobsAPI(ABC):
         Абстрактный метод для получения списка вакансий.
         """
         raise NotImplementedError("Метод get_vacancies() должен быть реализован в подклассе.")
+
+
+    def iter_pages(self, query: str, per_page: int = 20, pages: int = 1) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Генератор страниц результатов. По умолчанию отдаёт весь результат get_vacancies()
+        одной страницей; подклассы переопределяют метод для постраничной загрузки.
+        """
+        yield self.get_vacancies(query, per_page=per_page, pages=pages)
+
+
+    def iter_vacancies(self, query: str, per_page: int = 20, pages: int = 1, **kwargs) -> Iterator[Vacancy]:
+        """
+        Генератор объектов Vacancy: каждая страница преобразуется сразу после загрузки,
+        поэтому в памяти одновременно находится не больше одной страницы.
+        """
+        for items in self.iter_pages(query, per_page=per_page, pages=pages, **kwargs):
+            yield from Vacancy.cast_to_object_list(items)
@@ -0,0 +1,143 @@
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Callable
+
+
+@dataclass
+class CacheEntry:
+    """Запись кэша: тело ответа, его ETag и признак свежести (не истёк ли TTL)."""
+
+    data: Dict[str, Any]
+    etag: Optional[str]
+    fresh: bool
+
+
+class ResponseCache:
+    """
+    Персистентный кэш ответов API в файле SQLite.
+    Ключ — URL эндпоинта плюс нормализованные параметры запроса.
+    Свежие записи (моложе ttl секунд) отдаются без обращения к сети; устаревшие
+    перепроверяются условным запросом If-None-Match по сохранённому ETag.
+    При превышении max_entries вытесняются давно не использованные записи (LRU).
+    """
+
+
+    def __init__(
+        self,
+        filepath: str = "http_cache.db",
+        ttl: float = 3600,
+        max_entries: int = 10000,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        :param filepath: путь к файлу кэша (":memory:" — кэш в памяти)
+        :param ttl: время жизни записи в секундах
+        :param max_entries: максимальное число записей
+        :param clock: источник текущего времени (подменяется в тестах)
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0  # ответы из кэша без запроса к сети
+        self.misses = 0  # записи не было или она устарела
+        self.revalidations = 0  # сервер ответил 304 Not Modified
+        self.evictions = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(filepath, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key         TEXT PRIMARY KEY,
+                body        TEXT NOT NULL,
+                etag        TEXT,
+                stored_at   REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS ix_responses_accessed ON responses (accessed_at);
+            """
+        )
+
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Строит ключ кэша: порядок параметров и типы значений не влияют на результат."""
+        normalized = sorted((str(k), str(v)) for k, v in (params or {}).items())
+        return json.dumps([url, normalized], ensure_ascii=False, separators=(",", ":"))
+
+
+    def lookup(self, key: str) -> Optional[CacheEntry]:
+        """Ищет запись и учитывает обращение в статистике и порядке LRU."""
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            fresh = now - row[2] < self.ttl
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return CacheEntry(data=json.loads(row[0]), etag=row[1], fresh=fresh)
+
+
+    def store(self, key: str, data: Dict[str, Any], etag: Optional[str] = None) -> None:
+        """Сохраняет ответ и при необходимости вытесняет самые давние записи."""
+        now = self._clock()
+        body = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, body, etag, stored_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, body, etag, now, now),
+            )
+            excess = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                    (excess,),
+                )
+                self.evictions += excess
+
+
+    def revalidated(self, key: str) -> None:
+        """Продлевает жизнь записи после ответа 304 Not Modified."""
+        now = self._clock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key)
+            )
+            self.revalidations += 1
+
+
+    def clear(self) -> None:
+        """Удаляет все записи и обнуляет статистику."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+            self.hits = self.misses = self.revalidations = self.evictions = 0
+
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Счётчики попаданий и промахов для подбора TTL."""
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "evictions": self.evictions,
+            "size": size,
+        }
+
+
+    def close(self) -> None:
+        """Закрывает файл кэша."""
+        self._conn.close()
@@ -0,0 +1,99 @@
+import html
+import json
+import os
+import re
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from vacancy_app.models.vacancy import Vacancy
+
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+_ID_RE = re.compile(r"/vacancy/(\d+)")
+
+
+def strip_html(text: Optional[str]) -> str:
+    """Превращает HTML-описание вакансии hh.ru в обычный текст."""
+    if not text:
+        return ""
+    return _SPACE_RE.sub(" ", html.unescape(_TAG_RE.sub(" ", text))).strip()
+
+
+def vacancy_id(url: str) -> Optional[str]:
+    """Извлекает ID вакансии hh.ru из её URL (https://hh.ru/vacancy/<id>)."""
+    match = _ID_RE.search(url or "")
+    return match.group(1) if match else None
+
+
+@dataclass
+class EnrichReport:
+    """Итог обогащения: загружено, взято из кэша, не найдено на hh.ru и завершилось ошибкой."""
+
+    fetched: int = 0
+    cached: int = 0
+    missing: int = 0
+    failed: int = 0
+    updated: int = 0  # вакансий, у которых изменилось описание (записаны в хранилище)
+    vacancies: List[Vacancy] = field(default_factory=list, repr=False)
+
+
+class DetailCache:
+    """
+    Локальный кэш полных описаний вакансий в JSON-файле: ID -> {"stamp", "description"}.
+    stamp — published_at вакансии: если он не изменился, повторно загружать документ не нужно.
+    Изменения накапливаются в памяти и записываются атомарно методом save().
+    """
+
+
+    def __init__(self, filepath: str = "vacancy_details.json"):
+        self.filepath = filepath
+        self._lock = threading.Lock()
+        self._data: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        if os.path.exists(filepath):
+            with open(filepath, "r", encoding="utf-8") as f:
+                try:
+                    self._data = json.load(f)
+                except json.JSONDecodeError:
+                    self._data = {}
+
+
+    def get(self, vacancy_id: str, stamp: Optional[str] = None) -> Optional[str]:
+        """
+        Возвращает сохранённое описание, если оно актуально.
+        :param stamp: текущий published_at; None — считать запись актуальной
+        """
+        with self._lock:
+            entry = self._data.get(vacancy_id)
+        if entry is None or (stamp is not None and entry.get("stamp") != stamp):
+            return None
+        return entry["description"]
+
+
+    def put(self, vacancy_id: str, stamp: Optional[str], description: str) -> None:
+        with self._lock:
+            self._data[vacancy_id] = {"stamp": stamp, "description": description}
+            self._dirty = True
+
+
+    def save(self) -> None:
+        """Записывает кэш на диск, если он менялся (временный файл + os.replace)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            directory = os.path.dirname(os.path.abspath(self.filepath))
+            fd, tmp_path = tempfile.mkstemp(prefix=".details-", suffix=".tmp", dir=directory)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.filepath)
+            self._dirty = False
+
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
@@ -1,5 +1,14 @@
-from typing import List, Dict, Any
+import dataclasses
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple
+from vacancy_app.models.vacancy import Vacancy
 from .base_api import BaseJobsAPI
+from .cache import ResponseCache
+from .details import DetailCache, EnrichReport, strip_html, vacancy_id
+from .scheduler import RequestScheduler
 
 
 class HeadHunterAPI(BaseJobsAPI):
@@ -8,50 +17,245 @@ class HeadHunterAPI(BaseJobsAPI):
     BASE_URL = "https://api.hh.ru"  # базовый URL API hh.ru
 
 
-    def __init__(self, area: int = 113, user_agent: str = "hh-python-client/1.0"):
+    def __init__(
+        self,
+        area: int = 113,
+        user_agent: str = "hh-python-client/1.0",
+        max_workers: int = 1,
+        cache: Optional[ResponseCache] = None,
+        scheduler: Optional[RequestScheduler] = None,
+    ):
         """
         :param area: код региона (по умолчанию 113 — Россия)
         :param user_agent: строка User-Agent для идентификации клиента
+        :param max_workers: число потоков для параллельной загрузки страниц (1 — последовательно)
+        :param cache: персистентный кэш ответов (None — без кэширования)
+        :param scheduler: планировщик запросов (лимит частоты, повторы при 429/5xx)
         """
         self.area = area
         self.user_agent = user_agent
+        self.max_workers = max_workers
+        self.cache = cache
+        self.scheduler = scheduler or RequestScheduler()
+        self._session = None  # общий requests.Session с пулом соединений
+        self._pool_size = 0  # размер пула соединений текущего адаптера
+        self._session_lock = threading.Lock()
 
 
-    def _connect(self, endpoint: str = "", params: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    def _get_session(self, pool_size: int = 0):
         """
-        Приватный метод подключения к API hh.ru.
+        Возвращает общий requests.Session, создавая его при первом обращении.
+        Если нужно больше соединений, чем вмещает текущий пул, подключается адаптер
+        с пулом на pool_size соединений, чтобы потоки не теряли keep-alive соединения.
         """
-        import requests
+        with self._session_lock:
+            if self._session is None:
+                import requests
+
+                self._session = requests.Session()
+                self._session.headers["User-Agent"] = self.user_agent
+                self._pool_size = 0
+            pool_size = max(pool_size, self.max_workers, 1)
+            if pool_size > self._pool_size:
+                from requests.adapters import HTTPAdapter
+
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+                self._session.mount("https://", adapter)
+                self._session.mount("http://", adapter)
+                self._pool_size = pool_size
+            return self._session
+
+
+    def _send(self, url: str, params: Dict[str, Any], headers: Dict[str, str]):
+        """
+        Выполняет запрос к API hh.ru.
+        Соединения переиспользуются между запросами через общий пул сессии,
+        а частоту, конкурентность и повторы регулирует планировщик.
+        """
+        session = self._get_session()
+        return self.scheduler.execute(
+            lambda: session.get(url, params=params, headers=headers, timeout=10)
+        )
+
 
-        if not self.BASE_URL:
-            raise ValueError("BASE_URL не определён в классе HeadHunterAPI.")
+    def reserve_connections(self, pool_size: int) -> None:
+        """Готовит пул соединений не меньше чем на pool_size одновременных запросов."""
+        self._get_session(pool_size)
 
-        url = f"{self.BASE_URL.rstrip('/')}/{endpoint.lstrip('/')}"
-        headers = {"User-Agent": self.user_agent}
 
-        response = requests.get(url, params=params or {}, headers=headers, timeout=10)
-        response.raise_for_status()
-        return response.json()
+    def fetch_page(
+        self, query: str, per_page: int = 20, page: int = 0, extra: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Загружает одну страницу результатов поиска (ответ hh.ru целиком: items, found, pages).
+        Для параллельной загрузки из нескольких потоков заранее вызовите reserve_connections().
+        :param extra: дополнительные параметры поиска hh.ru (area, date_from, order_by и т. п.)
+        """
+        params = {
+            "text": query,
+            "area": self.area,
+            "per_page": per_page,
+            "page": page
+        }
+        params.update(extra or {})
+        return self._connect("/vacancies", params=params)
 
 
-    def get_vacancies(self, query: str, per_page: int = 20, pages: int = 1) -> List[Dict[str, Any]]:
+    def iter_pages(
+        self,
+        query: str,
+        per_page: int = 20,
+        pages: int = 1,
+        max_workers: Optional[int] = None,
+        params: Optional[Dict[str, Any]] = None,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Генератор страниц результатов поиска (списков вакансий в формате hh.ru).
+        Сначала загружается страница 0, из её ответа берётся общее число страниц.
+        При max_workers > 1 следующие страницы загружаются параллельно, но заранее
+        запрашивается не больше max_workers страниц, а отдаются они строго по порядку.
+        :param params: дополнительные параметры поиска (например, date_from или area)
+        :param meta: словарь, в который записываются found и pages из ответа на страницу 0
+        """
+        if pages < 1:
+            return
+
+        workers = max_workers or self.max_workers
+        self._get_session(workers)
+
+        first = self.fetch_page(query, per_page, 0, params)
+        if meta is not None:
+            meta.update(found=first.get("found"), pages=first.get("pages"))
+        yield first.get("items", [])
+
+        remaining = range(1, min(pages, first.get("pages", 0)))
+        if not remaining:
+            return
+
+        if workers <= 1:
+            for page in remaining:
+                yield self.fetch_page(query, per_page, page, params).get("items", [])
+            return
+
+        with ThreadPoolExecutor(max_workers=min(workers, len(remaining))) as pool:
+            pending = deque()
+            pages_iter = iter(remaining)
+            for page in islice(pages_iter, workers):
+                pending.append(pool.submit(self.fetch_page, query, per_page, page, params))
+            while pending:
+                data = pending.popleft().result()
+                for page in islice(pages_iter, 1):
+                    pending.append(pool.submit(self.fetch_page, query, per_page, page, params))
+                yield data.get("items", [])
+
+
+    def get_vacancies(
+        self,
+        query: str,
+        per_page: int = 20,
+        pages: int = 1,
+        max_workers: Optional[int] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
         """
         Получает список вакансий по запросу с hh.ru.
+        Результат всегда возвращается в порядке страниц (см. iter_pages).
         """
         results = []
+        for items in self.iter_pages(query, per_page, pages, max_workers, params):
+            results.extend(items)
+        return results
 
-        for page in range(pages):
-            params = {
-                "text": query,
-                "area": self.area,
-                "per_page": per_page,
-                "page": page
-            }
 
-            data = self._connect("/vacancies", params=params)
-            results.extend(data.get("items", []))
+    def _fetch_detail(self, vacancy_id: str) -> Tuple[str, Optional[Dict[str, Any]], bool]:
+        """
+        Загружает полный документ вакансии /vacancies/{id}.
+        :return: (ID, документ или None, True — вакансия удалена с hh.ru)
+        """
+        import requests
 
-            if page >= data.get("pages", 0) - 1:
-                break
+        try:
+            return vacancy_id, self._connect(f"/vacancies/{vacancy_id}"), False
+        except requests.HTTPError as exc:
+            missing = exc.response is not None and exc.response.status_code == 404
+            return vacancy_id, None, missing
+        except requests.RequestException:
+            return vacancy_id, None, False
 
-        return results
+
+    def enrich(
+        self,
+        vacancies: Iterable[Vacancy],
+        saver=None,
+        cache: Optional[DetailCache] = None,
+        max_workers: Optional[int] = None,
+    ) -> EnrichReport:
+        """
+        Заменяет краткое описание из выдачи (snippet) полным текстом вакансии из /vacancies/{id}.
+        Документы загружаются параллельно (частоту и повторы регулирует планировщик).
+        Вакансии, которые уже есть в кэше с тем же published_at, не запрашиваются повторно;
+        вакансии без published_at (например, прочитанные из хранилища без raw) считаются
+        устаревшими и загружаются заново. Изменённые вакансии записываются в хранилище
+        одним пакетом (saver.add_vacancies).
+        :param saver: хранилище для обновлённых вакансий (None — только вернуть результат)
+        :param cache: кэш полных описаний (None — загружать всё)
+        :param max_workers: число одновременных запросов; по умолчанию и не больше, чем
+                            допускает планировщик (scheduler.max_concurrency)
+        :return: отчёт; report.vacancies — вакансии в исходном порядке с полными описаниями
+        """
+        vacancies = list(vacancies)
+        report = EnrichReport()
+        descriptions: Dict[str, str] = {}
+        stamps: Dict[str, Optional[str]] = {}  # ID для загрузки -> published_at из выдачи
+        for v in vacancies:
+            raw = v.raw or {}
+            vid = raw.get("id") or vacancy_id(v.url)
+            if vid is None or vid in descriptions or vid in stamps:
+                continue
+            stamp = raw.get("published_at")
+            cached = cache.get(vid, stamp) if cache is not None and stamp is not None else None
+            if cached is not None:
+                descriptions[vid] = cached
+                report.cached += 1
+            else:
+                stamps[vid] = stamp
+
+        if stamps:
+            limit = self.scheduler.max_concurrency
+            workers = max(min(max_workers or limit, limit, len(stamps)), 1)
+            self._get_session(workers)
+            try:
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    for vid, document, missing in pool.map(self._fetch_detail, stamps):
+                        if document is None:
+                            report.missing += missing
+                            report.failed += not missing
+                            continue
+                        report.fetched += 1
+                        descriptions[vid] = strip_html(document.get("description"))
+                        if cache is not None:
+                            cache.put(vid, document.get("published_at") or stamps[vid], descriptions[vid])
+            finally:
+                if cache is not None:
+                    cache.save()
+
+        updated = []
+        for v in vacancies:
+            description = descriptions.get((v.raw or {}).get("id") or vacancy_id(v.url))
+            if description and description != v.description:
+                v = dataclasses.replace(v, description=description)
+                updated.append(v)
+            report.vacancies.append(v)
+        report.updated = len(updated)
+        if saver is not None and updated:
+            saver.add_vacancies(updated)
+        return report
+
+
+    def close(self) -> None:
+        """Закрывает пул соединений."""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
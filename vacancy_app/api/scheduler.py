@@ -0,0 +1,212 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})  # ответы, после которых запрос повторяется
+
+
+class TokenBucket:
+    """Ограничитель частоты запросов: rate токенов в секунду, не больше burst накопленных."""
+
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+
+    def acquire(self) -> None:
+        """Забирает один токен, ожидая его появления при необходимости."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1 - 1e-9:  # допуск на погрешность сложения float
+                    self._tokens = max(self._tokens - 1, 0.0)
+                    return
+                wait = max((1 - self._tokens) / self.rate, 1e-6)
+            self._sleep(wait)
+
+
+class RequestScheduler:
+    """
+    Планировщик запросов к API с учётом ограничений сервера.
+    - частота запросов ограничивается token bucket (rate запросов в секунду);
+    - ответы 429 и 5xx повторяются до max_retries раз: задержка берётся из заголовка
+      Retry-After, а при его отсутствии — экспоненциальная с полным джиттером;
+    - число одновременных запросов подстраивается автоматически (AIMD): после успешных
+      ответов лимит плавно растёт до max_concurrency, после троттлинга уменьшается вдвое.
+    """
+
+
+    def __init__(
+        self,
+        rate: Optional[float] = 20.0,
+        burst: Optional[float] = None,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        retry_after_max: float = 3600.0,
+        min_concurrency: int = 1,
+        max_concurrency: int = 8,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Callable[[], float] = random.random,
+    ):
+        """
+        :param rate: запросов в секунду (None — без ограничения частоты)
+        :param burst: размер пачки запросов без ожидания (по умолчанию равен rate)
+        :param max_retries: число повторов после ответа 429/5xx или сетевой ошибки
+        :param backoff_base: начальная задержка экспоненциального отката, с
+        :param backoff_max: верхняя граница задержки экспоненциального отката, с
+        :param retry_after_max: верхняя граница ожидания по заголовку Retry-After, с
+        :param min_concurrency: нижняя граница числа одновременных запросов
+        :param max_concurrency: верхняя граница (и начальное значение) числа одновременных запросов
+        """
+        self.bucket = TokenBucket(rate, burst, clock, sleep) if rate else None
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_after_max = retry_after_max
+        self.min_concurrency = max(min_concurrency, 1)
+        self.max_concurrency = max(max_concurrency, self.min_concurrency)
+        self.concurrency = float(self.max_concurrency)  # текущий лимит одновременных запросов
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self._in_flight = 0
+        self._paused_until = 0.0  # общая пауза после Retry-After
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng
+        self._cond = threading.Condition()
+
+
+    def execute(self, send: Callable[[], "requests.Response"]) -> "requests.Response":
+        """
+        Выполняет запрос send() с ограничением частоты, конкурентности и повторами.
+        Если повторы исчерпаны, возвращает последний ответ (ошибку выбросит raise_for_status).
+        """
+        import requests
+
+        attempt = 0
+        while True:
+            self._wait_pause()
+            if self.bucket is not None:
+                self.bucket.acquire()  # токен берётся до занятия слота конкурентности
+            self._enter()
+            try:
+                response = send()
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                self._on_throttle()
+                delay = self.backoff(attempt)
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    self._on_success()
+                    return response
+                self._on_throttle(response.status_code)
+                if attempt >= self.max_retries:
+                    return response
+                delay = self.retry_after(response)
+                if delay is None:
+                    delay = self.backoff(attempt)
+                else:
+                    self._pause(delay)
+            finally:
+                self._leave()
+
+            with self._cond:
+                self.retries += 1
+            attempt += 1
+            self._sleep(delay)
+
+
+    def backoff(self, attempt: int) -> float:
+        """Экспоненциальная задержка с полным джиттером для попытки attempt (с нуля)."""
+        return self._rng() * min(self.backoff_max, self.backoff_base * 2 ** attempt)
+
+
+    def retry_after(self, response) -> Optional[float]:
+        """Разбирает заголовок Retry-After (число секунд или HTTP-дата)."""
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+        return min(max(delay, 0.0), self.retry_after_max)
+
+
+    def _pause(self, delay: float) -> None:
+        """Приостанавливает выдачу новых запросов всем потокам на delay секунд."""
+        with self._cond:
+            self._paused_until = max(self._paused_until, self._clock() + delay)
+
+
+    def _wait_pause(self) -> None:
+        while True:
+            with self._cond:
+                wait = self._paused_until - self._clock()
+            if wait <= 0:
+                return
+            self._sleep(wait)
+
+
+    def _enter(self) -> None:
+        with self._cond:
+            while self._in_flight >= int(self.concurrency):
+                self._cond.wait()
+            self._in_flight += 1
+            self.requests += 1
+
+
+    def _leave(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+
+    def _on_success(self) -> None:
+        """Аддитивный рост: примерно +1 к лимиту за каждые concurrency успешных ответов."""
+        with self._cond:
+            self.concurrency = min(self.max_concurrency, self.concurrency + 1 / self.concurrency)
+            self._cond.notify_all()
+
+
+    def _on_throttle(self, status: Optional[int] = None) -> None:
+        """Мультипликативное уменьшение лимита после троттлинга (status) или сетевой ошибки."""
+        with self._cond:
+            if status is not None:
+                self.throttled += 1
+            self.concurrency = max(self.min_concurrency, self.concurrency / 2)
+
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """Счётчики запросов, повторов и текущий лимит конкурентности."""
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "concurrency": self.concurrency,
+        }
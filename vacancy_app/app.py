@@ -1,17 +1,17 @@
 from vacancy_app.api.hh_api import HeadHunterAPI
-from vacancy_app.models.vacancy import Vacancy
-from vacancy_app.storage.json_saver import JSONSaver
+from vacancy_app.pipeline.stream import ingest
+from vacancy_app.cli import open_saver
 from vacancy_app.utils.filters import (
-    filter_vacancies_by_keyword,
-    sort_vacancies_by_salary,
-    filter_vacancies_by_salary_range,
+    keyword_query,
+    salary_range_query,
+    top_salary_query,
 )
 
 
 def user_interaction():
     print("=== Поиск вакансий hh.ru ===")
     api = HeadHunterAPI()
-    saver = JSONSaver()
+    saver = open_saver("vacancies.json")  # с BM25-индексом рядом запись обновляет и его
 
     while True:
         print("\n1. Загрузить вакансии с hh.ru")
@@ -25,33 +25,25 @@ def user_interaction():
         choice = input("Выберите действие: ").strip()
         if choice == "1":
             query = input("Введите запрос: ").strip()
-            raw = api.get_vacancies(query)
-            vacancies = Vacancy.cast_to_object_list(raw)
-            for v in vacancies:
-                saver.add_vacancy(v)
-            print(f"Сохранено {len(vacancies)} вакансий.")
+            count = ingest(api, saver, query)
+            print(f"Сохранено {count} вакансий.")
         elif choice == "2":
             for v in saver.get_vacancies():
                 print(f"{v.title} | {v.average_salary():.0f} {v.currency or ''} | {v.url}")
         elif choice == "3":
             n = int(input("Введите N: "))
-            vacs = saver.get_vacancies()
-            for v in sort_vacancies_by_salary(vacs)[:n]:
+            for v in saver.get_vacancies(query=top_salary_query(n)):
                 print(f"{v.title} | {v.average_salary():.0f} {v.currency or ''} | {v.url}")
         elif choice == "4":
             kw = input("Введите ключевые слова: ").split()
-            vacs = saver.get_vacancies()
-            filtered = filter_vacancies_by_keyword(vacs, kw)
-            for v in filtered:
+            for v in saver.get_vacancies(query=keyword_query(kw)):
                 print(f"{v.title} | {v.url}")
         elif choice == "5":
             min_s = input("Мин. зарплата: ")
             max_s = input("Макс. зарплата: ")
             min_val = int(min_s) if min_s else None
             max_val = int(max_s) if max_s else None
-            vacs = saver.get_vacancies()
-            filtered = filter_vacancies_by_salary_range(vacs, min_val, max_val)
-            for v in filtered:
+            for v in saver.get_vacancies(query=salary_range_query(min_val, max_val)):
                 print(f"{v.title} | {v.average_salary():.0f} {v.currency or ''} | {v.url}")
         elif choice == "6":
             ident = input("Введите URL или название для удаления: ").strip()
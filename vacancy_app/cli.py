@@ -0,0 +1,225 @@
+"""
+Неинтерактивный интерфейс командной строки для скриптов, cron и конвейеров.
+
+    python -m vacancy_app.cli fetch python --pages 5
+    python -m vacancy_app.cli --format jsonl filter --keyword django --min 150000 | jq .url
+    python -m vacancy_app.cli --store vacancies.db top 10
+
+Тяжёлые модули импортируются внутри команд: list/top/filter/search/delete/stats
+не загружают requests и код API, поэтому запускаются быстро.
+"""
+import argparse
+import json
+import os
+import sys
+from typing import Any, Dict, Iterable, List, Optional
+
+
+_BACKENDS = ("json", "jsonl", "sqlite", "partitioned")
+
+
+def detect_backend(path: str) -> str:
+    """Определяет тип хранилища по пути: каталог — партиции, .jsonl — журнал, .db/.sqlite — SQLite."""
+    if os.path.isdir(path):
+        return "partitioned"
+    if path.endswith(".jsonl"):
+        return "jsonl"
+    if path.endswith((".db", ".sqlite", ".sqlite3")):
+        return "sqlite"
+    return "json"
+
+
+def open_saver(path: str, backend: Optional[str] = None):
+    """
+    Открывает хранилище, импортируя только модуль нужного типа.
+    Если рядом уже есть BM25-индекс (<путь>.bm25.jsonl), хранилище оборачивается
+    в SearchableSaver, чтобы запись через CLI обновляла и индекс.
+    """
+    backend = backend or detect_backend(path)
+    if backend == "jsonl":
+        from vacancy_app.storage.jsonl_saver import JSONLSaver
+        saver = JSONLSaver(path)
+    elif backend == "sqlite":
+        from vacancy_app.storage.sqlite_saver import SQLiteSaver
+        saver = SQLiteSaver(path)
+    elif backend == "partitioned":
+        from vacancy_app.storage.partitioned_saver import PartitionedSaver
+        saver = PartitionedSaver(path)  # число партиций и ключ берутся из partitions.json
+    else:
+        from vacancy_app.storage.json_saver import JSONSaver
+        saver = JSONSaver(path)
+    if os.path.exists(path.rstrip("/\\") + ".bm25.jsonl"):
+        from vacancy_app.storage.searchable_saver import SearchableSaver
+        saver = SearchableSaver(saver)
+    return saver
+
+
+def _emit(args: argparse.Namespace, vacancies: Iterable[Any]) -> int:
+    """Печатает вакансии: в текстовом виде (как в меню app.py) или по одной JSON-строке на вакансию."""
+    count = 0
+    for v in vacancies:
+        if args.format == "jsonl":
+            sys.stdout.write(json.dumps(v.to_dict(), ensure_ascii=False) + "\n")
+        else:
+            sys.stdout.write(f"{v.title} | {v.average_salary():.0f} {v.currency or ''} | {v.url}\n")
+        count += 1
+    return count
+
+
+def _emit_object(args: argparse.Namespace, data: Dict[str, Any], text: str) -> None:
+    """Печатает итог команды: одной JSON-строкой или текстом."""
+    if args.format == "jsonl":
+        sys.stdout.write(json.dumps(data, ensure_ascii=False) + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+
+
+def cmd_fetch(args: argparse.Namespace, saver) -> int:
+    from vacancy_app.api.hh_api import HeadHunterAPI
+    from vacancy_app.pipeline.stream import ingest
+
+    api = HeadHunterAPI(area=args.area, max_workers=args.workers)
+    try:
+        count = ingest(api, saver, args.query, per_page=args.per_page, pages=args.pages)
+    finally:
+        api.close()
+    _emit_object(args, {"saved": count}, f"Сохранено {count} вакансий.")
+    return 0
+
+
+def cmd_list(args: argparse.Namespace, saver) -> int:
+    if args.limit is None and not args.offset:
+        _emit(args, saver.iter_vacancies())
+    else:
+        from vacancy_app.storage.query import VacancyQuery
+        _emit(args, saver.get_vacancies(query=VacancyQuery(limit=args.limit, offset=args.offset)))
+    return 0
+
+
+def cmd_top(args: argparse.Namespace, saver) -> int:
+    from vacancy_app.utils.filters import top_salary_query
+
+    _emit(args, saver.get_vacancies(query=top_salary_query(args.n)))
+    return 0
+
+
+def cmd_filter(args: argparse.Namespace, saver) -> int:
+    from vacancy_app.storage.query import VacancyQuery
+
+    query = VacancyQuery(
+        keywords=args.keyword or [],
+        match_all=args.match_all,
+        salary_min=args.min,
+        salary_max=args.max,
+        currency=args.currency,
+        employer=args.employer,
+        sort_by=args.sort,
+        descending=not args.ascending,
+        limit=args.limit,
+    )
+    _emit(args, saver.get_vacancies(query=query))
+    return 0
+
+
+def cmd_search(args: argparse.Namespace, saver) -> int:
+    from vacancy_app.storage.searchable_saver import SearchableSaver
+
+    if not isinstance(saver, SearchableSaver):
+        saver = SearchableSaver(saver)  # первый поиск строит индекс рядом с хранилищем
+    _emit(args, saver.search(" ".join(args.text), k=args.k))
+    return 0
+
+
+def cmd_delete(args: argparse.Namespace, saver) -> int:
+    deleted = sum(1 for identifier in args.identifiers if saver.delete_vacancy(identifier))
+    _emit_object(args, {"deleted": deleted}, f"Удалено: {deleted}.")
+    return 0 if deleted else 1
+
+
+def cmd_stats(args: argparse.Namespace, saver) -> int:
+    total = with_salary = 0
+    salaries: Dict[str, List[float]] = {}
+    for v in saver.iter_vacancies():
+        total += 1
+        salary = v.average_salary()
+        if salary:
+            with_salary += 1
+            salaries.setdefault(v.currency or "", []).append(salary)
+    by_currency = {
+        currency: {"count": len(values), "avg": sum(values) / len(values), "max": max(values)}
+        for currency, values in sorted(salaries.items())
+    }
+    stats = {"total": total, "with_salary": with_salary, "by_currency": by_currency}
+    lines = [f"Вакансий: {total}, с зарплатой: {with_salary}"]
+    lines += [f"{c or '-'}: {s['count']} шт., средняя {s['avg']:.0f}, максимум {s['max']:.0f}"
+              for c, s in by_currency.items()]
+    _emit_object(args, stats, "\n".join(lines))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="vacancy_app", description="Работа с вакансиями hh.ru из командной строки")
+    parser.add_argument("--store", default="vacancies.json", help="файл или каталог хранилища")
+    parser.add_argument("--backend", choices=_BACKENDS, help="тип хранилища (по умолчанию — по пути)")
+    parser.add_argument("--format", choices=("text", "jsonl"), default="text", help="формат вывода")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fetch = commands.add_parser("fetch", help="загрузить вакансии с hh.ru")
+    fetch.add_argument("query", help="поисковый запрос")
+    fetch.add_argument("--pages", type=int, default=1, help="число страниц")
+    fetch.add_argument("--per-page", type=int, default=100, help="вакансий на странице")
+    fetch.add_argument("--workers", type=int, default=4, help="число параллельных запросов")
+    fetch.add_argument("--area", type=int, default=113, help="регион hh.ru")
+    fetch.set_defaults(handler=cmd_fetch)
+
+    listing = commands.add_parser("list", help="показать сохранённые вакансии")
+    listing.add_argument("--limit", type=int, help="не больше N вакансий")
+    listing.add_argument("--offset", type=int, default=0, help="пропустить первые N вакансий")
+    listing.set_defaults(handler=cmd_list)
+
+    top = commands.add_parser("top", help="топ N по зарплате")
+    top.add_argument("n", type=int, help="число вакансий")
+    top.set_defaults(handler=cmd_top)
+
+    filtering = commands.add_parser("filter", help="выборка по условиям")
+    filtering.add_argument("--keyword", action="append", help="ключевое слово (можно несколько раз)")
+    filtering.add_argument("--match-all", action="store_true", help="требовать все ключевые слова")
+    filtering.add_argument("--min", type=int, help="минимальная средняя зарплата")
+    filtering.add_argument("--max", type=int, help="максимальная средняя зарплата")
+    filtering.add_argument("--currency", help="валюта зарплаты")
+    filtering.add_argument("--employer", help="работодатель")
+    filtering.add_argument("--sort", choices=("salary", "title"), help="сортировка")
+    filtering.add_argument("--ascending", action="store_true", help="сортировать по возрастанию")
+    filtering.add_argument("--limit", type=int, help="не больше N вакансий")
+    filtering.set_defaults(handler=cmd_filter)
+
+    search = commands.add_parser("search", help="поиск по релевантности (BM25)")
+    search.add_argument("text", nargs="+", help="слова запроса")
+    search.add_argument("-k", type=int, default=10, help="число результатов")
+    search.set_defaults(handler=cmd_search)
+
+    delete = commands.add_parser("delete", help="удалить вакансии по URL или названию")
+    delete.add_argument("identifiers", nargs="+", help="URL или названия")
+    delete.set_defaults(handler=cmd_delete)
+
+    stats = commands.add_parser("stats", help="сводка по хранилищу")
+    stats.set_defaults(handler=cmd_stats)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Точка входа; возвращает код завершения (1 — delete ничего не удалил)."""
+    args = build_parser().parse_args(argv)
+    saver = open_saver(args.store, args.backend)
+    try:
+        return args.handler(args, saver)
+    except BrokenPipeError:  # читатель конвейера (например, head) закрыл поток раньше времени
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 0
+    finally:
+        saver.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+import sys
+from dataclasses import dataclass
+from typing import Optional, Dict, Any
+from .vacancy import Vacancy
+
+
+@dataclass(slots=True, eq=False)
+class CompactVacancy:
+    """
+    Компактный вариант Vacancy: __slots__ вместо __dict__ у каждого экземпляра
+    и без исходного ответа API (raw). Повторяющиеся строки (работодатель, валюта)
+    интернируются. Валидация и сравнение по зарплате такие же, как у Vacancy.
+    """
+
+    title: str
+    url: str
+    description: str
+    employer: Optional[str] = None
+    salary_from: Optional[int] = 0
+    salary_to: Optional[int] = 0
+    currency: Optional[str] = None
+
+    def __post_init__(self):
+        """Проводит валидацию и очистку данных после инициализации."""
+        self.title = Vacancy._validate_str(self.title)
+        self.url = Vacancy._validate_str(self.url)
+        self.description = Vacancy._validate_str(self.description)
+        self.employer = sys.intern(Vacancy._validate_str(self.employer))
+        if self.currency is not None:
+            self.currency = sys.intern(self.currency)
+
+        self.salary_from = Vacancy._validate_salary(self.salary_from)
+        self.salary_to = Vacancy._validate_salary(self.salary_to)
+
+        if not self.salary_from and self.salary_to:
+            self.salary_from = self.salary_to
+        elif not self.salary_to and self.salary_from:
+            self.salary_to = self.salary_from
+
+
+    def average_salary(self) -> float:
+        """Возвращает среднюю зарплату, если указаны границы, иначе — одно из значений."""
+        if self.salary_from and self.salary_to:
+            return (self.salary_from + self.salary_to) / 2
+        return float(self.salary_from or self.salary_to or 0)
+
+
+    def __lt__(self, other) -> bool:
+        return self.average_salary() < other.average_salary()
+
+
+    def __gt__(self, other) -> bool:
+        return self.average_salary() > other.average_salary()
+
+
+    def __eq__(self, other) -> bool:
+        return self.average_salary() == other.average_salary()
+
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Преобразует вакансию в словарь для сериализации."""
+        return {
+            "title": self.title,
+            "url": self.url,
+            "description": self.description,
+            "employer": self.employer,
+            "salary_from": self.salary_from,
+            "salary_to": self.salary_to,
+            "currency": self.currency,
+        }
+
+
+    @staticmethod
+    def from_vacancy(vacancy: Vacancy) -> "CompactVacancy":
+        """Создаёт компактную копию вакансии (без raw)."""
+        return CompactVacancy(**vacancy.to_dict())
+
+
+    def to_vacancy(self) -> Vacancy:
+        """Преобразует обратно в обычный Vacancy."""
+        return Vacancy(**self.to_dict())
@@ -0,0 +1,161 @@
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .vacancy import Vacancy
+
+try:
+    import numpy as np
+except ImportError:  # NumPy необязателен: без него операции выполняются на чистом Python
+    np = None
+
+
+class _StringPool:
+    """Словарь повторяющихся строк: каждая хранится один раз, в колонке — только её код."""
+
+    def __init__(self):
+        self.values: List[Optional[str]] = []
+        self._codes: Dict[Optional[str], int] = {}
+
+    def code(self, value: Optional[str]) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class VacancyTable:
+    """
+    Колоночное представление большого набора вакансий.
+    Зарплаты хранятся в array('q') (8 байт на значение, без объектов int),
+    работодатель и валюта — кодами в пуле строк, исходный ответ API (raw) не хранится.
+    Фильтрация и сортировка по зарплате работают по колонкам; при установленном NumPy —
+    векторно, поверх тех же буферов без копирования.
+    """
+
+
+    def __init__(self):
+        self.titles: List[str] = []
+        self.urls: List[str] = []
+        self.descriptions: List[str] = []
+        self.salary_from = array("q")
+        self.salary_to = array("q")
+        self._employer_codes = array("l")
+        self._currency_codes = array("l")
+        self._employers = _StringPool()
+        self._currencies = _StringPool()
+
+
+    @classmethod
+    def from_vacancies(cls, vacancies: Iterable[Vacancy]) -> "VacancyTable":
+        """Строит таблицу из вакансий (Vacancy или CompactVacancy)."""
+        table = cls()
+        for vacancy in vacancies:
+            table.append(vacancy)
+        return table
+
+
+    def append(self, vacancy: Vacancy) -> None:
+        """Добавляет вакансию в конец таблицы."""
+        self.titles.append(vacancy.title)
+        self.urls.append(vacancy.url)
+        self.descriptions.append(vacancy.description)
+        self.salary_from.append(vacancy.salary_from or 0)
+        self.salary_to.append(vacancy.salary_to or 0)
+        self._employer_codes.append(self._employers.code(vacancy.employer))
+        self._currency_codes.append(self._currencies.code(vacancy.currency))
+
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+
+    def __getitem__(self, i: int) -> Vacancy:
+        return Vacancy(
+            title=self.titles[i],
+            url=self.urls[i],
+            description=self.descriptions[i],
+            employer=self._employers.values[self._employer_codes[i]],
+            salary_from=self.salary_from[i],
+            salary_to=self.salary_to[i],
+            currency=self._currencies.values[self._currency_codes[i]],
+        )
+
+
+    def __iter__(self) -> Iterator[Vacancy]:
+        return (self[i] for i in range(len(self)))
+
+
+    def to_vacancies(self) -> List[Vacancy]:
+        """Преобразует таблицу в список объектов Vacancy."""
+        return list(self)
+
+
+    def employer(self, i: int) -> Optional[str]:
+        return self._employers.values[self._employer_codes[i]]
+
+
+    def currency(self, i: int) -> Optional[str]:
+        return self._currencies.values[self._currency_codes[i]]
+
+
+    def average_salaries(self):
+        """Колонка средних зарплат (ndarray при наличии NumPy, иначе список)."""
+        if np is not None:
+            lo = np.frombuffer(self.salary_from, dtype=np.int64) if len(self) else np.zeros(0, np.int64)
+            hi = np.frombuffer(self.salary_to, dtype=np.int64) if len(self) else np.zeros(0, np.int64)
+            return np.where((lo > 0) & (hi > 0), (lo + hi) / 2, (lo + hi).astype(np.float64))
+        return [
+            (f + t) / 2 if f and t else float(f or t)
+            for f, t in zip(self.salary_from, self.salary_to)
+        ]
+
+
+    def take(self, indices: Sequence[int]) -> "VacancyTable":
+        """Новая таблица из строк с указанными номерами (в заданном порядке)."""
+        table = VacancyTable()
+        table._employers, table._currencies = self._employers, self._currencies
+        for i in indices:
+            table.titles.append(self.titles[i])
+            table.urls.append(self.urls[i])
+            table.descriptions.append(self.descriptions[i])
+            table.salary_from.append(self.salary_from[i])
+            table.salary_to.append(self.salary_to[i])
+            table._employer_codes.append(self._employer_codes[i])
+            table._currency_codes.append(self._currency_codes[i])
+        return table
+
+
+    def salary_mask(self, min_salary: Optional[float] = None, max_salary: Optional[float] = None) -> List[int]:
+        """Номера строк со средней зарплатой в диапазоне [min_salary, max_salary]."""
+        avg = self.average_salaries()
+        if np is not None:
+            mask = np.ones(len(avg), dtype=bool)
+            if min_salary is not None:
+                mask &= avg >= min_salary
+            if max_salary is not None:
+                mask &= avg <= max_salary
+            return np.flatnonzero(mask).tolist()
+        return [
+            i for i, a in enumerate(avg)
+            if (min_salary is None or a >= min_salary) and (max_salary is None or a <= max_salary)
+        ]
+
+
+    def filter_salary(self, min_salary: Optional[float] = None, max_salary: Optional[float] = None) -> "VacancyTable":
+        """Таблица вакансий со средней зарплатой в диапазоне."""
+        return self.take(self.salary_mask(min_salary, max_salary))
+
+
+    def argsort_salary(self, reverse: bool = True) -> List[int]:
+        """Номера строк по убыванию (reverse=True) или возрастанию средней зарплаты; сортировка устойчивая."""
+        avg = self.average_salaries()
+        if np is not None:
+            keys = -avg if reverse else avg
+            return np.argsort(keys, kind="stable").tolist()
+        return sorted(range(len(avg)), key=avg.__getitem__, reverse=reverse)
+
+
+    def sort_by_salary(self, reverse: bool = True) -> "VacancyTable":
+        """Таблица, отсортированная по средней зарплате."""
+        return self.take(self.argsort_salary(reverse))
@@ -0,0 +1,166 @@
+import gzip
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from vacancy_app.models.vacancy import Vacancy
+from vacancy_app.storage.base_saver import BaseSaver
+
+
+_DUMP_SUFFIXES = (".json", ".jsonl", ".json.gz", ".jsonl.gz")
+
+
+@dataclass
+class DumpReport:
+    """Итог загрузки дампов: число файлов, прочитанных и уникальных вакансий."""
+
+    files: int = 0
+    parsed: int = 0
+    unique: int = 0
+
+    @property
+    def duplicates(self) -> int:
+        return self.parsed - self.unique
+
+
+def find_dump_files(paths: Iterable[str]) -> List[str]:
+    """
+    Раскрывает список путей: каталоги обходятся рекурсивно (файлы .json/.jsonl и их .gz),
+    обычные файлы берутся как есть. Порядок детерминирован: каталоги сортируются по имени.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                files += [os.path.join(root, n) for n in sorted(names) if n.endswith(_DUMP_SUFFIXES)]
+        else:
+            files.append(path)
+    return files
+
+
+def _iter_items(document: Any) -> Iterator[Dict[str, Any]]:
+    """Достаёт вакансии из ответа /vacancies ({"items": [...]}), списка ответов или списка вакансий."""
+    if isinstance(document, dict):
+        if "items" in document:
+            yield from document["items"] or []
+        else:
+            yield document
+    elif isinstance(document, list):
+        for entry in document:
+            yield from _iter_items(entry)
+
+
+def _iter_documents(f: IO[str], chunk_size: int) -> Iterator[Any]:
+    """
+    Потоково читает JSON-значения верхнего уровня: один документ или JSON Lines (значения,
+    разделённые переводами строк). Значения декодируются по одному через JSONDecoder.raw_decode
+    из буфера, который дочитывается блоками по chunk_size символов; элементы массива верхнего
+    уровня тоже отдаются по одному. В памяти держится только текущий ответ или вакансия.
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, eof, in_array = "", 0, False, False
+    while True:
+        while pos < len(buf) and (buf[pos].isspace() or (in_array and buf[pos] == ",")):
+            pos += 1
+        if pos >= len(buf):
+            if eof:
+                return
+            buf, pos = f.read(chunk_size), 0
+            eof = not buf
+            continue
+
+        if buf[pos] == ("]" if in_array else "["):
+            in_array = not in_array
+            pos += 1
+            continue
+
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            chunk = f.read(chunk_size)  # значение не поместилось в буфер — дочитываем
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+        pos = end
+        yield value
+
+
+def _read_dump(path: str, chunk_size: int = 1 << 16) -> Iterator[Dict[str, Any]]:
+    """Читает один файл дампа потоково: целый JSON-документ или JSON Lines (по ответу на строку)."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for document in _iter_documents(f, chunk_size):
+            yield from _iter_items(document)
+
+
+def _parse_files(paths: List[Tuple[int, str]]) -> List[Tuple[int, List[Dict[str, Any]]]]:
+    """
+    Работа одного процесса: разбирает свою долю файлов и возвращает компактные записи
+    (Vacancy.to_dict, без raw), чтобы между процессами передавалось как можно меньше данных.
+    """
+    return [
+        (position, [Vacancy.from_hh_json(item).to_dict() for item in _read_dump(path)])
+        for position, path in paths
+    ]
+
+
+def _shard(paths: List[str], shards: int) -> List[List[Tuple[int, str]]]:
+    """Раскладывает файлы по shards частям примерно равного объёма (крупные файлы — первыми)."""
+    sizes = {}
+    for path in paths:
+        try:
+            sizes[path] = os.path.getsize(path)
+        except OSError:
+            sizes[path] = 0
+    buckets: List[List[Tuple[int, str]]] = [[] for _ in range(shards)]
+    loads = [0] * shards
+    for position, path in sorted(enumerate(paths), key=lambda p: -sizes[p[1]]):
+        target = loads.index(min(loads))
+        buckets[target].append((position, path))
+        loads[target] += sizes[path]
+    return [b for b in buckets if b]
+
+
+def ingest_dumps(
+    paths: Iterable[str],
+    saver: BaseSaver,
+    max_workers: Optional[int] = None,
+) -> DumpReport:
+    """
+    Пересобирает хранилище из архива сырых ответов /vacancies.
+    Файлы делятся между процессами ProcessPoolExecutor: каждый процесс сам декодирует JSON
+    и вызывает Vacancy.from_hh_json, поэтому разбор масштабируется по числу ядер.
+    Результаты объединяются в порядке файлов, дедуплицируются по URL (данные берутся из более
+    поздней записи, как и при add_vacancies) и записываются в хранилище одним пакетом.
+    :param paths: файлы дампов или каталоги с ними
+    :param max_workers: число процессов (по умолчанию — число ядер); 1 — разбор в текущем процессе
+    """
+    files = find_dump_files(paths)
+    report = DumpReport(files=len(files))
+    if not files:
+        return report
+
+    workers = min(max_workers or os.cpu_count() or 1, len(files))
+    if workers <= 1:
+        parsed = _parse_files(list(enumerate(files)))
+    else:
+        parsed = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunk in executor.map(_parse_files, _shard(files, workers)):
+                parsed += chunk
+        parsed.sort(key=lambda p: p[0])
+
+    unique: Dict[str, Dict[str, Any]] = {}
+    for _, records in parsed:
+        report.parsed += len(records)
+        for record in records:
+            unique[record["url"]] = record  # позиция первого вхождения, данные последнего
+    report.unique = len(unique)
+
+    saver.add_vacancies(Vacancy(**record) for record in unique.values())
+    return report
@@ -0,0 +1,97 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from vacancy_app.api.hh_api import HeadHunterAPI
+from vacancy_app.models.vacancy import Vacancy
+from vacancy_app.storage.base_saver import BaseSaver
+
+
+@dataclass
+class HarvestReport:
+    """Итог сбора: число уникальных вакансий, дублей, запросов и статистика по поисковым фразам."""
+
+    unique: int = 0
+    duplicates: int = 0
+    requests: int = 0
+    hits: Dict[str, int] = field(default_factory=dict)  # фраза -> всего вакансий в её выдаче
+    unique_hits: Dict[str, int] = field(default_factory=dict)  # фраза -> вакансий, впервые найденных ею
+
+
+class Harvester:
+    """
+    Параллельный сбор вакансий по многим поисковым фразам и регионам.
+    Все запросы (фраза, регион, страница) выполняются в одном общем пуле потоков:
+    сначала страницы 0, а по мере их получения — остальные страницы каждой выдачи.
+    Вакансии дедуплицируются по ID hh.ru (или URL) сразу при получении, уникальные
+    преобразуются в Vacancy и пакетами пишутся в хранилище.
+    """
+
+
+    def __init__(
+        self,
+        api: HeadHunterAPI,
+        saver: BaseSaver,
+        max_workers: int = 8,
+        per_page: int = 100,
+        pages: int = 20,
+        batch_size: int = 500,
+    ):
+        self.api = api
+        self.saver = saver
+        self.max_workers = max_workers
+        self.per_page = per_page
+        self.pages = pages
+        self.batch_size = batch_size
+
+
+    def harvest(self, queries: Iterable[str], areas: Optional[Iterable[Any]] = None) -> HarvestReport:
+        """Собирает вакансии по всем сочетаниям фраз и регионов (по умолчанию — регион API)."""
+        queries = list(queries)
+        areas = list(areas) if areas is not None else [self.api.area]
+        report = HarvestReport(hits={q: 0 for q in queries}, unique_hits={q: 0 for q in queries})
+        seen: Set[str] = set()
+        batch: List[Vacancy] = []
+
+        self.api.reserve_connections(self.max_workers)
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                pending: Dict[Future, Tuple[str, Any, int]] = {}
+
+                def submit(query: str, area: Any, page: int) -> None:
+                    future = pool.submit(self.api.fetch_page, query, self.per_page, page, {"area": area})
+                    pending[future] = (query, area, page)
+
+                for query in queries:
+                    for area in areas:
+                        submit(query, area, 0)
+
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        query, area, page = pending.pop(future)
+                        data = future.result()
+                        report.requests += 1
+                        if page == 0:
+                            for next_page in range(1, min(self.pages, data.get("pages", 0))):
+                                submit(query, area, next_page)
+
+                        items = data.get("items", [])
+                        report.hits[query] += len(items)
+                        for item in items:
+                            key = str(item.get("id") or item.get("alternate_url") or item.get("url"))
+                            if key in seen:
+                                report.duplicates += 1
+                                continue
+                            seen.add(key)
+                            report.unique += 1
+                            report.unique_hits[query] += 1
+                            batch.append(Vacancy.from_hh_json(item))
+
+                        if len(batch) >= self.batch_size:
+                            self.saver.add_vacancies(batch)
+                            batch = []
+        finally:
+            if batch:  # уже полученные вакансии сохраняются, даже если запрос страницы упал
+                self.saver.add_vacancies(batch)
+        return report
@@ -0,0 +1,71 @@
+import queue
+import threading
+from typing import Optional
+
+from vacancy_app.api.base_api import BaseJobsAPI
+from vacancy_app.models.vacancy import Vacancy
+from vacancy_app.storage.base_saver import BaseSaver
+from vacancy_app.utils.near_duplicates import NearDuplicateDetector
+
+
+_DONE = object()  # маркер конца потока страниц
+
+
+def ingest(
+    api: BaseJobsAPI,
+    saver: BaseSaver,
+    query: str,
+    per_page: int = 20,
+    pages: int = 1,
+    queue_size: int = 2,
+    detector: Optional[NearDuplicateDetector] = None,
+    **kwargs,
+) -> int:
+    """
+    Потоковая загрузка: fetch → parse → store.
+    Каждая страница сразу преобразуется через Vacancy.from_hh_json и передаётся
+    фоновому потоку, который пишет её в хранилище пакетом (saver.add_vacancies),
+    пока основной поток ждёт следующую страницу из сети. Очередь ограничена
+    queue_size страницами, поэтому расход памяти зависит от размера страницы,
+    а не от общего числа результатов.
+    Дополнительные kwargs передаются в api.iter_pages (например, max_workers).
+    :param detector: если задан, почти дубликаты уже известных вакансий (перепубликации
+                     под новым URL) не сохраняются
+    :return: число вакансий, переданных в хранилище
+    """
+    pages_queue: "queue.Queue" = queue.Queue(maxsize=max(queue_size, 1))
+    error: Optional[BaseException] = None
+
+    def writer() -> None:
+        nonlocal error
+        while True:
+            batch = pages_queue.get()
+            if batch is _DONE:
+                return
+            if error is None:
+                try:
+                    saver.add_vacancies(batch)
+                except BaseException as exc:  # пробрасывается в вызывающий поток
+                    error = exc
+
+    thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+
+    total = 0
+    try:
+        for items in api.iter_pages(query, per_page=per_page, pages=pages, **kwargs):
+            if error is not None:
+                break
+            batch = [Vacancy.from_hh_json(item) for item in items]
+            if detector is not None:
+                batch = [v for v in batch if detector.check_and_add(v) is None]
+            total += len(batch)
+            if batch:
+                pages_queue.put(batch)
+    finally:
+        pages_queue.put(_DONE)
+        thread.join()
+
+    if error is not None:
+        raise error
+    return total
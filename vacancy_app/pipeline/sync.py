@@ -0,0 +1,173 @@
+import json
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional, Set
+
+from vacancy_app.api.hh_api import HeadHunterAPI
+from vacancy_app.models.vacancy import Vacancy
+from vacancy_app.storage.base_saver import BaseSaver
+
+
+HH_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S%z"  # формат published_at в ответах hh.ru
+
+
+@dataclass
+class SyncResult:
+    """Итог синхронизации одного запроса."""
+
+    query: str
+    fetched: int = 0  # вакансий получено из API
+    saved: int = 0  # новых или изменённых вакансий записано в хранилище
+    skipped: int = 0  # уже известные вакансии на границе прошлой синхронизации
+    full: bool = False  # выполнялась ли полная загрузка (контрольной точки не было)
+    truncated: bool = False  # выдачу не удалось получить целиком; контрольная точка не сдвинута
+
+
+class SyncCheckpoints:
+    """
+    Контрольные точки синхронизации в JSON-файле: для каждого запроса — последнее
+    увиденное published_at и ID вакансий с этим временем публикации.
+    Файл перезаписывается атомарно (временный файл + os.replace), поэтому переживает сбой.
+    """
+
+
+    def __init__(self, filepath: str = "sync_checkpoints.json"):
+        self.filepath = filepath
+        self._lock = threading.Lock()
+
+
+    def _read(self) -> Dict[str, Any]:
+        if not os.path.exists(self.filepath):
+            return {}
+        with open(self.filepath, "r", encoding="utf-8") as f:
+            try:
+                return json.load(f)
+            except json.JSONDecodeError:
+                return {}
+
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._read().get(key)
+
+
+    def put(self, key: str, checkpoint: Dict[str, Any]) -> None:
+        with self._lock:
+            data = self._read()
+            data[key] = checkpoint
+            directory = os.path.dirname(os.path.abspath(self.filepath))
+            fd, tmp_path = tempfile.mkstemp(prefix=".sync-", suffix=".tmp", dir=directory)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.filepath)
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    try:
+        return datetime.strptime(value, HH_DATE_FORMAT) if value else None
+    except ValueError:
+        return None
+
+
+class IncrementalSync:
+    """
+    Инкрементальная синхронизация поверх HeadHunterAPI.
+    Первый запуск загружает весь результат запроса, следующие — только вакансии,
+    опубликованные начиная с published_at из контрольной точки (параметр date_from,
+    сортировка по времени публикации). date_from включает границу, поэтому вакансии
+    с тем же временем публикации, уже сохранённые в прошлый раз, пропускаются по ID.
+    Выдача ограничена pages × per_page вакансиями (и глубиной поиска hh.ru); если найдено
+    больше (поле found), следующие проходы запрашивают более старые вакансии окнами
+    date_to = самое старое published_at предыдущего прохода, пока выдача не будет покрыта.
+    Контрольная точка сдвигается только после успешной записи всей выдачи.
+    """
+
+
+    def __init__(
+        self,
+        api: HeadHunterAPI,
+        saver: BaseSaver,
+        checkpoints: Optional[SyncCheckpoints] = None,
+        per_page: int = 100,
+        pages: int = 20,
+    ):
+        self.api = api
+        self.saver = saver
+        self.checkpoints = checkpoints or SyncCheckpoints()
+        self.per_page = per_page
+        self.pages = pages
+
+
+    def _key(self, query: str, params: Optional[Dict[str, Any]]) -> str:
+        normalized = sorted((str(k), str(v)) for k, v in {"area": self.api.area, **(params or {})}.items())
+        return json.dumps([query, normalized], ensure_ascii=False, separators=(",", ":"))
+
+
+    def sync(self, query: str, params: Optional[Dict[str, Any]] = None) -> SyncResult:
+        """Загружает новые и изменённые вакансии по запросу и записывает их в хранилище."""
+        key = self._key(query, params)
+        checkpoint = self.checkpoints.get(key)
+        result = SyncResult(query=query, full=checkpoint is None)
+
+        search = {**(params or {}), "order_by": "publication_time"}
+        known_ids: Set[str] = set()
+        last_published: Optional[str] = None
+        if checkpoint is not None:
+            last_published = checkpoint["published_at"]
+            known_ids = set(checkpoint.get("boundary_ids", []))
+            search["date_from"] = last_published
+
+        newest, newest_ids = _parse_date(last_published), set(known_ids)
+        seen: Set[str] = set()
+        date_to: Optional[str] = None
+        while True:
+            window = dict(search, date_to=date_to) if date_to else search
+            meta: Dict[str, Any] = {}
+            received, oldest, oldest_raw = 0, None, None
+            for items in self.api.iter_pages(
+                query, per_page=self.per_page, pages=self.pages, params=window, meta=meta
+            ):
+                received += len(items)
+                batch = []
+                for item in items:
+                    result.fetched += 1
+                    item_id = str(item.get("id"))
+                    published = _parse_date(item.get("published_at"))
+                    if published is not None and (oldest is None or published < oldest):
+                        oldest, oldest_raw = published, item["published_at"]
+                    if item_id in seen or item_id in known_ids:
+                        result.skipped += 1  # повтор на стыке страниц, окон или на границе прошлой синхронизации
+                        continue
+                    seen.add(item_id)
+                    batch.append(Vacancy.from_hh_json(item))
+
+                    if published is None:
+                        continue
+                    if newest is None or published > newest:
+                        newest, newest_ids, last_published = published, {item_id}, item["published_at"]
+                    elif published == newest:
+                        newest_ids.add(item_id)
+                if batch:
+                    self.saver.add_vacancies(batch)
+                    result.saved += len(batch)
+
+            found = meta.get("found")
+            if found is None or received >= found:
+                break
+            if oldest_raw is None or oldest_raw == date_to:
+                result.truncated = True  # в одну секунду опубликовано больше, чем помещается в выдачу
+                return result
+            date_to = oldest_raw
+
+        if last_published is not None:
+            self.checkpoints.put(key, {
+                "query": query,
+                "published_at": last_published,
+                "boundary_ids": sorted(newest_ids),
+            })
+        return result
@@ -1,22 +1,117 @@
+import functools
+import time
 from abc import ABC, abstractmethod
-from typing import List, Callable, Any
+from contextvars import ContextVar
+from typing import List, Callable, Any, Iterable, Iterator, Optional
 from vacancy_app.models.vacancy import Vacancy
+from vacancy_app.utils.metrics import registry as metrics
+from .query import VacancyQuery
+
+
+_OPERATIONS = {  # инструментируемые методы хранилищ и тип операции
+    "add_vacancy": "write",
+    "add_vacancies": "write",
+    "get_vacancies": "read",
+    "delete_vacancy": "write",
+}
+_inside: ContextVar[bool] = ContextVar("saver_operation", default=False)  # идёт ли уже учитываемая операция
+
+
+def _instrument(method: Callable, saver: str, operation: str, kind: str) -> Callable:
+    """
+    Оборачивает операцию хранилища: длительность пишется в saver_operation_seconds,
+    число затронутых записей — в saver_records_total. При выключенных метриках — прямой вызов.
+    Учитывается только внешний вызов: операции, которые он выполняет сам (add_vacancies
+    через add_vacancy, обёртка через вложенное хранилище, партиции), метрики не пишут.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not metrics.enabled or _inside.get():
+            return method(self, *args, **kwargs)
+
+        counted = [0]
+        if operation == "add_vacancies":
+            batch = args[0] if args else kwargs.pop("vacancies")
+            if isinstance(batch, (list, tuple)):
+                counted[0] = len(batch)
+            else:
+                batch = _counting(batch, counted)  # генератор считается по мере чтения
+            args = (batch,) + args[1:]
+
+        labels = {"saver": saver, "operation": operation, "kind": kind}
+        token = _inside.set(True)
+        try:
+            start = time.perf_counter()
+            result = method(self, *args, **kwargs)
+            metrics.observe("saver_operation_seconds", time.perf_counter() - start, **labels)
+        finally:
+            _inside.reset(token)
+
+        if operation == "add_vacancies":
+            records = counted[0]
+        elif operation == "get_vacancies":
+            records = len(result)
+        else:
+            records = 1 if result is not False else 0
+        metrics.inc("saver_records_total", records, **labels)
+        return result
+    return wrapper
+
+
+def _counting(items: Iterable[Vacancy], counted: List[int]) -> Iterator[Vacancy]:
+    """Пропускает элементы без изменений, считая их в counted[0]."""
+    for item in items:
+        counted[0] += 1
+        yield item
 
 
 class BaseSaver(ABC):
     """Абстрактный интерфейс для хранения вакансий."""
 
 
+    def __init_subclass__(cls, **kwargs):
+        """Подключает метрики к операциям, которые определяет подкласс."""
+        super().__init_subclass__(**kwargs)
+        for name, kind in _OPERATIONS.items():
+            method = cls.__dict__.get(name)
+            if callable(method) and not getattr(method, "__isabstractmethod__", False):
+                setattr(cls, name, _instrument(method, cls.__name__, name, kind))
+
+
     @abstractmethod
     def add_vacancy(self, vacancy: Vacancy) -> None:
         pass
 
 
+    def add_vacancies(self, vacancies: Iterable[Vacancy]) -> None:
+        """Пакетное добавление; реализации могут переопределить для записи за один проход."""
+        for vacancy in vacancies:
+            self.add_vacancy(vacancy)
+
+
     @abstractmethod
-    def get_vacancies(self, filter_func: Callable[[Vacancy], bool] = None) -> List[Vacancy]:
+    def get_vacancies(
+        self, filter_func: Callable[[Vacancy], bool] = None, query: Optional[VacancyQuery] = None
+    ) -> List[Vacancy]:
+        """
+        Возвращает вакансии; filter_func — произвольный фильтр на Python,
+        query — декларативный запрос, который хранилище может выполнить по индексам.
+        """
         pass
 
 
+    def get_vacancy(self, url: str) -> Optional[Vacancy]:
+        """Возвращает вакансию по URL или None; реализации могут переопределить для поиска по индексу."""
+        for vacancy in self.iter_vacancies(lambda v: v.url == url):
+            return vacancy
+        return None
+
+
+    def iter_vacancies(self, filter_func: Callable[[Vacancy], bool] = None) -> Iterator[Vacancy]:
+        """Генератор вакансий; реализации могут переопределить для потокового чтения."""
+        yield from self.get_vacancies(filter_func)
+
+
     @abstractmethod
     def delete_vacancy(self, identifier: Any) -> bool:
         pass
@@ -0,0 +1,119 @@
+import json
+import os
+import tempfile
+from typing import List, Iterable, Optional, Tuple
+
+
+class Journal:
+    """
+    Append-only журнал в формате JSON Lines.
+    Каждая запись — отдельная строка; недописанная последняя строка (сбой во время записи)
+    игнорируется при чтении и не портит последующие добавления.
+    """
+
+
+    def __init__(self, filepath: str, fsync: bool = True):
+        """
+        :param filepath: путь к файлу журнала
+        :param fsync: сбрасывать ли данные на диск после каждой записи
+        """
+        self.filepath = filepath
+        self.fsync = fsync
+        self.offset = 0  # позиция, до которой журнал прочитан
+        self._ino: Optional[int] = None
+        self._torn = False  # файл заканчивается недописанной строкой
+        if not os.path.exists(filepath):
+            open(filepath, "a", encoding="utf-8").close()
+
+
+    def read_new(self) -> Tuple[bool, List[dict]]:
+        """
+        Читает записи, появившиеся после последнего чтения.
+        Возвращает (reset, records): reset=True означает, что файл был заменён или усечён
+        и состояние нужно строить заново из records.
+        """
+        try:
+            st = os.stat(self.filepath)
+        except FileNotFoundError:
+            reset = self.offset > 0
+            self.offset, self._ino, self._torn = 0, None, False
+            return reset, []
+
+        reset = st.st_ino != self._ino or st.st_size < self.offset
+        if reset:
+            self.offset, self._ino = 0, st.st_ino
+        if st.st_size == self.offset:
+            return reset, []
+
+        with open(self.filepath, "rb") as f:
+            f.seek(self.offset)
+            chunk = f.read(st.st_size - self.offset)
+
+        end = chunk.rfind(b"\n") + 1
+        self._torn = end < len(chunk)
+        self.offset += end
+        return reset, self._decode(chunk[:end])
+
+
+    @staticmethod
+    def _decode(chunk: bytes) -> List[dict]:
+        """Разбирает полные строки журнала, пропуская повреждённые."""
+        records = []
+        for line in chunk.splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+        return records
+
+
+    @staticmethod
+    def _encode(records: Iterable[dict]) -> bytes:
+        return "".join(
+            json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n" for r in records
+        ).encode("utf-8")
+
+
+    def append(self, records: Iterable[dict]) -> None:
+        """Дописывает записи в конец журнала одним системным вызовом."""
+        payload = self._encode(records)
+        if not payload:
+            return
+        if self._torn:
+            payload = b"\n" + payload  # отделяем новые строки от оборванного хвоста
+            self._torn = False
+        with open(self.filepath, "ab") as f:
+            f.write(payload)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+
+
+    def write_snapshot(self, records: Iterable[dict]) -> str:
+        """Записывает записи во временный файл рядом с журналом и возвращает его путь."""
+        directory = os.path.dirname(os.path.abspath(self.filepath))
+        fd, tmp_path = tempfile.mkstemp(prefix=".journal-", suffix=".tmp", dir=directory)
+        with os.fdopen(fd, "wb") as f:
+            f.write(self._encode(records))
+        return tmp_path
+
+
+    def install(self, tmp_path: str, tail_from: int) -> None:
+        """
+        Заменяет журнал снимком tmp_path, дописав к нему строки,
+        добавленные в журнал после позиции tail_from (на момент снятия снимка).
+        """
+        with open(tmp_path, "ab") as dst:
+            if tail_from < self.offset:
+                with open(self.filepath, "rb") as src:
+                    src.seek(tail_from)
+                    dst.write(src.read(self.offset - tail_from))
+            dst.flush()
+            if self.fsync:
+                os.fsync(dst.fileno())
+            size = dst.tell()
+        os.replace(tmp_path, self.filepath)
+        st = os.stat(self.filepath)
+        self.offset, self._ino, self._torn = size, st.st_ino, False
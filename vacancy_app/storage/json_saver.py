@@ -1,8 +1,14 @@
 import json
 import os
-from typing import List, Callable, Any
+import tempfile
+from typing import List, Callable, Any, Dict, Iterable, Iterator, Optional, Tuple
 from vacancy_app.models.vacancy import Vacancy
 from .base_saver import BaseSaver
+from .query import VacancyQuery
+
+
+_UMASK = os.umask(0)  # umask процесса читается один раз при импорте: os.umask меняет его для всех потоков
+os.umask(_UMASK)
 
 
 class JSONSaver(BaseSaver):
@@ -12,9 +18,20 @@ class JSONSaver(BaseSaver):
     """
 
 
-    def __init__(self, filepath: str = "vacancies.json"):
-        """Инициализация класса, создаёт файл, если он отсутствует."""
+    def __init__(self, filepath: str = "vacancies.json", cache: bool = False):
+        """
+        Инициализация класса, создаёт файл, если он отсутствует.
+        :param cache: кэшировать готовые объекты Vacancy между вызовами get_vacancies();
+                      кэш сбрасывается при записи через этот объект и при изменении файла извне
+        """
         self.__filepath = filepath  # приватный атрибут
+        self.__data: List[dict] = []  # записи файла в памяти
+        self.__index: Dict[str, int] = {}  # URL -> позиция записи в self.__data
+        self.__signature: Optional[Tuple[int, int, int]] = None  # (mtime_ns, size, inode) загруженного файла
+        self.__cache = cache
+        self.__objects: Optional[List[Vacancy]] = None  # кэш объектов, соответствующий self.__data
+        self.__hits = 0
+        self.__misses = 0
         if not os.path.exists(self.__filepath):
             with open(self.__filepath, "w", encoding="utf-8") as f:
                 json.dump([], f, ensure_ascii=False, indent=2)
@@ -31,9 +48,106 @@ class JSONSaver(BaseSaver):
                 return []
 
     def __write(self, data: List[dict]) -> None:
-        """Приватный метод записи данных в JSON-файл."""
-        with open(self.__filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        """
+        Приватный метод записи данных в JSON-файл.
+        Файл пишется во временный и подменяется атомарно (os.replace), поэтому у каждой
+        версии свой inode и читатели в других процессах надёжно замечают изменение.
+        """
+        self.__objects = None
+        directory = os.path.dirname(os.path.abspath(self.__filepath))
+        fd, tmp_path = tempfile.mkstemp(prefix=".vacancies-", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.chmod(tmp_path, self.__file_mode())
+            os.replace(tmp_path, self.__filepath)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.__signature = self.__stat()
+
+
+    def __file_mode(self) -> int:
+        """Права для новой версии файла: как у текущей, либо по umask (mkstemp создаёт 0600)."""
+        try:
+            return os.stat(self.__filepath).st_mode & 0o777
+        except FileNotFoundError:
+            return 0o666 & ~_UMASK
+
+
+    def __iter_records(self, chunk_size: int) -> Iterator[dict]:
+        """
+        Потоково разбирает JSON-массив файла: элементы декодируются по одному через
+        JSONDecoder.raw_decode из буфера, который дочитывается блоками по chunk_size символов.
+        В памяти держится только текущий элемент и непрочитанный остаток блока.
+        Повреждённый хвост файла завершает итерацию, как и в __read.
+        """
+        if not os.path.exists(self.__filepath):
+            return
+        decoder = json.JSONDecoder()
+        with open(self.__filepath, "r", encoding="utf-8") as f:
+            buf, pos, eof, started = "", 0, False, False
+            while True:
+                while pos < len(buf) and (buf[pos].isspace() or (started and buf[pos] == ",")):
+                    pos += 1
+                if pos >= len(buf):
+                    if eof:
+                        return
+                    buf, pos = f.read(chunk_size), 0
+                    eof = not buf
+                    continue
+
+                if not started:
+                    if buf[pos] != "[":
+                        return
+                    started = True
+                    pos += 1
+                    continue
+                if buf[pos] == "]":
+                    return
+
+                try:
+                    item, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        return
+                    chunk = f.read(chunk_size)  # элемент не поместился в буфер — дочитываем
+                    eof = not chunk
+                    buf, pos = buf[pos:] + chunk, 0
+                    continue
+                pos = end
+                yield item
+
+
+    def __stat(self) -> Optional[Tuple[int, int, int]]:
+        """Возвращает отпечаток файла (mtime_ns, size, inode) или None, если файла нет."""
+        try:
+            st = os.stat(self.__filepath)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+    def __load(self) -> List[dict]:
+        """
+        Возвращает записи из памяти, перечитывая файл только если он изменился
+        с момента последнего чтения или записи (например, другим процессом).
+        """
+        signature = self.__stat()
+        if signature is None or signature != self.__signature:
+            self.__objects = None
+            self.__data = self.__read()
+            self.__reindex()
+            self.__signature = signature
+        return self.__data
+
+
+    def __reindex(self) -> None:
+        """Перестраивает индекс URL -> позиция (при дублях берётся первая запись)."""
+        self.__index = {}
+        for i, item in enumerate(self.__data):
+            self.__index.setdefault(item.get("url"), i)
 
 
     def add_vacancy(self, vacancy: Vacancy) -> None:
@@ -41,41 +155,106 @@ class JSONSaver(BaseSaver):
         Добавляет вакансию в файл.
         Если вакансия с таким URL уже существует — обновляет её.
         """
-        data = self.__read()
+        self.add_vacancies([vacancy])
 
-        updated = False
-        for i, v in enumerate(data):
-            if v.get("url") == vacancy.url:
-                data[i] = vacancy.to_dict()
-                updated = True
-                break
 
-        if not updated:
-            data.append(vacancy.to_dict())
+    def add_vacancies(self, vacancies: Iterable[Vacancy]) -> None:
+        """
+        Пакетно добавляет вакансии: существующие (по URL) обновляются,
+        новые дописываются в конец. Файл перезаписывается один раз на пакет.
+        """
+        data = self.__load()
+        signature, self.__signature = self.__signature, None  # при сбое посреди пакета файл будет перечитан
+        objects, self.__objects = self.__objects, None
 
-        self.__write(data)
+        changed = False
+        for vacancy in vacancies:
+            record = vacancy.to_dict()
+            pos = self.__index.get(vacancy.url)
+            if pos is None:
+                self.__index[vacancy.url] = len(data)
+                data.append(record)
+            else:
+                data[pos] = record
+            changed = True
 
+        if changed:
+            self.__write(data)
+        else:
+            self.__signature, self.__objects = signature, objects
 
-    def get_vacancies(self, filter_func: Callable[[Vacancy], bool] = None) -> List[Vacancy]:
+
+    def get_vacancies(
+        self, filter_func: Callable[[Vacancy], bool] = None, query: Optional[VacancyQuery] = None
+    ) -> List[Vacancy]:
         """
         Возвращает список вакансий.
-        Можно применить фильтр в виде функции.
+        Можно применить фильтр в виде функции и запрос VacancyQuery (выполняется просмотром).
+        При включённом кэше объекты Vacancy переиспользуются, пока файл не изменился;
+        список каждый раз новый, но сами объекты общие — их не следует изменять.
         """
-        data = self.__read()
-        vacancies = [
-            Vacancy(**{k: v for k, v in item.items() if k in Vacancy.__dataclass_fields__})
-            for item in data
-        ]
+        data = self.__load()
+        if self.__cache and self.__objects is not None:
+            self.__hits += 1
+            vacancies = list(self.__objects)
+        else:
+            vacancies = [
+                Vacancy(**{k: v for k, v in item.items() if k in Vacancy.__dataclass_fields__})
+                for item in data
+            ]
+            if self.__cache:
+                self.__misses += 1
+                self.__objects = list(vacancies)
         if filter_func:
             vacancies = [v for v in vacancies if filter_func(v)]
+        if query is not None:
+            vacancies = query.apply(vacancies)
         return vacancies
 
 
+    def iter_vacancies(
+        self, filter_func: Callable[[Vacancy], bool] = None, chunk_size: int = 1 << 16
+    ) -> Iterator[Vacancy]:
+        """
+        Генератор вакансий, читающий файл потоково и с ограниченным расходом памяти:
+        первые результаты доступны сразу, не дожидаясь разбора всего файла.
+        Можно применить фильтр в виде функции.
+        """
+        for item in self.__iter_records(chunk_size):
+            vacancy = Vacancy(**{k: v for k, v in item.items() if k in Vacancy.__dataclass_fields__})
+            if filter_func is None or filter_func(vacancy):
+                yield vacancy
+
+
+    def get_vacancy(self, url: str) -> Optional[Vacancy]:
+        """Возвращает вакансию по URL (через индекс в памяти) или None."""
+        data = self.__load()
+        pos = self.__index.get(url)
+        if pos is None:
+            return None
+        if self.__cache and self.__objects is not None:
+            return self.__objects[pos]
+        return Vacancy(**{k: v for k, v in data[pos].items() if k in Vacancy.__dataclass_fields__})
+
+
+    def delete_vacancies(self, urls: Iterable[str]) -> int:
+        """Удаляет вакансии с указанными URL одной перезаписью файла; возвращает число удалённых записей."""
+        data = self.__load()
+        stale = {url for url in urls if url in self.__index}
+        if not stale:
+            return 0
+        kept = [v for v in data if v.get("url") not in stale]
+        self.__data = kept
+        self.__reindex()
+        self.__write(kept)
+        return len(data) - len(kept)
+
+
     def delete_vacancy(self, identifier: Any) -> bool:
         """
         Удаляет вакансию по URL, названию или объекту Vacancy.
         """
-        data = self.__read()
+        data = self.__load()
         before_count = len(data)
 
         if isinstance(identifier, str):
@@ -83,8 +262,19 @@ class JSONSaver(BaseSaver):
         elif isinstance(identifier, Vacancy):
             data = [v for v in data if v.get("url") != identifier.url]
 
+        if len(data) == before_count:
+            return False
+
+        self.__data = data
+        self.__reindex()
         self.__write(data)
-        return len(data) < before_count
+        return True
+
+
+    @property
+    def cache_stats(self) -> Dict[str, int]:
+        """Статистика кэша объектов: попадания и промахи get_vacancies()."""
+        return {"hits": self.__hits, "misses": self.__misses}
 
 
     @property
@@ -0,0 +1,200 @@
+import os
+import threading
+from typing import List, Callable, Any, Dict, Iterable, Optional
+from vacancy_app.models.vacancy import Vacancy
+from .base_saver import BaseSaver
+from .query import VacancyQuery
+from .journal import Journal
+
+
+class JSONLSaver(BaseSaver):
+    """
+    Хранилище вакансий в виде append-only журнала JSON Lines.
+    Добавление и удаление дописывают по одной строке ({"op": "put", ...} или {"op": "del", ...})
+    вместо перезаписи всего файла. Устаревшие строки убираются компакцией —
+    по запросу (compact()) или автоматически при накоплении compact_threshold устаревших записей.
+    Компакция рассчитана на одного пишущего процесса; читать журнал могут несколько.
+    """
+
+
+    def __init__(
+        self,
+        filepath: str = "vacancies.jsonl",
+        compact_threshold: int = 1000,
+        background_compaction: bool = False,
+        fsync: bool = True,
+    ):
+        """
+        :param filepath: путь к файлу журнала
+        :param compact_threshold: число устаревших строк, после которого запускается компакция (0 — отключить)
+        :param background_compaction: выполнять автоматическую компакцию в фоновом потоке
+        :param fsync: сбрасывать ли каждую запись на диск
+        """
+        self.__journal = Journal(filepath, fsync=fsync)
+        self.__records: Dict[str, dict] = {}  # URL -> актуальная запись вакансии
+        self.__stale = 0  # строки журнала, не влияющие на текущее состояние
+        self.__compact_threshold = compact_threshold
+        self.__background = background_compaction
+        self.__lock = threading.RLock()
+        self.__compactor: Optional[threading.Thread] = None
+
+
+    def __refresh(self) -> None:
+        """Догоняет состояние по строкам, дописанным в журнал с прошлого чтения."""
+        reset, entries = self.__journal.read_new()
+        if reset:
+            self.__records.clear()
+            self.__stale = 0
+        for entry in entries:
+            self.__apply(entry)
+
+
+    def __apply(self, entry: dict) -> None:
+        """Применяет одну запись журнала к состоянию в памяти."""
+        op = entry.get("op")
+        if op == "put":
+            data = entry.get("vacancy") or {}
+            url = data.get("url")
+            if url in self.__records:
+                self.__stale += 1
+            self.__records[url] = data
+        elif op == "del":
+            url = entry.get("url")
+            if self.__records.pop(url, None) is not None:
+                self.__stale += 2  # и удалённая запись, и сама метка удаления
+            else:
+                self.__stale += 1
+
+
+    def __append(self, entries: List[dict]) -> None:
+        """Дописывает записи в журнал и при необходимости запускает компакцию."""
+        if not entries:
+            return
+        self.__journal.append(entries)
+        self.__refresh()
+        if self.__compact_threshold and self.__stale >= self.__compact_threshold:
+            if not self.__compaction_running():
+                self.__start_compaction(wait=not self.__background)
+
+
+    def add_vacancy(self, vacancy: Vacancy) -> None:
+        """Добавляет или обновляет (по URL) вакансию, дописывая одну строку в журнал."""
+        self.add_vacancies([vacancy])
+
+
+    def add_vacancies(self, vacancies: Iterable[Vacancy]) -> None:
+        """Пакетно добавляет вакансии одной записью в журнал."""
+        entries = [{"op": "put", "vacancy": v.to_dict()} for v in vacancies]
+        with self.__lock:
+            self.__refresh()
+            self.__append(entries)
+
+
+    def get_vacancies(
+        self, filter_func: Callable[[Vacancy], bool] = None, query: Optional[VacancyQuery] = None
+    ) -> List[Vacancy]:
+        """
+        Возвращает список актуальных вакансий в порядке первого добавления.
+        Можно применить фильтр в виде функции и запрос VacancyQuery (выполняется просмотром).
+        """
+        with self.__lock:
+            self.__refresh()
+            records = list(self.__records.values())
+        vacancies = [
+            Vacancy(**{k: v for k, v in item.items() if k in Vacancy.__dataclass_fields__})
+            for item in records
+        ]
+        if filter_func:
+            vacancies = [v for v in vacancies if filter_func(v)]
+        if query is not None:
+            vacancies = query.apply(vacancies)
+        return vacancies
+
+
+    def get_vacancy(self, url: str) -> Optional[Vacancy]:
+        """Возвращает вакансию по URL (из состояния в памяти) или None."""
+        with self.__lock:
+            self.__refresh()
+            item = self.__records.get(url)
+        if item is None:
+            return None
+        return Vacancy(**{k: v for k, v in item.items() if k in Vacancy.__dataclass_fields__})
+
+
+    def delete_vacancy(self, identifier: Any) -> bool:
+        """
+        Удаляет вакансию по URL, названию или объекту Vacancy,
+        дописывая метки удаления в журнал.
+        """
+        with self.__lock:
+            self.__refresh()
+            if isinstance(identifier, str):
+                urls = [
+                    url for url, item in self.__records.items()
+                    if url == identifier or item.get("title") == identifier
+                ]
+            elif isinstance(identifier, Vacancy):
+                urls = [identifier.url] if identifier.url in self.__records else []
+            else:
+                urls = []
+
+            self.__append([{"op": "del", "url": url} for url in urls])
+            return bool(urls)
+
+
+    def compact(self, wait: bool = True) -> None:
+        """
+        Переписывает журнал, оставляя только актуальные записи.
+        Снимок пишется во временный файл без блокировки; строки, дописанные за это время,
+        переносятся в новый файл перед атомарной заменой (os.replace).
+        :param wait: False — выполнить компакцию в фоновом потоке
+        """
+        with self.__lock:
+            running = self.__compactor if self.__compaction_running() else None
+            if running is None:
+                self.__start_compaction(wait)
+        if running is not None and wait:
+            running.join()  # вне блокировки: фоновой компакции она нужна для подмены файла
+
+
+    def __compaction_running(self) -> bool:
+        return self.__compactor is not None and self.__compactor.is_alive()
+
+
+    def __start_compaction(self, wait: bool) -> None:
+        """Снимает снимок состояния и запускает компакцию (вызывается под блокировкой)."""
+        with self.__lock:
+            self.__refresh()
+            snapshot = [{"op": "put", "vacancy": item} for item in self.__records.values()]
+            args = (snapshot, self.__journal.offset, self.__stale)
+            if wait:
+                self.__compact(*args)
+            else:
+                self.__compactor = threading.Thread(target=self.__compact, args=args, daemon=True)
+                self.__compactor.start()
+
+
+    def __compact(self, snapshot: List[dict], tail_from: int, stale_before: int) -> None:
+        """Пишет снимок и подменяет им журнал; устаревшими остаются только строки хвоста."""
+        tmp_path = self.__journal.write_snapshot(snapshot)
+        try:
+            with self.__lock:
+                self.__refresh()
+                self.__journal.install(tmp_path, tail_from)
+                self.__stale = max(0, self.__stale - stale_before)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+    def close(self) -> None:
+        """Дожидается завершения фоновой компакции."""
+        compactor = self.__compactor
+        if compactor is not None:
+            compactor.join()
+
+
+    @property
+    def filepath(self) -> str:
+        """Возвращает путь к файлу журнала."""
+        return self.__journal.filepath
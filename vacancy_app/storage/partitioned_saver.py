@@ -0,0 +1,266 @@
+import argparse
+import contextvars
+import dataclasses
+import json
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Callable, Any, Dict, Iterable, Iterator, Optional, Union
+from vacancy_app.models.vacancy import Vacancy
+from .base_saver import BaseSaver
+from .json_saver import JSONSaver
+from .query import VacancyQuery
+
+
+PartitionKey = Union[str, Callable[[Vacancy], Any]]
+
+_KEYS: Dict[str, Callable[[Vacancy], Any]] = {  # встроенные ключи партиционирования
+    "url": lambda v: v.url,
+    "currency": lambda v: v.currency,
+    "employer": lambda v: v.employer,
+}
+_MANIFEST = "partitions.json"
+
+
+class PartitionedSaver(BaseSaver):
+    """
+    Хранилище, распределяющее вакансии по нескольким JSON-файлам (партициям).
+    Партиция выбирается по crc32 от ключа: URL, валюты, работодателя или своей функции.
+    Запись затрагивает только нужные партиции, выборки с фильтром просматривают
+    партиции параллельно в пуле потоков. Схема (число партиций и ключ) хранится
+    в partitions.json; для её смены служит reshard().
+    """
+
+
+    def __init__(
+        self,
+        directory: str = "vacancies",
+        partitions: Optional[int] = None,
+        key: Optional[PartitionKey] = None,
+        max_workers: Optional[int] = None,
+        cache: bool = False,
+    ):
+        """
+        Открывает каталог с партициями, создаёт его при отсутствии.
+        :param partitions: число партиций; по умолчанию берётся из partitions.json или 8
+        :param key: "url", "currency", "employer" или функция Vacancy -> значение;
+                    по умолчанию берётся из partitions.json или "url"
+        :param max_workers: размер пула для параллельного просмотра партиций (по умолчанию — их число)
+        :param cache: включить кэш объектов в каждом JSONSaver
+        """
+        self.__directory = directory
+        os.makedirs(directory, exist_ok=True)
+        manifest_path = os.path.join(directory, _MANIFEST)
+        manifest = None
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if key is None:
+                key = manifest["key"]
+                if key not in _KEYS:
+                    raise ValueError(f"Каталог {directory} разбит пользовательским ключом; передайте key явно")
+        key = key or "url"
+        if isinstance(key, str) and key not in _KEYS:
+            raise ValueError(f"Неизвестный ключ партиционирования: {key!r}")
+        key_name = key if isinstance(key, str) else "custom"
+
+        if manifest is not None:
+            if partitions is None:
+                partitions = manifest["partitions"]
+            if (manifest["partitions"], manifest["key"]) != (partitions, key_name):
+                raise ValueError(
+                    f"Каталог {directory} разбит на {manifest['partitions']} партиций по ключу "
+                    f"{manifest['key']!r}; для смены схемы используйте reshard()"
+                )
+        else:
+            partitions = partitions or 8
+            with open(manifest_path, "w", encoding="utf-8") as f:
+                json.dump({"partitions": partitions, "key": key_name}, f)
+        if partitions < 1:
+            raise ValueError("Число партиций должно быть положительным")
+
+        self.__key_name = key_name
+        self.__key = _KEYS[key] if isinstance(key, str) else key
+        self.__shards = [
+            JSONSaver(os.path.join(directory, f"part-{n:04d}.json"), cache=cache) for n in range(partitions)
+        ]
+        self.__max_workers = max_workers or partitions
+        self.__locations: Optional[Dict[str, int]] = None  # URL -> партиция (для ключей, отличных от URL)
+
+
+    def __partition(self, value: Any) -> int:
+        """Номер партиции для значения ключа."""
+        data = "" if value is None else str(value)
+        return zlib.crc32(data.encode("utf-8")) % len(self.__shards)
+
+
+    def __scan(self, items: List[Any], task: Callable[[Any], Any]) -> List[Any]:
+        """
+        Выполняет task для каждой партиции (или её номера); несколько — параллельно.
+        Потоки пула получают контекст вызывающего, чтобы метрики партиций не дублировали общую.
+        """
+        if len(items) <= 1 or self.__max_workers <= 1:
+            return [task(item) for item in items]
+        context = contextvars.copy_context()
+        with ThreadPoolExecutor(max_workers=min(self.__max_workers, len(items))) as executor:
+            return list(executor.map(lambda item: context.copy().run(task, item), items))
+
+
+    def __url_locations(self) -> Dict[str, int]:
+        """URL -> партиция; строится одним просмотром при первом обращении и далее обновляется при записи."""
+        if self.__locations is None:
+            urls = self.__scan(self.__shards, lambda shard: [v.url for v in shard.get_vacancies()])
+            self.__locations = {url: n for n, shard_urls in enumerate(urls) for url in shard_urls}
+        return self.__locations
+
+
+    def add_vacancy(self, vacancy: Vacancy) -> None:
+        """Добавляет вакансию или обновляет существующую с тем же URL."""
+        self.add_vacancies([vacancy])
+
+
+    def add_vacancies(self, vacancies: Iterable[Vacancy]) -> None:
+        """
+        Пакетно добавляет вакансии: каждая партиция перезаписывается не более одного раза.
+        Если ключ не URL и вакансия сменила партицию (например, валюту), старая запись удаляется —
+        одной перезаписью старой партиции и только после того, как новая копия записана.
+        """
+        groups: Dict[int, List[Vacancy]] = {}
+        moved: Dict[int, List[str]] = {}
+        locations = None if self.__key_name == "url" else self.__url_locations()
+        for vacancy in vacancies:
+            n = self.__partition(self.__key(vacancy))
+            groups.setdefault(n, []).append(vacancy)
+            if locations is not None:
+                previous = locations.get(vacancy.url)
+                if previous is not None and previous != n:
+                    moved.setdefault(previous, []).append(vacancy.url)
+                locations[vacancy.url] = n
+
+        self.__scan(list(groups), lambda n: self.__shards[n].add_vacancies(groups[n]))
+        for n, urls in moved.items():
+            self.__shards[n].delete_vacancies(url for url in urls if locations[url] != n)
+
+
+    def get_vacancies(
+        self, filter_func: Callable[[Vacancy], bool] = None, query: Optional[VacancyQuery] = None
+    ) -> List[Vacancy]:
+        """
+        Возвращает вакансии всех партиций (по порядку партиций).
+        Партиции просматриваются параллельно; запрос с currency/employer при таком же ключе
+        читает только одну партицию, а limit ограничивает выдачу каждой партиции до слияния.
+        """
+        shards = self.__shards
+        if query is not None and self.__key_name in ("currency", "employer"):
+            value = getattr(query, self.__key_name)
+            if value is not None:
+                shards = [self.__shards[self.__partition(value)]]
+
+        if query is not None and len(shards) > 1:
+            end = None if query.limit is None else query.offset + query.limit
+            shard_query = dataclasses.replace(query, limit=end, offset=0)
+            return query.apply(self.__merge(shards, filter_func, shard_query))
+        return self.__merge(shards, filter_func, query)
+
+
+    def __merge(
+        self, shards: List[JSONSaver], filter_func: Optional[Callable[[Vacancy], bool]], query: Optional[VacancyQuery]
+    ) -> List[Vacancy]:
+        """Параллельно читает партиции и склеивает результаты в порядке партиций."""
+        parts = self.__scan(shards, lambda shard: shard.get_vacancies(filter_func, query))
+        return [v for part in parts for v in part]
+
+
+    def iter_vacancies(self, filter_func: Callable[[Vacancy], bool] = None) -> Iterator[Vacancy]:
+        """Генератор вакансий, читающий партиции по очереди потоково."""
+        for shard in self.__shards:
+            yield from shard.iter_vacancies(filter_func)
+
+
+    def get_vacancy(self, url: str) -> Optional[Vacancy]:
+        """Возвращает вакансию по URL, читая только её партицию, или None."""
+        n = self.__url_partition(url)
+        return None if n is None else self.__shards[n].get_vacancy(url)
+
+
+    def __url_partition(self, url: str) -> Optional[int]:
+        """Партиция, где может лежать URL: при ключе URL — вычисляется, иначе — по карте URL -> партиция."""
+        if self.__key_name == "url":
+            return self.__partition(url)
+        return self.__url_locations().get(url)
+
+
+    def delete_vacancy(self, identifier: Any) -> bool:
+        """
+        Удаляет вакансию по URL, названию или объекту Vacancy.
+        URL ищется только в своей партиции (при ключе URL — сразу, иначе по карте URL -> партиция);
+        строка, не найденная как URL, считается названием, и тогда проверяются все партиции.
+        """
+        url = identifier.url if isinstance(identifier, Vacancy) else identifier
+        if not isinstance(url, str):
+            return False
+
+        n = self.__url_partition(url)
+        if n is not None and self.__shards[n].get_vacancy(url) is not None:
+            self.__shards[n].delete_vacancies([url])
+            if self.__locations is not None:
+                self.__locations.pop(url, None)
+            return True
+        if isinstance(identifier, Vacancy):
+            return False
+
+        deleted = self.__scan(self.__shards, lambda shard: shard.delete_vacancy(identifier))
+        if any(deleted):
+            self.__locations = None  # названия не индексируются — карту проще построить заново
+        return any(deleted)
+
+
+    @property
+    def partitions(self) -> int:
+        """Число партиций."""
+        return len(self.__shards)
+
+
+    @property
+    def directory(self) -> str:
+        """Каталог с партициями."""
+        return self.__directory
+
+
+def reshard(
+    source: str,
+    directory: str,
+    partitions: int = 8,
+    key: PartitionKey = "url",
+) -> PartitionedSaver:
+    """
+    Переносит вакансии в новый каталог с партициями.
+    :param source: файл JSONSaver или каталог PartitionedSaver (схема берётся из его partitions.json)
+    :param directory: новый каталог; не должен содержать партиций
+    """
+    if os.path.exists(os.path.join(directory, _MANIFEST)):
+        raise ValueError(f"Каталог {directory} уже содержит партиции")
+    if os.path.isdir(source):
+        reader: BaseSaver = PartitionedSaver(source)  # схема берётся из partitions.json
+    else:
+        reader = JSONSaver(source)
+
+    target = PartitionedSaver(directory, partitions=partitions, key=key)
+    target.add_vacancies(reader.iter_vacancies())
+    return target
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Разбиение хранилища вакансий на партиции")
+    parser.add_argument("source", help="файл JSONSaver или каталог с партициями")
+    parser.add_argument("directory", help="новый каталог для партиций")
+    parser.add_argument("--partitions", type=int, default=8, help="число партиций")
+    parser.add_argument("--key", choices=sorted(_KEYS), default="url", help="ключ партиционирования")
+    args = parser.parse_args(argv)
+
+    target = reshard(args.source, args.directory, partitions=args.partitions, key=args.key)
+    print(f"{sum(1 for _ in target.iter_vacancies())} вакансий разложено по {target.partitions} партициям")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import heapq
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional
+from vacancy_app.models.vacancy import Vacancy
+
+
+SORT_KEYS = ("salary", "title")
+
+
+@dataclass
+class VacancyQuery:
+    """
+    Декларативный запрос к хранилищу вакансий.
+    Хранилище само решает, как его выполнить: SQLiteSaver переводит условия в SQL
+    и использует индексы, файловые хранилища применяют apply() к прочитанным записям.
+    """
+
+    keywords: List[str] = field(default_factory=list)  # слова в названии или описании
+    match_all: bool = False  # True — все слова, иначе любое
+    salary_min: Optional[float] = None  # по средней зарплате, включительно
+    salary_max: Optional[float] = None
+    currency: Optional[str] = None
+    employer: Optional[str] = None
+    sort_by: Optional[str] = None  # "salary", "title" или None (порядок хранилища)
+    descending: bool = True
+    limit: Optional[int] = None
+    offset: int = 0
+
+    def __post_init__(self):
+        if self.sort_by is not None and self.sort_by not in SORT_KEYS:
+            raise ValueError(f"Неизвестный ключ сортировки: {self.sort_by!r}. Допустимо: {', '.join(SORT_KEYS)}.")
+        self.keywords = [k for k in self.keywords if k and k.strip()]
+
+
+    def matches(self, vacancy: Vacancy) -> bool:
+        """Проверяет условия фильтрации (без сортировки и пагинации)."""
+        if self.keywords:
+            title, description = vacancy.title.casefold(), vacancy.description.casefold()
+            found = (k.casefold() in title or k.casefold() in description for k in self.keywords)
+            if not (all(found) if self.match_all else any(found)):
+                return False
+        if self.salary_min is not None or self.salary_max is not None:
+            avg = vacancy.average_salary()
+            if self.salary_min is not None and avg < self.salary_min:
+                return False
+            if self.salary_max is not None and avg > self.salary_max:
+                return False
+        if self.currency is not None and vacancy.currency != self.currency:
+            return False
+        if self.employer is not None and vacancy.employer != self.employer:
+            return False
+        return True
+
+
+    def sort_key(self):
+        return (lambda v: v.average_salary()) if self.sort_by == "salary" else (lambda v: v.title.casefold())
+
+
+    def apply(self, vacancies: Iterable[Vacancy]) -> List[Vacancy]:
+        """
+        Выполняет запрос полным просмотром: фильтр, сортировка (устойчивая), offset и limit.
+        При сортировке с limit используется ограниченная куча вместо полной сортировки.
+        """
+        matched = [v for v in vacancies if self.matches(v)]
+        if self.sort_by is not None:
+            key = self.sort_key()
+            if self.limit is not None:
+                take = self.offset + self.limit
+                pick = heapq.nlargest if self.descending else heapq.nsmallest
+                matched = pick(take, matched, key=key)
+            else:
+                matched = sorted(matched, key=key, reverse=self.descending)
+        end = None if self.limit is None else self.offset + self.limit
+        return matched[self.offset:end]
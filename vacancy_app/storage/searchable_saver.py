@@ -0,0 +1,142 @@
+import os
+from typing import List, Callable, Any, Iterable, Iterator, Optional
+from vacancy_app.models.vacancy import Vacancy
+from vacancy_app.utils.bm25 import BM25Index
+from .base_saver import BaseSaver
+from .query import VacancyQuery
+
+
+class SearchableSaver(BaseSaver):
+    """
+    Обёртка над любым хранилищем, поддерживающая BM25-индекс для ранжированного поиска.
+    Индекс хранится в журнале рядом с хранилищем (<файл хранилища>.bm25.jsonl) и обновляется
+    при каждом add_vacancy/add_vacancies/delete_vacancy, поэтому после перезапуска
+    он просто читается с диска. Вместе с индексом запоминается отпечаток файлов хранилища
+    (размер и время изменения); если при открытии он не совпадает — хранилище менялось
+    в обход обёртки, и индекс строится заново.
+    """
+
+
+    def __init__(self, saver: BaseSaver, index_path: Optional[str] = None, title_weight: float = 3.0):
+        """
+        :param saver: хранилище вакансий
+        :param index_path: файл индекса; по умолчанию — рядом с файлом хранилища
+        :param title_weight: вес слов названия относительно слов описания
+        """
+        location = getattr(saver, "filepath", None) or getattr(saver, "directory", None)
+        if index_path is None:
+            if location is None:
+                raise ValueError("Для этого хранилища укажите index_path явно")
+            index_path = location.rstrip("/\\") + ".bm25.jsonl"
+        self.__saver = saver
+        self.__location = location
+        self.__index = BM25Index(index_path, title_weight=title_weight)
+        stamp = self.__fingerprint()
+        if (self.__index.stamp != stamp) if stamp is not None else not len(self.__index):
+            self.rebuild()
+
+
+    def __fingerprint(self) -> Optional[List[list]]:
+        """
+        Отпечаток хранилища: [имя, размер, mtime_ns] его файлов (для SQLite — и журнала WAL,
+        для каталога партиций — всех файлов каталога). None, если файлы хранилища неизвестны.
+        """
+        if self.__location is None:
+            return None
+        if os.path.isdir(self.__location):
+            paths = sorted(
+                entry.path for entry in os.scandir(self.__location)
+                if entry.is_file() and not entry.name.startswith(".")
+            )
+        else:
+            paths = [self.__location, self.__location + "-wal"]
+        stamp = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if st.st_size or path == self.__location:  # пустой WAL SQLite создаёт при каждом открытии
+                stamp.append([os.path.basename(path), st.st_size, st.st_mtime_ns])
+        return stamp
+
+
+    def rebuild(self) -> None:
+        """Строит индекс заново по всем вакансиям хранилища."""
+        self.__index.clear()
+        self.__index.add_many(list(self.__saver.iter_vacancies()), stamp=self.__fingerprint())
+
+
+    def add_vacancy(self, vacancy: Vacancy) -> None:
+        self.add_vacancies([vacancy])
+
+
+    def add_vacancies(self, vacancies: Iterable[Vacancy]) -> None:
+        vacancies = list(vacancies)
+        self.__saver.add_vacancies(vacancies)
+        self.__index.add_many(vacancies, stamp=self.__fingerprint())
+
+
+    def get_vacancies(
+        self, filter_func: Callable[[Vacancy], bool] = None, query: Optional[VacancyQuery] = None
+    ) -> List[Vacancy]:
+        return self.__saver.get_vacancies(filter_func, query)
+
+
+    def get_vacancy(self, url: str) -> Optional[Vacancy]:
+        return self.__saver.get_vacancy(url)
+
+
+    def iter_vacancies(self, filter_func: Callable[[Vacancy], bool] = None) -> Iterator[Vacancy]:
+        return self.__saver.iter_vacancies(filter_func)
+
+
+    def delete_vacancy(self, identifier: Any) -> bool:
+        """
+        Удаляет вакансию по URL, названию или объекту Vacancy и убирает её из индекса.
+        Удаление по названию требует просмотра хранилища, чтобы узнать URL удалённых вакансий.
+        """
+        if isinstance(identifier, Vacancy):
+            urls = [identifier.url]
+        elif isinstance(identifier, str) and identifier in self.__index:
+            urls = [identifier]
+        elif isinstance(identifier, str):
+            urls = [v.url for v in self.__saver.get_vacancies(lambda v: v.title == identifier)]
+        else:
+            urls = []
+        deleted = self.__saver.delete_vacancy(identifier)
+        if deleted:
+            for url in urls:
+                self.__index.remove(url)
+            self.__index.mark(self.__fingerprint())
+        return deleted
+
+
+    def search(self, text: str, k: int = 10) -> List[Vacancy]:
+        """
+        Возвращает до k вакансий, наиболее релевантных запросу (BM25, название весомее описания),
+        по убыванию релевантности. Из хранилища читаются только найденные вакансии (по URL).
+        """
+        found = (self.__saver.get_vacancy(url) for url, _ in self.__index.search(text, k))
+        return [v for v in found if v is not None]
+
+
+    def connect(self):
+        return self.__saver.connect()
+
+
+    def close(self):
+        """
+        Закрывает хранилище. Если индекс был актуален, отпечаток обновляется после закрытия:
+        SQLite при закрытии переносит WAL в основной файл, и без этого индекс строился бы заново.
+        """
+        current = self.__fingerprint()
+        self.__saver.close()
+        if current is not None and current == self.__index.stamp:
+            self.__index.mark(self.__fingerprint())
+
+
+    @property
+    def index(self) -> BM25Index:
+        """BM25-индекс хранилища."""
+        return self.__index
@@ -0,0 +1,237 @@
+import sqlite3
+import threading
+from typing import List, Callable, Any, Iterable, Optional, Sequence, Tuple
+from vacancy_app.models.vacancy import Vacancy
+from .base_saver import BaseSaver
+from .query import VacancyQuery
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS vacancies (
+    id          INTEGER PRIMARY KEY,
+    url         TEXT NOT NULL UNIQUE,
+    title       TEXT NOT NULL,
+    description TEXT NOT NULL,
+    employer    TEXT,
+    salary_from INTEGER NOT NULL DEFAULT 0,
+    salary_to   INTEGER NOT NULL DEFAULT 0,
+    currency    TEXT,
+    salary_avg  REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ix_vacancies_salary ON vacancies (salary_from, salary_to);
+CREATE INDEX IF NOT EXISTS ix_vacancies_salary_avg ON vacancies (salary_avg);
+CREATE INDEX IF NOT EXISTS ix_vacancies_currency ON vacancies (currency);
+CREATE INDEX IF NOT EXISTS ix_vacancies_employer ON vacancies (employer);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS vacancies_fts USING fts5(
+    title, description, content='vacancies', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS vacancies_ai AFTER INSERT ON vacancies BEGIN
+    INSERT INTO vacancies_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS vacancies_ad AFTER DELETE ON vacancies BEGIN
+    INSERT INTO vacancies_fts (vacancies_fts, rowid, title, description)
+    VALUES ('delete', old.id, old.title, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS vacancies_au AFTER UPDATE OF title, description ON vacancies BEGIN
+    INSERT INTO vacancies_fts (vacancies_fts, rowid, title, description)
+    VALUES ('delete', old.id, old.title, old.description);
+    INSERT INTO vacancies_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+END;
+"""
+
+_COLUMNS = "url, title, description, employer, salary_from, salary_to, currency"
+
+_UPSERT = f"""
+INSERT INTO vacancies ({_COLUMNS}, salary_avg) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (url) DO UPDATE SET
+    title = excluded.title, description = excluded.description, employer = excluded.employer,
+    salary_from = excluded.salary_from, salary_to = excluded.salary_to,
+    currency = excluded.currency, salary_avg = excluded.salary_avg
+"""
+
+
+class SQLiteSaver(BaseSaver):
+    """
+    Хранилище вакансий в базе SQLite (только стандартная библиотека).
+    URL, зарплата, валюта и работодатель проиндексированы, а по названию и описанию
+    построен полнотекстовый индекс FTS5, поэтому поиск по ключевым словам и диапазону
+    зарплат выполняется внутри базы без загрузки всех строк в Python.
+    """
+
+
+    def __init__(self, filepath: str = "vacancies.db"):
+        """:param filepath: путь к файлу базы данных (":memory:" — база в памяти)"""
+        self.__filepath = filepath
+        self.__conn: Optional[sqlite3.Connection] = None
+        self.__lock = threading.RLock()
+        self.__fts = False  # доступен ли FTS5 в текущей сборке SQLite
+        self.connect()
+
+
+    def connect(self) -> None:
+        """Открывает соединение и создаёт схему, если её ещё нет."""
+        if self.__conn is not None:
+            return
+        conn = sqlite3.connect(self.__filepath, check_same_thread=False)
+        if self.__filepath != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.create_function("casefold", 1, lambda value: value.casefold() if value else value, deterministic=True)
+        conn.executescript(_SCHEMA)
+        try:
+            conn.executescript(_FTS_SCHEMA)
+            self.__fts = True
+        except sqlite3.OperationalError:
+            self.__fts = False  # сборка без FTS5: поиск откатится на сканирование таблицы
+        conn.commit()
+        self.__conn = conn
+
+
+    def close(self) -> None:
+        """Закрывает соединение с базой."""
+        if self.__conn is not None:
+            self.__conn.close()
+            self.__conn = None
+
+
+    def __query(self, sql: str, params: Sequence[Any] = ()) -> List[Vacancy]:
+        """Выполняет SELECT по таблице вакансий и превращает строки в объекты Vacancy."""
+        with self.__lock:
+            rows = self.__conn.execute(sql, params).fetchall()
+        return [
+            Vacancy(
+                url=url, title=title, description=description, employer=employer,
+                salary_from=salary_from, salary_to=salary_to, currency=currency,
+            )
+            for url, title, description, employer, salary_from, salary_to, currency in rows
+        ]
+
+
+    def add_vacancy(self, vacancy: Vacancy) -> None:
+        """Добавляет вакансию или обновляет существующую с тем же URL."""
+        self.add_vacancies([vacancy])
+
+
+    def add_vacancies(self, vacancies: Iterable[Vacancy]) -> None:
+        """Пакетно добавляет вакансии в одной транзакции."""
+        rows = [
+            (v.url, v.title, v.description, v.employer, v.salary_from, v.salary_to,
+             v.currency, v.average_salary())
+            for v in vacancies
+        ]
+        with self.__lock, self.__conn:
+            self.__conn.executemany(_UPSERT, rows)
+
+
+    def get_vacancies(
+        self, filter_func: Callable[[Vacancy], bool] = None, query: Optional[VacancyQuery] = None
+    ) -> List[Vacancy]:
+        """
+        Возвращает список вакансий в порядке добавления.
+        Запрос VacancyQuery выполняется внутри базы (индексы, FTS5, ORDER BY/LIMIT);
+        фильтр-функция применяется в Python, поэтому limit/offset тогда считаются после неё.
+        """
+        if query is None:
+            query = VacancyQuery()
+        sql, params = self.__plan(query, paginate=filter_func is None)
+        vacancies = self.__query(sql, params)
+        if filter_func:
+            vacancies = [v for v in vacancies if filter_func(v)]
+            end = None if query.limit is None else query.offset + query.limit
+            vacancies = vacancies[query.offset:end]
+        return vacancies
+
+
+    def get_vacancy(self, url: str) -> Optional[Vacancy]:
+        """Возвращает вакансию по URL (поиск по уникальному индексу) или None."""
+        found = self.__query(f"SELECT {_COLUMNS} FROM vacancies WHERE url = ?", (url,))
+        return found[0] if found else None
+
+
+    def __plan(self, query: VacancyQuery, paginate: bool = True) -> Tuple[str, List[Any]]:
+        """Переводит VacancyQuery в SQL-запрос с параметрами."""
+        conditions, params = [], []
+        if query.keywords:
+            if self.__fts:
+                terms = ['"{}"*'.format(k.replace('"', '""')) for k in query.keywords]
+                conditions.append("id IN (SELECT rowid FROM vacancies_fts WHERE vacancies_fts MATCH ?)")
+                params.append((" AND " if query.match_all else " OR ").join(terms))
+            else:
+                op = " AND " if query.match_all else " OR "
+                conditions.append("(" + op.join(
+                    "(instr(casefold(title), ?) > 0 OR instr(casefold(description), ?) > 0)"
+                    for _ in query.keywords
+                ) + ")")
+                params += [p for k in query.keywords for p in (k.casefold(), k.casefold())]
+        if query.salary_min is not None:
+            conditions.append("salary_avg >= ?")
+            params.append(query.salary_min)
+        if query.salary_max is not None:
+            conditions.append("salary_avg <= ?")
+            params.append(query.salary_max)
+        if query.currency is not None:
+            conditions.append("currency = ?")
+            params.append(query.currency)
+        if query.employer is not None:
+            conditions.append("employer = ?")
+            params.append(query.employer)
+
+        sql = f"SELECT {_COLUMNS} FROM vacancies"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+
+        direction = "DESC" if query.descending else "ASC"
+        if query.sort_by == "salary":
+            sql += f" ORDER BY salary_avg {direction}, id"
+        elif query.sort_by == "title":
+            sql += f" ORDER BY casefold(title) {direction}, id"
+        else:
+            sql += " ORDER BY id"
+
+        if paginate and (query.limit is not None or query.offset):
+            sql += " LIMIT ? OFFSET ?"
+            params += [query.limit if query.limit is not None else -1, query.offset]
+        return sql, params
+
+
+    def delete_vacancy(self, identifier: Any) -> bool:
+        """
+        Удаляет вакансию по URL, названию или объекту Vacancy.
+        """
+        if isinstance(identifier, str):
+            sql, params = "DELETE FROM vacancies WHERE url = ? OR title = ?", (identifier, identifier)
+        elif isinstance(identifier, Vacancy):
+            sql, params = "DELETE FROM vacancies WHERE url = ?", (identifier.url,)
+        else:
+            return False
+        with self.__lock, self.__conn:
+            return self.__conn.execute(sql, params).rowcount > 0
+
+
+    def search(self, keywords: Iterable[str], match_all: bool = False) -> List[Vacancy]:
+        """
+        Ищет вакансии по ключевым словам в названии и описании через FTS5.
+        Ключевое слово совпадает со словами текста, которые начинаются с него (без учёта регистра),
+        тогда как filter_vacancies_by_keyword ищет подстроку в любом месте текста.
+        Без FTS5 выполняется поиск подстроки по всей таблице с приведением регистра в Python.
+        :param match_all: True — должны встретиться все слова, иначе любое из них
+        """
+        return self.get_vacancies(query=VacancyQuery(keywords=list(keywords), match_all=match_all))
+
+
+    def filter_by_salary(self, min_salary: Optional[int] = None, max_salary: Optional[int] = None) -> List[Vacancy]:
+        """Возвращает вакансии, средняя зарплата которых лежит в диапазоне [min_salary, max_salary]."""
+        return self.get_vacancies(query=VacancyQuery(salary_min=min_salary, salary_max=max_salary))
+
+
+    def top_by_salary(self, n: int) -> List[Vacancy]:
+        """Возвращает N вакансий с наибольшей средней зарплатой (по индексу, без сортировки всей таблицы)."""
+        return self.get_vacancies(query=VacancyQuery(sort_by="salary", limit=max(n, 0)))
+
+
+    @property
+    def filepath(self) -> str:
+        """Возвращает путь к файлу базы данных."""
+        return self.__filepath
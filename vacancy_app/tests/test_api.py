@@ -0,0 +1,391 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+pytest.importorskip("requests")
+
+from vacancy_app.api.cache import ResponseCache
+from vacancy_app.api.details import DetailCache
+from vacancy_app.api.hh_api import HeadHunterAPI
+from vacancy_app.api.scheduler import RequestScheduler, TokenBucket
+from vacancy_app.models.vacancy import Vacancy
+from vacancy_app.pipeline.harvester import Harvester
+from vacancy_app.pipeline.stream import ingest
+from vacancy_app.storage.json_saver import JSONSaver
+from vacancy_app.utils.metrics import registry as metrics
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Отдаёт страницы /vacancies в формате hh.ru; поведение задаётся атрибутами сервера."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        parsed = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        with server.lock:
+            server.requests.append((parsed.path, params, self.headers))
+            server.clients.add(self.client_address)
+
+        if server.failures:
+            with server.lock:
+                status, retry_after = server.failures.pop(0)
+            self._send(status, {"errors": [{"type": "throttled"}]},
+                       {"Retry-After": retry_after} if retry_after is not None else None)
+            return
+
+        if parsed.path.startswith("/vacancies/"):
+            vacancy_id = parsed.path.rsplit("/", 1)[1]
+            if vacancy_id in server.missing:
+                self._send(404, {"errors": [{"type": "not_found"}]})
+            else:
+                self._send(200, {"id": vacancy_id, "published_at": "2024-01-01T10:00:00+0300",
+                                 "description": f"<p>Full <b>description</b> &amp; duties {vacancy_id}</p>"})
+            return
+
+        if server.etag and self.headers.get("If-None-Match") == server.etag:
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        page = int(params.get("page", 0))
+        per_page = int(params.get("per_page", 20))
+        items = [
+            {
+                "id": str(page * per_page + i),
+                "name": f"{params.get('text', '')} {page * per_page + i}",
+                "alternate_url": f"https://hh.ru/vacancy/{page * per_page + i}",
+                "salary": {"from": 1000 * (page + 1), "to": None, "currency": "RUR"},
+                "snippet": {"requirement": "python"},
+                "published_at": "2024-01-01T10:00:00+0300",
+            }
+            for i in range(per_page)
+        ]
+        headers = {"ETag": server.etag} if server.etag else {}
+        self._send(200, {"items": items, "pages": server.total_pages, "page": page}, headers)
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.clients = set()
+    server.total_pages = 5
+    server.etag = None
+    server.failures = []  # [(status, Retry-After)] — ответы перед успешными
+    server.missing = set()  # ID вакансий, на которые /vacancies/{id} отвечает 404
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_api(server, **kwargs):
+    api = HeadHunterAPI(**kwargs)
+    api.BASE_URL = f"http://127.0.0.1:{server.server_address[1]}"
+    return api
+
+
+def test_get_vacancies_sequential(stub_server):
+    api = make_api(stub_server)
+    items = api.get_vacancies("python", per_page=3, pages=10)
+
+    assert [item["id"] for item in items] == [str(i) for i in range(15)]
+    assert len(stub_server.clients) == 1  # одно keep-alive соединение на все страницы
+    assert stub_server.requests[0][2]["User-Agent"] == "hh-python-client/1.0"
+
+
+def test_get_vacancies_concurrent_keeps_page_order(stub_server):
+    stub_server.total_pages = 20
+    api = make_api(stub_server, max_workers=4)
+    items = api.get_vacancies("python", per_page=2, pages=20)
+
+    assert [item["id"] for item in items] == [str(i) for i in range(40)]
+    assert sorted(int(p["page"]) for _, p, _ in stub_server.requests) == list(range(20))
+    assert len(stub_server.clients) <= 4
+    api.close()
+
+
+def test_get_vacancies_grows_pool_for_call_workers(stub_server):
+    stub_server.total_pages = 16
+    api = make_api(stub_server)
+
+    assert len(api.get_vacancies("python", per_page=1, pages=16, max_workers=4)) == 16
+    assert api._pool_size == 4
+    assert len(stub_server.clients) <= 4
+    assert len(api.get_vacancies("python", per_page=1, pages=16, max_workers=4)) == 16
+    assert len(stub_server.clients) <= 4  # соединения переиспользованы, а не отброшены
+
+
+def test_get_vacancies_zero_pages(stub_server):
+    assert make_api(stub_server).get_vacancies("python", pages=0) == []
+    assert stub_server.requests == []
+
+
+def test_get_vacancies_respects_pages_limit(stub_server):
+    api = make_api(stub_server, max_workers=8)
+    items = api.get_vacancies("python", per_page=2, pages=2)
+
+    assert len(items) == 4
+    assert len(stub_server.requests) == 2
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_response_cache_hits_and_ttl_revalidation(stub_server, tmp_path):
+    stub_server.etag = '"v1"'
+    clock = FakeClock()
+    cache = ResponseCache(str(tmp_path / "cache.db"), ttl=60, clock=clock)
+    api = make_api(stub_server, cache=cache)
+
+    first = api.get_vacancies("python", per_page=2)
+    assert api.get_vacancies("python", per_page=2) == first
+    assert len(stub_server.requests) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    clock.now += 120
+    assert api.get_vacancies("python", per_page=2) == first
+    assert len(stub_server.requests) == 2
+    assert stub_server.requests[-1][2]["If-None-Match"] == '"v1"'
+    assert cache.revalidations == 1
+
+    restored = ResponseCache(str(tmp_path / "cache.db"), ttl=60, clock=clock)
+    assert make_api(stub_server, cache=restored).get_vacancies("python", per_page=2) == first
+    assert len(stub_server.requests) == 2
+
+
+def test_response_cache_key_normalization_and_lru():
+    clock = FakeClock()
+    cache = ResponseCache(":memory:", ttl=60, max_entries=2, clock=clock)
+    assert cache.make_key("u", {"a": 1, "b": "x"}) == cache.make_key("u", {"b": "x", "a": "1"})
+
+    for name in ("a", "b"):
+        cache.store(cache.make_key(name), {"name": name})
+        clock.now += 1
+    cache.lookup(cache.make_key("a"))
+    clock.now += 1
+    cache.store(cache.make_key("c"), {"name": "c"})
+
+    assert cache.lookup(cache.make_key("b")) is None
+    assert cache.lookup(cache.make_key("a")).data == {"name": "a"}
+    assert cache.stats["evictions"] == 1
+    assert cache.stats["size"] == 2
+
+
+def test_iter_vacancies_streams_pages_in_order(stub_server):
+    api = make_api(stub_server, max_workers=3)
+    stream = api.iter_vacancies("python", per_page=2, pages=5)
+
+    first = next(stream)
+    assert isinstance(first, Vacancy)
+    assert first.url == "https://hh.ru/vacancy/0"
+    assert [v.url for v in stream][-1] == "https://hh.ru/vacancy/9"
+
+
+def test_ingest_streams_into_saver(stub_server, tmp_path):
+    saver = JSONSaver(str(tmp_path / "vacancies.json"))
+    api = make_api(stub_server, max_workers=2)
+
+    assert ingest(api, saver, "python", per_page=3, pages=5) == 15
+    stored = saver.get_vacancies()
+    assert [v.url for v in stored] == [f"https://hh.ru/vacancy/{i}" for i in range(15)]
+    assert stored[3].salary_from == 2000
+
+
+def test_ingest_propagates_storage_errors(stub_server, tmp_path):
+    class BrokenSaver(JSONSaver):
+        def add_vacancies(self, vacancies):
+            raise OSError("disk full")
+
+    api = make_api(stub_server)
+    with pytest.raises(OSError, match="disk full"):
+        ingest(api, BrokenSaver(str(tmp_path / "vacancies.json")), "python", per_page=2, pages=5)
+
+
+class FakeTimer:
+    """Монотонные часы и sleep, которые только сдвигают время."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_scheduler(timer, **kwargs):
+    kwargs.setdefault("rng", lambda: 0.5)
+    return RequestScheduler(clock=timer.clock, sleep=timer.sleep, **kwargs)
+
+
+def test_scheduler_honours_retry_after(stub_server):
+    stub_server.failures = [(429, "2"), (429, "3")]
+    timer = FakeTimer()
+    scheduler = make_scheduler(timer, max_concurrency=8)
+    api = make_api(stub_server, scheduler=scheduler)
+
+    assert len(api.get_vacancies("python", per_page=2)) == 2
+    assert timer.sleeps == [2.0, 3.0]
+    assert scheduler.stats["throttled"] == 2
+    assert scheduler.concurrency == 2.5  # 8 / 2 / 2 после троттлинга и +1/2 после успеха
+
+
+def test_scheduler_does_not_cap_retry_after(stub_server):
+    stub_server.failures = [(429, "120")]
+    timer = FakeTimer()
+    api = make_api(stub_server, scheduler=make_scheduler(timer, backoff_max=30))
+
+    api.get_vacancies("python", per_page=2)
+    assert timer.sleeps == [120.0]
+
+
+def test_scheduler_backs_off_on_server_errors(stub_server):
+    stub_server.failures = [(503, None), (502, None)]
+    timer = FakeTimer()
+    api = make_api(stub_server, scheduler=make_scheduler(timer, backoff_base=1.0))
+
+    assert len(api.get_vacancies("python", per_page=2)) == 2
+    assert timer.sleeps == [0.5, 1.0]  # джиттер 0.5 * (1, 2)
+
+
+def test_scheduler_gives_up_after_max_retries(stub_server):
+    import requests
+
+    stub_server.failures = [(429, "0")] * 3
+    api = make_api(stub_server, scheduler=make_scheduler(FakeTimer(), max_retries=2))
+
+    with pytest.raises(requests.HTTPError):
+        api.get_vacancies("python")
+
+
+def test_scheduler_recovers_concurrency_after_successes(stub_server):
+    stub_server.failures = [(429, "0")]
+    stub_server.total_pages = 30
+    scheduler = make_scheduler(FakeTimer(), max_concurrency=4)
+    api = make_api(stub_server, scheduler=scheduler, max_workers=4)
+
+    assert len(api.get_vacancies("python", per_page=1, pages=30)) == 30
+    assert scheduler.concurrency == 4
+
+
+def test_token_bucket_limits_rate():
+    timer = FakeTimer()
+    bucket = TokenBucket(rate=2, burst=1, clock=timer.clock, sleep=timer.sleep)
+
+    for _ in range(5):
+        bucket.acquire()
+    assert timer.now == pytest.approx(2.0)
+
+
+def test_token_bucket_does_not_spin_on_float_rounding():
+    timer = FakeTimer()
+    bucket = TokenBucket(rate=20, clock=timer.clock, sleep=timer.sleep)
+
+    for _ in range(100):
+        bucket.acquire()
+    assert timer.now == pytest.approx(4.0, abs=0.05)
+
+
+def test_api_metrics_record_latency_status_bytes_and_pages(stub_server):
+    metrics.reset()
+    metrics.enable()
+    try:
+        make_api(stub_server).get_vacancies("python", per_page=2, pages=3)
+    finally:
+        metrics.disable()
+
+    assert metrics.value("api_requests_total", endpoint="/vacancies", status=200) == 3
+    assert metrics.value("api_pages_total", endpoint="/vacancies") == 3
+    assert metrics.value("api_response_bytes_total", endpoint="/vacancies") > 0
+    assert metrics.histogram("api_request_seconds", endpoint="/vacancies").count == 3
+    metrics.reset()
+
+
+def test_harvester_deduplicates_across_queries_and_areas(stub_server, tmp_path):
+    stub_server.total_pages = 3
+    saver = JSONSaver(str(tmp_path / "vacancies.json"))
+    harvester = Harvester(make_api(stub_server), saver, max_workers=4, per_page=2, pages=10, batch_size=3)
+
+    report = harvester.harvest(["python", "java"], areas=[1, 2])
+
+    assert (report.unique, report.duplicates, report.requests) == (6, 18, 12)
+    assert report.hits == {"python": 12, "java": 12}
+    assert sum(report.unique_hits.values()) == 6
+    assert sorted(v.url for v in saver.get_vacancies()) == sorted(f"https://hh.ru/vacancy/{i}" for i in range(6))
+    assert {p["area"] for _, p, _ in stub_server.requests} == {"1", "2"}
+
+
+def test_harvester_saves_received_batch_when_page_fails(stub_server, tmp_path):
+    class FailingAPI(HeadHunterAPI):
+        def fetch_page(self, query, per_page=20, page=0, extra=None):
+            if page == 2:
+                raise RuntimeError("страница недоступна")
+            return super().fetch_page(query, per_page, page, extra)
+
+    api = FailingAPI()
+    api.BASE_URL = f"http://127.0.0.1:{stub_server.server_address[1]}"
+    saver = JSONSaver(str(tmp_path / "vacancies.json"))
+    harvester = Harvester(api, saver, max_workers=1, per_page=2, pages=5, batch_size=100)
+
+    with pytest.raises(RuntimeError):
+        harvester.harvest(["python"], areas=[1])
+    urls = {v.url for v in saver.get_vacancies()}
+    assert {"https://hh.ru/vacancy/0", "https://hh.ru/vacancy/1"} <= urls
+    assert "https://hh.ru/vacancy/4" not in urls
+
+
+def test_enrich_fetches_details_concurrently_and_uses_cache(stub_server, tmp_path):
+    api = make_api(stub_server)
+    vacancies = Vacancy.cast_to_object_list(api.get_vacancies("python", per_page=5, pages=2))
+    stub_server.missing = {"3"}
+    saver = JSONSaver(str(tmp_path / "vacancies.json"))
+    saver.add_vacancies(vacancies)
+    cache = DetailCache(str(tmp_path / "details.json"))
+
+    report = api.enrich(vacancies, saver=saver, cache=cache)
+
+    assert (report.fetched, report.missing, report.cached, report.updated) == (9, 1, 0, 9)
+    assert api._pool_size == api.scheduler.max_concurrency  # не max_workers=1 для страниц выдачи
+    stored = {v.url: v.description for v in saver.get_vacancies()}
+    assert stored["https://hh.ru/vacancy/0"] == "Full description & duties 0"
+    assert stored["https://hh.ru/vacancy/3"] == "python"
+
+    detail_requests = len(stub_server.requests)
+    again = api.enrich(vacancies, saver=saver, cache=DetailCache(str(tmp_path / "details.json")))
+    assert (again.cached, again.fetched, again.missing, again.updated) == (9, 0, 1, 9)
+    assert len(stub_server.requests) == detail_requests + 1  # повторно запрошена только отсутствующая
+
+    stored_vacancies = saver.get_vacancies()  # без raw: ID берётся из URL, published_at неизвестен
+    refreshed = api.enrich(stored_vacancies, saver=saver, cache=DetailCache(str(tmp_path / "details.json")))
+    assert (refreshed.cached, refreshed.fetched, refreshed.missing, refreshed.updated) == (0, 9, 1, 0)
+    api.close()
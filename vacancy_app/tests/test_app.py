@@ -1,11 +1,31 @@
+import os
+import threading
+
 import pytest
 from vacancy_app.models.vacancy import Vacancy
+from vacancy_app.models.compact import CompactVacancy
+from vacancy_app.models.table import VacancyTable
 from vacancy_app.utils.filters import (
     filter_vacancies_by_keyword,
     filter_vacancies_by_salary_range,
     sort_vacancies_by_salary,
+    top_n_by_salary,
 )
+from vacancy_app.utils.keyword_index import KeywordIndex
+from vacancy_app.utils.salary_index import SalaryIndex
+from vacancy_app.utils.near_duplicates import NearDuplicateDetector
+from vacancy_app.utils.bm25 import BM25Index
+from vacancy_app.utils.metrics import MetricsRegistry, registry as metrics
 from vacancy_app.storage.json_saver import JSONSaver
+from vacancy_app.pipeline.sync import IncrementalSync, SyncCheckpoints
+from vacancy_app.pipeline.dumps import ingest_dumps
+from vacancy_app.pipeline.stream import ingest
+from vacancy_app.storage.jsonl_saver import JSONLSaver
+from vacancy_app.storage.sqlite_saver import SQLiteSaver
+from vacancy_app.storage.query import VacancyQuery
+from vacancy_app.storage.base_saver import BaseSaver
+from vacancy_app.storage.partitioned_saver import PartitionedSaver, reshard
+from vacancy_app.storage.searchable_saver import SearchableSaver
 
 
 @pytest.fixture
@@ -132,3 +152,832 @@ def test_vacancy_str_representation():
 def test_vacancy_comparison(sample_vacancies):
     assert sample_vacancies[0] > sample_vacancies[1]
     assert sample_vacancies[1] < sample_vacancies[2]
+
+
+def test_json_saver_add_vacancies_bulk_upsert(tmp_path, sample_vacancies):
+    saver = JSONSaver(str(tmp_path / "vacancies.json"))
+
+    saver.add_vacancies(sample_vacancies)
+    updated = Vacancy("Python Senior", "url1", "desc python", salary_from=200000, currency="RUR")
+    saver.add_vacancies([updated, sample_vacancies[1]])
+
+    titles = [v.title for v in saver.get_vacancies()]
+    assert titles == ["Python Senior", "QA Engineer", "Java Developer"]
+
+
+def test_json_saver_bulk_then_delete_and_reopen(tmp_path, sample_vacancies):
+    file_path = str(tmp_path / "vacancies.json")
+    saver = JSONSaver(file_path)
+    saver.add_vacancies(sample_vacancies)
+
+    assert saver.delete_vacancy("url2") is True
+    saver.add_vacancy(sample_vacancies[0])
+
+    reopened = JSONSaver(file_path)
+    assert [v.url for v in reopened.get_vacancies()] == ["url1", "url3"]
+
+
+def test_json_saver_sees_external_changes(tmp_path, sample_vacancies):
+    file_path = str(tmp_path / "vacancies.json")
+    first, second = JSONSaver(file_path), JSONSaver(file_path)
+    first.add_vacancies(sample_vacancies[:2])
+    assert len(second.get_vacancies()) == 2
+
+    first.add_vacancy(sample_vacancies[2])
+    second.add_vacancy(sample_vacancies[0])
+
+    assert [v.url for v in first.get_vacancies()] == ["url1", "url2", "url3"]
+
+
+def test_json_saver_keeps_file_mode_without_touching_umask(tmp_path, monkeypatch, sample_vacancies):
+    file_path = tmp_path / "vacancies.json"
+    saver = JSONSaver(str(file_path))
+    file_path.chmod(0o640)
+    umask = os.umask(0)
+    os.umask(umask)
+
+    def fail(mask):
+        raise AssertionError("umask процесса не должен меняться при записи")
+
+    monkeypatch.setattr(os, "umask", fail)
+    saver.add_vacancy(sample_vacancies[0])
+    assert file_path.stat().st_mode & 0o777 == 0o640
+    file_path.unlink()
+    saver.add_vacancy(sample_vacancies[1])
+    assert file_path.stat().st_mode & 0o777 == 0o666 & ~umask  # а не 0600, как создаёт mkstemp
+
+
+def test_jsonl_saver_appends_and_replays(tmp_path, sample_vacancies):
+    file_path = tmp_path / "vacancies.jsonl"
+    saver = JSONLSaver(str(file_path), compact_threshold=0)
+
+    saver.add_vacancies(sample_vacancies)
+    saver.add_vacancy(Vacancy("Python Senior", "url1", "desc", salary_from=200000))
+    assert saver.delete_vacancy("QA Engineer") is True
+    assert saver.delete_vacancy("missing") is False
+
+    assert len(file_path.read_text(encoding="utf-8").splitlines()) == 5
+    reopened = JSONLSaver(str(file_path))
+    assert [v.title for v in reopened.get_vacancies()] == ["Python Senior", "Java Developer"]
+
+
+def test_jsonl_saver_compaction(tmp_path, sample_vacancies):
+    file_path = tmp_path / "vacancies.jsonl"
+    saver = JSONLSaver(str(file_path), compact_threshold=4)
+
+    for _ in range(3):
+        saver.add_vacancies(sample_vacancies)
+
+    assert len(file_path.read_text(encoding="utf-8").splitlines()) < 9
+    saver.compact()
+    assert len(file_path.read_text(encoding="utf-8").splitlines()) == 3
+    assert [v.url for v in JSONLSaver(str(file_path)).get_vacancies()] == ["url1", "url2", "url3"]
+
+
+def test_jsonl_saver_background_compaction(tmp_path, sample_vacancies):
+    file_path = tmp_path / "vacancies.jsonl"
+    saver = JSONLSaver(str(file_path), compact_threshold=2, background_compaction=True)
+
+    for _ in range(5):
+        saver.add_vacancies(sample_vacancies)
+    saver.close()
+
+    assert [v.url for v in saver.get_vacancies()] == ["url1", "url2", "url3"]
+    assert [v.url for v in JSONLSaver(str(file_path)).get_vacancies()] == ["url1", "url2", "url3"]
+
+
+def test_jsonl_saver_compact_waits_for_background_run(tmp_path, sample_vacancies):
+    file_path = tmp_path / "vacancies.jsonl"
+    saver = JSONLSaver(str(file_path), compact_threshold=0, fsync=False)
+    for i in range(2000):
+        saver.add_vacancy(Vacancy(f"Job {i}", f"url{i % 500}", "desc"))
+
+    saver.compact(wait=False)
+    finished = threading.Event()
+    worker = threading.Thread(target=lambda: (saver.compact(), finished.set()), daemon=True)
+    worker.start()
+    worker.join(timeout=10)
+
+    assert finished.is_set()
+    saver.close()
+    assert len(file_path.read_text(encoding="utf-8").splitlines()) == 500
+
+
+def test_jsonl_saver_survives_torn_write(tmp_path, sample_vacancies):
+    file_path = tmp_path / "vacancies.jsonl"
+    JSONLSaver(str(file_path)).add_vacancy(sample_vacancies[0])
+    with open(file_path, "a", encoding="utf-8") as f:
+        f.write('{"op": "put", "vacancy": {"url": "ur')
+
+    saver = JSONLSaver(str(file_path))
+    assert [v.url for v in saver.get_vacancies()] == ["url1"]
+    saver.add_vacancy(sample_vacancies[1])
+    assert [v.url for v in JSONLSaver(str(file_path)).get_vacancies()] == ["url1", "url2"]
+
+
+@pytest.fixture
+def sqlite_saver(tmp_path, sample_vacancies):
+    saver = SQLiteSaver(str(tmp_path / "vacancies.db"))
+    saver.add_vacancies(sample_vacancies)
+    yield saver
+    saver.close()
+
+
+def test_sqlite_saver_upsert_and_delete(sqlite_saver):
+    sqlite_saver.add_vacancy(Vacancy("Python Senior", "url1", "desc python", salary_from=200000))
+
+    assert [v.title for v in sqlite_saver.get_vacancies()] == ["Python Senior", "QA Engineer", "Java Developer"]
+    assert sqlite_saver.delete_vacancy("QA Engineer") is True
+    assert sqlite_saver.delete_vacancy("url_missing") is False
+    assert [v.url for v in sqlite_saver.get_vacancies()] == ["url1", "url3"]
+
+
+def test_sqlite_saver_keyword_search(sqlite_saver):
+    sqlite_saver.add_vacancy(Vacancy("Разработчик Python", "url4", "Опыт с Django"))
+
+    assert [v.url for v in sqlite_saver.search(["PYTHON"])] == ["url1", "url4"]
+    assert [v.url for v in sqlite_saver.search(["разработчик", "django"], match_all=True)] == ["url4"]
+    assert [v.url for v in sqlite_saver.search(["spring", "testing"])] == ["url2", "url3"]
+    assert sqlite_saver.search(["golang"]) == []
+
+
+def test_sqlite_saver_search_without_fts_folds_cyrillic(sqlite_saver):
+    sqlite_saver.add_vacancy(Vacancy("РАЗРАБОТЧИК Python", "url4", "Опыт с Django"))
+    sqlite_saver._SQLiteSaver__fts = False
+
+    assert [v.url for v in sqlite_saver.search(["разработчик"])] == ["url4"]
+    assert [v.url for v in sqlite_saver.search(["ОПЫТ", "python"], match_all=True)] == ["url4"]
+
+
+def test_sqlite_saver_salary_queries(sqlite_saver):
+    assert [v.url for v in sqlite_saver.filter_by_salary(90000, 130000)] == ["url1", "url3"]
+    assert [v.url for v in sqlite_saver.top_by_salary(2)] == ["url3", "url1"]
+
+
+def test_keyword_index_any_and_all(sample_vacancies):
+    index = KeywordIndex(sample_vacancies)
+
+    assert [v.url for v in index.search(["python", "spring"])] == ["url1", "url3"]
+    assert [v.url for v in index.search(["python", "desc"], match_all=True)] == ["url1"]
+    assert index.search(["python", "spring"], match_all=True) == []
+    assert index.search(["golang"]) == []
+
+
+def test_keyword_index_cyrillic_case_folding():
+    index = KeywordIndex([
+        Vacancy("ПРОГРАММИСТ Python", "url1", "Знание SQL"),
+        Vacancy("Ёлочный дизайнер", "url2", "Работа с клиентами"),
+    ])
+
+    assert [v.url for v in index.search(["программист"])] == ["url1"]
+    assert [v.url for v in index.search(["ЗНАНИЕ", "sql"], match_all=True)] == ["url1"]
+    assert [v.url for v in index.search(["елочный"])] == ["url2"]
+
+
+def test_keyword_index_incremental_updates(sample_vacancies):
+    index = KeywordIndex(sample_vacancies)
+
+    index.add(Vacancy("Golang Dev", "url1", "go"))
+    assert index.search(["python"]) == []
+    assert [v.url for v in index.search(["golang"])] == ["url1"]
+
+    assert index.remove("url1") is True
+    assert index.remove("url1") is False
+    assert index.search(["golang"]) == []
+    assert len(index) == 2
+
+
+def test_filter_by_keyword_with_index(sample_vacancies):
+    index = KeywordIndex(sample_vacancies)
+
+    res = filter_vacancies_by_keyword(sample_vacancies, ["PYTHON"], index=index)
+    assert [v.title for v in res] == ["Python Dev"]
+    assert filter_vacancies_by_keyword(sample_vacancies, [], index=index) == sample_vacancies
+    assert filter_vacancies_by_keyword(sample_vacancies[1:], ["python"], index=index) == []
+    subset = [sample_vacancies[2], sample_vacancies[0]]
+    assert filter_vacancies_by_keyword(subset, ["python", "spring"], index=index) == subset
+    # с индексом слово сравнивается целиком, без индекса — как подстрока
+    assert filter_vacancies_by_keyword(sample_vacancies, ["pyth"], index=index) == []
+    assert filter_vacancies_by_keyword(sample_vacancies, ["pyth"]) == sample_vacancies[:1]
+
+
+def test_salary_index_range_and_top(sample_vacancies):
+    index = SalaryIndex(sample_vacancies)
+
+    assert [v.url for v in index.range(90000, 130000)] == ["url1", "url3"]
+    assert [v.url for v in index.range(min_salary=126000)] == ["url3"]
+    assert [v.url for v in index.top(2)] == ["url3", "url1"]
+    assert index.range(10, 20) == []
+
+
+def test_salary_index_incremental_updates(sample_vacancies):
+    index = SalaryIndex(sample_vacancies)
+
+    index.add(Vacancy("QA Lead", "url2", "testing", salary_from=300000))
+    assert [v.url for v in index.top(1)] == ["url2"]
+    assert index.remove("url2") is True
+    assert index.remove("url2") is False
+    assert [v.url for v in index.range()] == ["url1", "url3"]
+
+
+def test_top_n_by_salary_heap_matches_sort(sample_vacancies):
+    expected = sort_vacancies_by_salary(sample_vacancies)[:2]
+
+    assert top_n_by_salary(sample_vacancies, 2) == expected
+    assert [v.url for v in top_n_by_salary(sample_vacancies, 2)] == [v.url for v in expected]
+    assert top_n_by_salary(sample_vacancies, 0) == []
+
+
+
+def test_salary_filters_with_index_keep_only_given_vacancies(sample_vacancies):
+    index = SalaryIndex(sample_vacancies)
+    subset = [sample_vacancies[2], sample_vacancies[1]]
+
+    assert [v.url for v in filter_vacancies_by_salary_range(
+        sample_vacancies, 90000, 130000, index=index)] == ["url1", "url3"]
+    assert filter_vacancies_by_salary_range(subset, 90000, 130000, index=index) == [sample_vacancies[2]]
+    assert filter_vacancies_by_salary_range([], index=index) == []
+    assert [v.url for v in top_n_by_salary(subset, 2, index=index)] == ["url3", "url2"]
+    assert [v.url for v in top_n_by_salary(sample_vacancies[1:2], 1, index=index)] == ["url2"]
+
+
+def test_compact_vacancy_has_no_dict(sample_vacancies):
+    compact = CompactVacancy.from_vacancy(sample_vacancies[0])
+
+    assert not hasattr(compact, "__dict__")
+    assert compact.to_dict() == sample_vacancies[0].to_dict()
+    assert compact.to_vacancy().title == "Python Dev"
+    assert CompactVacancy("x", "u", "d", salary_to=200).average_salary() == 200
+
+
+def test_vacancy_table_roundtrip_and_interning(sample_vacancies):
+    vacancies = sample_vacancies + [Vacancy("Go Dev", "url4", "go", employer="Acme", currency="RUR")]
+    table = VacancyTable.from_vacancies(vacancies)
+
+    assert len(table) == 4
+    assert [v.to_dict() for v in table.to_vacancies()] == [v.to_dict() for v in vacancies]
+    assert table._currencies.values == ["RUR"]
+
+
+def test_vacancy_table_salary_filter_and_sort(sample_vacancies):
+    table = VacancyTable.from_vacancies(sample_vacancies)
+
+    assert table.filter_salary(90000, 130000).urls == ["url1", "url3"]
+    assert table.sort_by_salary().urls == [v.url for v in sort_vacancies_by_salary(sample_vacancies)]
+    assert table.sort_by_salary(reverse=False).urls == ["url2", "url1", "url3"]
+    assert VacancyTable().filter_salary(1, 2).urls == []
+
+
+def test_json_saver_iter_vacancies_streams_small_chunks(tmp_path, sample_vacancies):
+    saver = JSONSaver(str(tmp_path / "vacancies.json"))
+    saver.add_vacancies(sample_vacancies + [Vacancy("Разработчик «Ёж»", "url4", "описание", salary_from=90000)])
+
+    urls = [v.url for v in saver.iter_vacancies(chunk_size=7)]
+    assert urls == ["url1", "url2", "url3", "url4"]
+    assert [v.title for v in saver.iter_vacancies(lambda v: v.average_salary() < 100000)] == [
+        "QA Engineer", "Разработчик «Ёж»"
+    ]
+
+
+def test_json_saver_iter_vacancies_is_lazy(tmp_path):
+    file_path = tmp_path / "vacancies.json"
+    file_path.write_text('[{"title": "A", "url": "u1", "description": ""}, {"title": "B", "url": ',
+                         encoding="utf-8")
+    saver = JSONSaver(str(file_path))
+
+    stream = saver.iter_vacancies(chunk_size=16)
+    assert next(stream).url == "u1"
+    assert list(stream) == []
+    assert list(JSONSaver(str(tmp_path / "empty.json")).iter_vacancies()) == []
+
+
+def test_json_saver_cache_hits_and_own_writes(tmp_path, sample_vacancies):
+    saver = JSONSaver(str(tmp_path / "vacancies.json"), cache=True)
+    saver.add_vacancies(sample_vacancies)
+
+    first = saver.get_vacancies()
+    second = saver.get_vacancies()
+    assert first[0] is second[0]
+    assert saver.cache_stats == {"hits": 1, "misses": 1}
+
+    saver.delete_vacancy("url2")
+    assert [v.url for v in saver.get_vacancies()] == ["url1", "url3"]
+    assert saver.cache_stats == {"hits": 1, "misses": 2}
+
+
+def test_json_saver_cache_sees_other_process_writes(tmp_path, sample_vacancies):
+    file_path = str(tmp_path / "vacancies.json")
+    reader = JSONSaver(file_path, cache=True)
+    writer = JSONSaver(file_path)
+    writer.add_vacancies(sample_vacancies)
+    assert len(reader.get_vacancies()) == 3
+
+    writer.add_vacancy(Vacancy("Python Dev", "url1", "same size", salary_from=100000, salary_to=150000))
+    assert reader.get_vacancies()[0].description == "same size"
+    assert reader.cache_stats["misses"] == 2
+
+
+def test_benchmark_payloads_are_deterministic():
+    from benchmarks.payloads import generate_items, generate_pages
+
+    first, second = list(generate_items(50, seed=7)), list(generate_items(50, seed=7))
+    assert first == second
+    assert first != list(generate_items(50, seed=8))
+    assert all(Vacancy.from_hh_json(i).url.startswith("https://hh.ru/vacancy/") for i in first)
+    assert [len(p["items"]) for p in generate_pages(250, per_page=100)] == [100, 100, 50]
+
+
+def test_benchmark_run_produces_report():
+    from benchmarks.run import run
+
+    report = run([20], repeat=1, workers=[1])
+    names = {r["name"] for r in report["results"]}
+    assert {"vacancy.from_hh_json", "json_saver.add_vacancies", "filters.by_keyword"} <= names
+    assert report["meta"]["sizes"] == [20]
+
+
+@pytest.fixture
+def enabled_metrics():
+    metrics.reset()
+    metrics.enable()
+    yield metrics
+    metrics.disable()
+    metrics.reset()
+
+
+def test_metrics_disabled_records_nothing(tmp_path, sample_vacancies):
+    metrics.reset()
+    JSONSaver(str(tmp_path / "vacancies.json")).add_vacancies(sample_vacancies)
+    filter_vacancies_by_keyword(sample_vacancies, ["python"])
+
+    assert metrics.snapshot() == {"counters": [], "gauges": [], "histograms": []}
+
+
+def test_metrics_cover_saver_and_filters(tmp_path, sample_vacancies, enabled_metrics):
+    saver = JSONSaver(str(tmp_path / "vacancies.json"))
+    saver.add_vacancies(v for v in sample_vacancies)
+    saver.get_vacancies()
+    saver.delete_vacancy("url2")
+    filter_vacancies_by_keyword(sample_vacancies, ["python"])
+
+    labels = {"saver": "JSONSaver", "operation": "add_vacancies", "kind": "write"}
+    assert enabled_metrics.value("saver_records_total", **labels) == 3
+    assert enabled_metrics.value("saver_records_total", saver="JSONSaver", operation="get_vacancies",
+                                 kind="read") == 3
+    assert enabled_metrics.histogram("saver_operation_seconds", saver="JSONSaver", operation="delete_vacancy",
+                                     kind="write").count == 1
+    assert enabled_metrics.value("filter_records_total", function="by_keyword") == 1
+    assert enabled_metrics.value("filter_calls_total", function="by_keyword") == 1
+
+
+def test_metrics_count_only_outermost_operation(tmp_path, sample_vacancies, enabled_metrics):
+    class StreamingSaver(BaseSaver):
+        def __init__(self):
+            self.received = []
+
+        def add_vacancy(self, vacancy):
+            self.received.append(vacancy)
+
+        def add_vacancies(self, vacancies):
+            self.batch = vacancies
+            for vacancy in vacancies:
+                self.add_vacancy(vacancy)
+
+        def get_vacancies(self, filter_func=None, query=None):
+            return list(self.received)
+
+        def delete_vacancy(self, identifier):
+            return False
+
+    streaming = StreamingSaver()
+    streaming.add_vacancies(v for v in sample_vacancies)
+    SearchableSaver(JSONSaver(str(tmp_path / "vacancies.json"))).add_vacancies(sample_vacancies)
+    PartitionedSaver(str(tmp_path / "parts"), partitions=3).add_vacancies(sample_vacancies)
+
+    write = {"operation": "add_vacancies", "kind": "write"}
+    assert enabled_metrics.value("saver_records_total", saver="StreamingSaver", **write) == 3
+    assert not isinstance(streaming.batch, list) and len(streaming.received) == 3  # генератор не копируется
+    assert enabled_metrics.histogram("saver_operation_seconds", saver="StreamingSaver", operation="add_vacancy",
+                                     kind="write") is None
+    assert enabled_metrics.value("saver_records_total", saver="SearchableSaver", **write) == 3
+    assert enabled_metrics.value("saver_records_total", saver="PartitionedSaver", **write) == 3
+    assert enabled_metrics.value("saver_records_total", saver="JSONSaver", **write) == 0
+
+
+def test_metrics_prometheus_export():
+    registry = MetricsRegistry()
+    registry.enable()
+    registry.inc("requests_total", 2, status=200)
+    registry.observe("latency_seconds", 0.02, path='/a"b')
+
+    text = registry.to_prometheus()
+    assert "# TYPE requests_total counter\nrequests_total{status=\"200\"} 2\n" in text
+    assert 'latency_seconds_bucket{path="/a\\"b",le="0.01"} 0' in text
+    assert 'latency_seconds_bucket{path="/a\\"b",le="0.025"} 1' in text
+    assert 'latency_seconds_bucket{path="/a\\"b",le="+Inf"} 1' in text
+    assert 'latency_seconds_count{path="/a\\"b"} 1' in text
+
+
+class FakeSearchAPI:
+    """Имитация поиска hh.ru: фильтр date_from (включительно) и сортировка по публикации."""
+
+    area = 113
+
+    def __init__(self, items):
+        self.items = items
+        self.calls = []
+
+    def iter_pages(self, query, per_page=20, pages=1, params=None, meta=None):
+        self.calls.append(dict(params or {}))
+        date_from = (params or {}).get("date_from")
+        date_to = (params or {}).get("date_to")
+        found = sorted(
+            (i for i in self.items
+             if (date_from is None or i["published_at"] >= date_from)
+             and (date_to is None or i["published_at"] <= date_to)),
+            key=lambda i: i["published_at"], reverse=True,
+        )
+        if meta is not None:
+            meta["found"] = len(found)
+        for page in range(pages):
+            chunk = found[page * per_page:(page + 1) * per_page]
+            if not chunk:
+                return
+            yield chunk
+
+
+def hh_item(item_id, published_at, name="Python Dev"):
+    return {"id": item_id, "name": name, "alternate_url": f"https://hh.ru/vacancy/{item_id}",
+            "published_at": published_at}
+
+
+def test_incremental_sync_fetches_only_delta(tmp_path):
+    api = FakeSearchAPI([hh_item("1", "2024-01-01T10:00:00+0300"), hh_item("2", "2024-01-01T11:00:00+0300")])
+    saver = JSONSaver(str(tmp_path / "vacancies.json"))
+    checkpoints = SyncCheckpoints(str(tmp_path / "checkpoints.json"))
+
+    first = IncrementalSync(api, saver, checkpoints, per_page=1).sync("python")
+    assert (first.full, first.saved) == (True, 2)
+
+    api.items += [hh_item("3", "2024-01-01T11:00:00+0300"), hh_item("4", "2024-01-01T12:00:00+0300")]
+    second = IncrementalSync(api, saver, SyncCheckpoints(str(tmp_path / "checkpoints.json"))).sync("python")
+
+    assert api.calls[-1]["date_from"] == "2024-01-01T11:00:00+0300"
+    assert (second.full, second.fetched, second.saved, second.skipped) == (False, 3, 2, 1)
+    assert sorted(v.url[-1] for v in saver.get_vacancies()) == ["1", "2", "3", "4"]
+    assert checkpoints.get(IncrementalSync(api, saver)._key("python", None))["boundary_ids"] == ["4"]
+
+
+def test_incremental_sync_covers_delta_larger_than_cap(tmp_path):
+    api = FakeSearchAPI([hh_item("1", "2024-01-01T10:00:00+0300")])
+    saver = JSONSaver(str(tmp_path / "vacancies.json"))
+    checkpoints = SyncCheckpoints(str(tmp_path / "checkpoints.json"))
+    IncrementalSync(api, saver, checkpoints, per_page=2, pages=2).sync("python")
+
+    api.items += [hh_item(str(i), f"2024-01-0{i}T10:00:00+0300") for i in range(2, 10)]
+    result = IncrementalSync(api, saver, checkpoints, per_page=2, pages=2).sync("python")
+
+    assert (result.saved, result.truncated) == (8, False)
+    assert [c.get("date_to") for c in api.calls[1:]] == [None, "2024-01-06T10:00:00+0300", "2024-01-03T10:00:00+0300"]
+    assert len(saver.get_vacancies()) == 9
+    assert checkpoints.get(IncrementalSync(api, saver)._key("python", None))["boundary_ids"] == ["9"]
+
+
+def test_incremental_sync_keeps_checkpoint_when_delta_cannot_be_covered(tmp_path):
+    api = FakeSearchAPI([hh_item("1", "2024-01-01T10:00:00+0300")])
+    saver = JSONSaver(str(tmp_path / "vacancies.json"))
+    checkpoints = SyncCheckpoints(str(tmp_path / "checkpoints.json"))
+    IncrementalSync(api, saver, checkpoints, per_page=1, pages=2).sync("python")
+    key = IncrementalSync(api, saver)._key("python", None)
+    before = checkpoints.get(key)
+
+    api.items += [hh_item(str(i), "2024-01-02T10:00:00+0300") for i in range(2, 6)]
+    result = IncrementalSync(api, saver, checkpoints, per_page=1, pages=2).sync("python")
+
+    assert result.truncated is True
+    assert checkpoints.get(key) == before
+
+
+def test_incremental_sync_keeps_checkpoint_on_failure(tmp_path):
+    class FailingSaver(JSONSaver):
+        def add_vacancies(self, vacancies):
+            raise OSError("disk full")
+
+    api = FakeSearchAPI([hh_item("1", "2024-01-01T10:00:00+0300")])
+    checkpoints = SyncCheckpoints(str(tmp_path / "checkpoints.json"))
+    with pytest.raises(OSError):
+        IncrementalSync(api, FailingSaver(str(tmp_path / "v.json")), checkpoints).sync("python")
+
+    assert checkpoints.get(IncrementalSync(api, None)._key("python", None)) is None
+
+
+@pytest.fixture(params=["json", "jsonl", "sqlite", "partitioned"])
+def any_saver(request, tmp_path):
+    """Создаёт хранилище каждого типа."""
+    if request.param == "json":
+        yield JSONSaver(str(tmp_path / "vacancies.json"))
+    elif request.param == "partitioned":
+        yield PartitionedSaver(str(tmp_path / "parts"), partitions=3)
+    elif request.param == "jsonl":
+        yield JSONLSaver(str(tmp_path / "vacancies.jsonl"))
+    else:
+        saver = SQLiteSaver(str(tmp_path / "vacancies.db"))
+        yield saver
+        saver.close()
+
+
+def test_vacancy_query_same_result_in_every_saver(any_saver, sample_vacancies):
+    any_saver.add_vacancies(sample_vacancies + [
+        Vacancy("Senior Python", "url4", "django", salary_from=200000, salary_to=220000, currency="USD"),
+    ])
+
+    top = any_saver.get_vacancies(query=VacancyQuery(sort_by="salary", limit=2))
+    assert [v.url for v in top] == ["url4", "url3"]
+    page = any_saver.get_vacancies(query=VacancyQuery(currency="RUR", sort_by="salary", descending=False,
+                                                      limit=1, offset=1))
+    assert [v.url for v in page] == ["url1"]
+    assert [v.url for v in any_saver.get_vacancies(query=VacancyQuery(keywords=["python"], salary_max=150000))] == ["url1"]
+    assert {v.url for v in any_saver.get_vacancies(query=VacancyQuery(salary_min=100000))} == {"url1", "url3", "url4"}
+
+
+def test_vacancy_query_with_filter_func_paginates_after_filter(any_saver, sample_vacancies):
+    any_saver.add_vacancies(sample_vacancies)
+    result = any_saver.get_vacancies(lambda v: v.url != "url3", query=VacancyQuery(sort_by="salary", limit=1))
+    assert [v.url for v in result] == ["url1"]
+
+
+def test_vacancy_query_rejects_unknown_sort():
+    with pytest.raises(ValueError):
+        VacancyQuery(sort_by="date")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_ingest_dumps_merges_and_dedupes(tmp_path, workers):
+    import gzip
+    import json
+
+    dumps = tmp_path / "dumps"
+    (dumps / "2024").mkdir(parents=True)
+    (dumps / "2024" / "page0.json").write_text(json.dumps({"items": [hh_item("1", "t"), hh_item("2", "t")]}))
+    with gzip.open(dumps / "2024" / "page1.json.gz", "wt", encoding="utf-8") as f:
+        f.write(json.dumps({"items": [hh_item("3", "t")]}) + "\n" + json.dumps({"items": [hh_item("1", "t", "Go Dev")]}))
+    (dumps / "notes.txt").write_text("not a dump")
+
+    saver = JSONSaver(str(tmp_path / "vacancies.json"))
+    report = ingest_dumps([str(dumps)], saver, max_workers=workers)
+
+    assert (report.files, report.parsed, report.unique, report.duplicates) == (2, 4, 3, 1)
+    assert [(v.url[-1], v.title) for v in saver.get_vacancies()] == [("1", "Go Dev"), ("2", "Python Dev"), ("3", "Python Dev")]
+
+
+def test_read_dump_streams_documents_in_small_chunks(tmp_path):
+    import json
+    from vacancy_app.pipeline.dumps import _read_dump
+
+    responses = [{"items": [hh_item(str(i), "t"), hh_item(str(i + 10), "t")]} for i in range(3)]
+    array = tmp_path / "array.json"
+    array.write_text(json.dumps(responses, indent=2))
+    lines = tmp_path / "lines.jsonl"
+    lines.write_text("\n".join(json.dumps(r) for r in responses) + "\n{broken")
+
+    expected = [item["id"] for r in responses for item in r["items"]]
+    assert [item["id"] for item in _read_dump(str(array), chunk_size=7)] == expected
+    reader = _read_dump(str(lines), chunk_size=7)
+    assert [next(reader)["id"] for _ in range(6)] == expected  # испорченный хвост ещё не прочитан
+    with pytest.raises(json.JSONDecodeError):
+        next(reader)
+
+
+def test_partitioned_saver_writes_one_shard_and_deletes_by_url(tmp_path, sample_vacancies):
+    saver = PartitionedSaver(str(tmp_path / "parts"), partitions=4)
+    saver.add_vacancies(sample_vacancies)
+    files = {p.name: p.stat().st_mtime_ns for p in (tmp_path / "parts").glob("part-*.json")}
+
+    saver.add_vacancy(Vacancy("Python Dev", "url1", "updated", salary_from=1, salary_to=2, currency="RUR"))
+    changed = [p.name for p in (tmp_path / "parts").glob("part-*.json") if p.stat().st_mtime_ns != files[p.name]]
+    assert len(changed) == 1
+
+    assert saver.delete_vacancy("url2") is True
+    assert saver.delete_vacancy("Java Developer") is True
+    assert [v.description for v in PartitionedSaver(str(tmp_path / "parts")).get_vacancies()] == ["updated"]
+    with pytest.raises(ValueError):
+        PartitionedSaver(str(tmp_path / "parts"), partitions=2)
+
+
+def test_partitioned_saver_by_currency_moves_and_prunes(tmp_path, sample_vacancies):
+    saver = PartitionedSaver(str(tmp_path / "parts"), partitions=4, key="currency")
+    saver.add_vacancies(sample_vacancies)
+    saver.add_vacancy(Vacancy("Python Dev", "url1", "remote", salary_from=3000, salary_to=4000, currency="USD"))
+
+    assert [v.url for v in saver.get_vacancies(query=VacancyQuery(currency="USD"))] == ["url1"]
+    assert sorted(v.url for v in saver.get_vacancies()) == ["url1", "url2", "url3"]
+    assert saver.delete_vacancy(Vacancy("x", "url1", "")) is True
+    assert sorted(v.url for v in saver.get_vacancies()) == ["url2", "url3"]
+
+
+def test_partitioned_saver_deletes_title_from_every_shard(tmp_path):
+    saver = PartitionedSaver(str(tmp_path / "parts"), partitions=4)
+    saver.add_vacancies([Vacancy("Python dev", f"https://hh.ru/vacancy/{i}", "") for i in range(40)])
+    saver.add_vacancy(Vacancy("QA", "https://hh.ru/vacancy/qa", ""))
+
+    assert saver.delete_vacancy("Python dev") is True
+    assert [v.url for v in saver.get_vacancies()] == ["https://hh.ru/vacancy/qa"]
+
+
+def test_partitioned_saver_keeps_moved_records_when_write_fails(tmp_path, sample_vacancies, monkeypatch):
+    saver = PartitionedSaver(str(tmp_path / "parts"), partitions=4, key="currency")
+    saver.add_vacancies(sample_vacancies)
+    moved = [Vacancy(v.title, v.url, v.description, salary_from=1, salary_to=2, currency="USD") for v in sample_vacancies]
+
+    def fail(self, vacancies):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(JSONSaver, "add_vacancies", fail)
+    with pytest.raises(OSError):
+        saver.add_vacancies(moved)
+    monkeypatch.undo()
+    assert sorted(v.url for v in PartitionedSaver(str(tmp_path / "parts"), key="currency").get_vacancies()) == \
+        ["url1", "url2", "url3"]
+
+    saver = PartitionedSaver(str(tmp_path / "parts"), key="currency")
+    saver.add_vacancies(moved)
+    assert {v.currency for v in saver.get_vacancies()} == {"USD"} and len(saver.get_vacancies()) == 3
+
+
+def test_reshard_json_file(tmp_path, sample_vacancies):
+    JSONSaver(str(tmp_path / "vacancies.json")).add_vacancies(sample_vacancies)
+    first = reshard(str(tmp_path / "vacancies.json"), str(tmp_path / "by_url"), partitions=2)
+    second = reshard(first.directory, str(tmp_path / "by_employer"), partitions=5, key="employer")
+
+    assert second.partitions == 5
+    assert sorted(v.url for v in second.get_vacancies()) == ["url1", "url2", "url3"]
+    with pytest.raises(ValueError):
+        reshard(str(tmp_path / "vacancies.json"), str(tmp_path / "by_url"))
+
+
+def test_cli_commands_emit_json_lines(tmp_path, capsys, sample_vacancies):
+    import json
+    from vacancy_app.cli import main
+
+    store = str(tmp_path / "vacancies.jsonl")
+    saver = JSONLSaver(store)
+    saver.add_vacancies(sample_vacancies)
+    saver.close()
+
+    assert main(["--store", store, "--format", "jsonl", "top", "2"]) == 0
+    assert [json.loads(line)["url"] for line in capsys.readouterr().out.splitlines()] == ["url3", "url1"]
+    assert main(["--store", store, "--format", "jsonl", "filter", "--keyword", "python", "--max", "200000"]) == 0
+    assert [json.loads(line)["url"] for line in capsys.readouterr().out.splitlines()] == ["url1"]
+    assert main(["--store", store, "delete", "url2", "missing"]) == 0
+    assert main(["--store", store, "delete", "missing"]) == 1
+    capsys.readouterr()
+    assert main(["--store", store, "--format", "jsonl", "stats"]) == 0
+    stats = json.loads(capsys.readouterr().out)
+    assert (stats["total"], stats["by_currency"]["RUR"]["max"]) == (2, 130000)
+
+
+def test_cli_opens_partitions_with_non_url_key(tmp_path, capsys, sample_vacancies):
+    import json
+    from vacancy_app.cli import main
+
+    store = str(tmp_path / "by_currency")
+    PartitionedSaver(store, partitions=2, key="currency").add_vacancies(sample_vacancies)
+
+    assert main(["--store", store, "--format", "jsonl", "filter", "--currency", "RUR", "--sort", "salary"]) == 0
+    assert [json.loads(line)["url"] for line in capsys.readouterr().out.splitlines()] == ["url3", "url1", "url2"]
+
+
+def test_cli_storage_commands_do_not_import_requests(tmp_path):
+    import os
+    import subprocess
+    import sys
+
+    store = str(tmp_path / "vacancies.json")
+    code = (
+        "import sys; from vacancy_app.cli import main; "
+        f"main(['--store', {store!r}, 'list']); main(['--store', {store!r}, 'top', '3']); "
+        "print('requests' in sys.modules)"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+
+
+@pytest.fixture
+def reposted_vacancies():
+    """Вакансия, её перепубликация под новым URL с мелкой правкой и другая вакансия."""
+    text = "Разработка backend сервисов на Python и Django, PostgreSQL, Docker, code review, опыт от трёх лет"
+    return [
+        Vacancy("Python Developer", "https://hh.ru/vacancy/1", text, employer="Acme", salary_from=200000),
+        Vacancy("Java Developer", "https://hh.ru/vacancy/2", "Spring Boot, Kafka, микросервисы, Kubernetes", employer="Beta"),
+        Vacancy("Python Developer", "https://hh.ru/vacancy/3", text + " удалённо", employer="Acme", salary_from=200000),
+    ]
+
+
+def test_near_duplicate_detector_incremental(reposted_vacancies):
+    detector = NearDuplicateDetector()
+    original, other, repost = reposted_vacancies
+
+    assert detector.check_and_add(original) is None
+    assert detector.check_and_add(other) is None
+    assert detector.check_and_add(repost) == original.url
+    assert detector.check_and_add(original) is None  # тот же URL — обновление, а не дубликат
+    assert repost.url not in detector and len(detector) == 2
+
+
+def test_near_duplicate_detector_clusters_store(tmp_path, reposted_vacancies):
+    saver = JSONSaver(str(tmp_path / "vacancies.json"))
+    saver.add_vacancies(reposted_vacancies)
+    detector = NearDuplicateDetector()
+
+    clusters = detector.cluster(saver.get_vacancies())
+    assert [[v.url[-1] for v in group] for group in clusters] == [["1", "3"]]
+    assert [v.url[-1] for v in detector.deduplicate(saver.get_vacancies())] == ["1", "2"]
+    assert len(detector) == 0
+
+
+def test_ingest_skips_near_duplicates(tmp_path):
+    description = {"requirement": "Разработка backend сервисов на Python и Django, PostgreSQL, Docker, code review"}
+    items = [dict(hh_item(str(i), f"2024-01-0{i}T10:00:00+0300"), snippet=description) for i in (1, 2)]
+    items.append(hh_item("3", "2024-01-03T10:00:00+0300", name="Java Dev"))
+    saver = JSONSaver(str(tmp_path / "vacancies.json"))
+
+    assert ingest(FakeSearchAPI(items), saver, "python", pages=2, detector=NearDuplicateDetector()) == 2
+    assert sorted(v.url[-1] for v in saver.get_vacancies()) == ["2", "3"]
+
+
+def test_bm25_ranks_title_matches_and_inflections():
+    index = BM25Index()
+    index.add_many([
+        Vacancy("Аналитик", "u1", "Нужен опыт работы с Python и SQL"),
+        Vacancy("Python разработчик", "u2", "Разработка сервисов"),
+        Vacancy("Тестировщик", "u3", "Ручное тестирование"),
+    ])
+
+    assert [url for url, _ in index.search("python")] == ["u2", "u1"]
+    assert [url for url, _ in index.search("разработчика сервисы", k=1)] == ["u2"]
+    assert index.search("java") == []
+
+
+def test_searchable_saver_persists_index_and_tracks_changes(tmp_path, sample_vacancies):
+    store = str(tmp_path / "vacancies.json")
+    JSONSaver(store).add_vacancies(sample_vacancies)
+    saver = SearchableSaver(JSONSaver(store))
+    assert [v.url for v in saver.search("python")] == ["url1"]
+
+    saver.add_vacancy(Vacancy("Senior Python Developer", "url4", "python python", salary_from=1))
+    assert saver.delete_vacancy("Python Dev") is True
+
+    reopened = SearchableSaver(JSONSaver(store))
+    assert len(reopened.index) == 3 and (tmp_path / "vacancies.json.bm25.jsonl").exists()
+    assert [v.url for v in reopened.search("python developer spring")] == ["url4", "url3"]
+
+
+def test_cli_search_keeps_index_in_sync(tmp_path, capsys, sample_vacancies):
+    from vacancy_app.cli import main
+
+    store = str(tmp_path / "vacancies.json")
+    JSONSaver(store).add_vacancies(sample_vacancies)
+    assert main(["--store", store, "search", "python"]) == 0
+    assert main(["--store", store, "delete", "url1"]) == 0
+    capsys.readouterr()
+
+    assert main(["--store", store, "search", "python"]) == 0
+    assert capsys.readouterr().out == ""
+    assert "url1" not in SearchableSaver(JSONSaver(store)).index
+
+
+def test_get_vacancy_by_url_in_every_saver(any_saver, sample_vacancies):
+    any_saver.add_vacancies(sample_vacancies)
+    assert any_saver.get_vacancy("url3").title == "Java Developer"
+    assert any_saver.get_vacancy("missing") is None
+
+
+def test_searchable_saver_reads_only_ranked_hits(tmp_path, sample_vacancies):
+    class NoScanSaver(JSONSaver):
+        def get_vacancies(self, filter_func=None, query=None):
+            raise AssertionError("поиск не должен просматривать всё хранилище")
+
+    store = str(tmp_path / "vacancies.json")
+    JSONSaver(store).add_vacancies(sample_vacancies)
+    assert [v.url for v in SearchableSaver(NoScanSaver(store)).search("python")] == ["url1"]
+
+
+def test_searchable_saver_rebuilds_index_only_when_store_changed(tmp_path, monkeypatch, sample_vacancies):
+    store, db = str(tmp_path / "vacancies.json"), str(tmp_path / "vacancies.db")
+    JSONSaver(store).add_vacancies(sample_vacancies)
+    SearchableSaver(JSONSaver(store))
+    JSONSaver(store).add_vacancy(Vacancy("Kotlin Dev", "url9", "kotlin"))  # запись в обход индекса
+    assert [v.url for v in SearchableSaver(JSONSaver(store)).search("kotlin")] == ["url9"]
+
+    sqlite = SearchableSaver(SQLiteSaver(db))
+    sqlite.add_vacancies(sample_vacancies)
+    sqlite.close()
+
+    rebuilds = []
+    monkeypatch.setattr(SearchableSaver, "rebuild", lambda self: rebuilds.append(self))
+    assert len(SearchableSaver(JSONSaver(store)).index) == 4
+    reopened = SearchableSaver(SQLiteSaver(db))
+    assert [v.url for v in reopened.search("java")] == ["url3"]
+    reopened.close()
+    assert rebuilds == []
@@ -0,0 +1,232 @@
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+from vacancy_app.models.vacancy import Vacancy
+from vacancy_app.storage.journal import Journal
+from .keyword_index import tokenize
+
+
+_CYRILLIC_RE = re.compile(r"[а-я]")
+_RU_ENDINGS = sorted(  # окончания русских существительных, прилагательных и глаголов
+    {
+        "ами", "ями", "ах", "ях", "ов", "ев", "ей", "ой", "ий", "ый", "ая", "яя", "ое", "ее",
+        "ые", "ие", "ых", "их", "ым", "им", "ом", "ем", "ам", "ям", "ую", "юю", "ого", "его",
+        "ому", "ему", "ыми", "ими", "ать", "ять", "ить", "еть", "ция", "ции", "цию", "цией",
+        "а", "я", "о", "е", "ы", "и", "у", "ю", "ь",
+    },
+    key=len, reverse=True,
+)
+
+
+def stem(token: str) -> str:
+    """
+    Упрощённый стемминг: у русских слов отбрасывается окончание, у английских — окончание
+    множественного числа, чтобы «разработчик»/«разработчика» и «service»/«services» совпадали.
+    Основа не короче трёх символов; короткие слова не меняются.
+    """
+    if _CYRILLIC_RE.search(token):
+        for ending in _RU_ENDINGS:
+            if token.endswith(ending) and len(token) - len(ending) >= 3:
+                return token[:-len(ending)]
+        return token
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def analyze(text: Optional[str]) -> List[str]:
+    """Токены для BM25: слова tokenize() после стемминга."""
+    return [stem(t) for t in tokenize(text)]
+
+
+class BM25Index:
+    """
+    Ранжирующий полнотекстовый индекс по названию и описанию вакансий (BM25, вариант BM25F:
+    слова названия учитываются с весом title_weight). Для каждого слова хранится
+    posting list «URL -> взвешенная частота», поэтому запрос просматривает только вакансии
+    со словами запроса, а лучшие k результатов выбираются кучей.
+    Если задан filepath, индекс хранится в журнале JSON Lines (Journal) и после перезапуска
+    восстанавливается чтением журнала, без повторной токенизации вакансий.
+    Вместе с индексом в журнале хранится отпечаток (stamp) состояния хранилища, по которому
+    он построен: по нему владелец индекса понимает, что хранилище менялось в обход индекса.
+    """
+
+
+    def __init__(
+        self,
+        filepath: Optional[str] = None,
+        title_weight: float = 3.0,
+        k1: float = 1.5,
+        b: float = 0.75,
+        compact_threshold: int = 1000,
+    ):
+        """
+        :param filepath: файл журнала индекса (None — индекс только в памяти)
+        :param title_weight: во сколько раз слово из названия весомее слова из описания
+        :param compact_threshold: число устаревших строк журнала, после которого он переписывается
+        """
+        self.title_weight = title_weight
+        self.k1 = k1
+        self.b = b
+        self._compact_threshold = compact_threshold
+        self._postings: Dict[str, Dict[str, float]] = {}  # слово -> URL -> взвешенная частота
+        self._docs: Dict[str, Tuple[Dict[str, int], Dict[str, int]]] = {}  # URL -> (частоты в названии, в описании)
+        self._lengths: Dict[str, float] = {}  # URL -> взвешенная длина
+        self._total_length = 0.0
+        self._stale = 0
+        self.stamp: Any = None  # отпечаток хранилища, которому соответствует индекс
+        self._journal = Journal(filepath, fsync=False) if filepath else None
+        self._refresh()
+
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._docs
+
+
+    def _refresh(self) -> None:
+        """Догоняет индекс по строкам, дописанным в журнал с прошлого чтения."""
+        if self._journal is None:
+            return
+        reset, entries = self._journal.read_new()
+        if reset:
+            self._postings.clear()
+            self._docs.clear()
+            self._lengths.clear()
+            self._total_length = 0.0
+            self._stale = 0
+            self.stamp = None
+        for entry in entries:
+            self._apply(entry)
+
+
+    def _apply(self, entry: dict) -> None:
+        """Применяет запись журнала к индексу в памяти."""
+        if entry.get("op") == "meta":
+            if self.stamp is not None:
+                self._stale += 1
+            self.stamp = entry.get("stamp")
+            return
+        url = entry.get("url")
+        if url in self._docs:
+            self._unlink(url)
+            self._stale += 1
+        if entry.get("op") == "put":
+            self._link(url, entry.get("title") or {}, entry.get("body") or {})
+        else:
+            self._stale += 1
+
+
+    def _link(self, url: str, title: Dict[str, int], body: Dict[str, int]) -> None:
+        self._docs[url] = (title, body)
+        length = self.title_weight * sum(title.values()) + sum(body.values())
+        self._lengths[url] = length
+        self._total_length += length
+        for term in set(title) | set(body):
+            tf = self.title_weight * title.get(term, 0) + body.get(term, 0)
+            self._postings.setdefault(term, {})[url] = tf
+
+
+    def _unlink(self, url: str) -> None:
+        title, body = self._docs.pop(url)
+        self._total_length -= self._lengths.pop(url)
+        for term in set(title) | set(body):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(url, None)
+                if not postings:
+                    del self._postings[term]
+
+
+    def _write(self, entries: List[dict]) -> None:
+        """Дописывает записи в журнал и применяет их; при накоплении устаревших строк сжимает журнал."""
+        if self._journal is None:
+            for entry in entries:
+                self._apply(entry)
+            return
+        self._journal.append(entries)
+        self._refresh()
+        if self._compact_threshold and self._stale >= max(self._compact_threshold, len(self._docs)):
+            self.compact()
+
+
+    def add_many(self, vacancies: List[Vacancy], stamp: Any = None) -> None:
+        """
+        Индексирует вакансии (с тем же URL — заменяются) одной записью в журнал.
+        :param stamp: новый отпечаток хранилища (None — не менять)
+        """
+        entries = [
+            {"op": "put", "url": v.url,
+             "title": dict(Counter(analyze(v.title))), "body": dict(Counter(analyze(v.description)))}
+            for v in vacancies
+        ]
+        if stamp is not None and stamp != self.stamp:
+            entries.append({"op": "meta", "stamp": stamp})
+        if entries:
+            self._write(entries)
+
+
+    def add(self, vacancy: Vacancy) -> None:
+        self.add_many([vacancy])
+
+
+    def remove(self, url: str) -> bool:
+        """Удаляет вакансию из индекса."""
+        if url not in self._docs:
+            return False
+        self._write([{"op": "del", "url": url}])
+        return True
+
+
+    def mark(self, stamp: Any) -> None:
+        """Запоминает отпечаток хранилища, которому теперь соответствует индекс."""
+        self.add_many([], stamp=stamp)
+
+
+    def clear(self) -> None:
+        """Очищает индекс (и журнал)."""
+        self._postings.clear()
+        self._docs.clear()
+        self._lengths.clear()
+        self._total_length = 0.0
+        self.stamp = None
+        self.compact()
+
+
+    def compact(self) -> None:
+        """Переписывает журнал, оставляя по одной строке на вакансию."""
+        self._stale = 0
+        if self._journal is None:
+            return
+        entries = [{"op": "meta", "stamp": self.stamp}] if self.stamp is not None else []
+        entries += (
+            {"op": "put", "url": url, "title": title, "body": body} for url, (title, body) in self._docs.items()
+        )
+        tmp_path = self._journal.write_snapshot(entries)
+        self._journal.install(tmp_path, self._journal.offset)
+
+
+    def search(self, text: str, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Возвращает до k пар (URL, оценка BM25) по убыванию релевантности.
+        Повтор слова в запросе не увеличивает его вес.
+        """
+        if k <= 0 or not self._docs:
+            return []
+        n = len(self._docs)
+        avg_length = self._total_length / n or 1.0
+        scores: Dict[str, float] = {}
+        for term in set(analyze(text)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for url, tf in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[url] / avg_length)
+                scores[url] = scores.get(url, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
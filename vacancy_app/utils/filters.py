@@ -1,12 +1,31 @@
+import heapq
+import itertools
 import re
 from typing import List, Optional
 from vacancy_app.models.vacancy import Vacancy
+from vacancy_app.storage.query import VacancyQuery
+from .keyword_index import KeywordIndex
+from .metrics import instrumented
+from .salary_index import SalaryIndex
 
 
-def filter_vacancies_by_keyword(vacancies: List[Vacancy], keywords: Optional[List[str]] = None) -> List[Vacancy]:
+@instrumented("filter", count_result=True, function="by_keyword")
+def filter_vacancies_by_keyword(
+    vacancies: List[Vacancy],
+    keywords: Optional[List[str]] = None,
+    index: Optional[KeywordIndex] = None,
+) -> List[Vacancy]:
     """
     Фильтрует вакансии по наличию ключевых слов в названии или описании.
+    Без индекса ищется подстрока в каждом тексте. С индексом (KeywordIndex) совпадения
+    берутся из индекса, а из списка остаются вакансии с найденными URL в исходном порядке,
+    без поиска по текстам; в этом случае ключевое слово должно совпасть со словом текста
+    целиком («pyth» найдёт «pyth», но не «python»).
     """
+    if index is not None and keywords:
+        found = {v.url for v in index.search(keywords)}
+        return [v for v in vacancies or [] if v.url in found]
+
     if not vacancies:
         return []
 
@@ -20,14 +39,22 @@ def filter_vacancies_by_keyword(vacancies: List[Vacancy], keywords: Optional[Lis
     ]
 
 
+@instrumented("filter", count_result=True, function="by_salary_range")
 def filter_vacancies_by_salary_range(
     vacancies: List[Vacancy],
     min_salary: Optional[int] = None,
-    max_salary: Optional[int] = None
+    max_salary: Optional[int] = None,
+    index: Optional[SalaryIndex] = None,
 ) -> List[Vacancy]:
     """
     Фильтрует вакансии по диапазону зарплат.
+    С индексом (SalaryIndex) диапазон находится бинарным поиском, а из списка остаются
+    вакансии с найденными URL в исходном порядке, без вычисления зарплаты каждой.
     """
+    if index is not None:
+        found = {v.url for v in index.range(min_salary, max_salary)}
+        return [v for v in vacancies or [] if v.url in found]
+
     if not vacancies:
         return []
 
@@ -42,6 +69,7 @@ def filter_vacancies_by_salary_range(
     return result
 
 
+@instrumented("filter", count_result=True, function="sort_by_salary")
 def sort_vacancies_by_salary(vacancies: List[Vacancy], reverse: bool = True) -> List[Vacancy]:
     """
     Сортирует вакансии по средней зарплате.
@@ -50,3 +78,34 @@ def sort_vacancies_by_salary(vacancies: List[Vacancy], reverse: bool = True) ->
         return []
     return sorted(vacancies, key=lambda v: v.average_salary(), reverse=reverse)
 
+
+
+@instrumented("filter", count_result=True, function="top_n_by_salary")
+def top_n_by_salary(vacancies: List[Vacancy], n: int, index: Optional[SalaryIndex] = None) -> List[Vacancy]:
+    """
+    Возвращает N вакансий с наибольшей средней зарплатой.
+    Без индекса используется ограниченная куча: O(n log N) вместо полной сортировки.
+    С индексом (SalaryIndex) вакансии списка выбираются обходом индекса от большей зарплаты.
+    """
+    if not vacancies or n <= 0:
+        return []
+    if index is not None:
+        by_url = {v.url: v for v in vacancies}
+        found = (by_url[v.url] for v in index.descending() if v.url in by_url)
+        return list(itertools.islice(found, n))
+    return heapq.nlargest(n, vacancies, key=lambda v: v.average_salary())
+
+
+def keyword_query(keywords: Optional[List[str]] = None, match_all: bool = False) -> VacancyQuery:
+    """Запрос к хранилищу: вакансии с ключевыми словами в названии или описании."""
+    return VacancyQuery(keywords=list(keywords or []), match_all=match_all)
+
+
+def salary_range_query(min_salary: Optional[int] = None, max_salary: Optional[int] = None) -> VacancyQuery:
+    """Запрос к хранилищу: вакансии со средней зарплатой в диапазоне."""
+    return VacancyQuery(salary_min=min_salary, salary_max=max_salary)
+
+
+def top_salary_query(n: int) -> VacancyQuery:
+    """Запрос к хранилищу: N вакансий с наибольшей средней зарплатой."""
+    return VacancyQuery(sort_by="salary", descending=True, limit=max(n, 0))
@@ -0,0 +1,107 @@
+import re
+from typing import Dict, Iterable, List, Optional, Set, Union
+from vacancy_app.models.vacancy import Vacancy
+
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize_token(token: str) -> str:
+    """Приводит слово к нормальной форме: casefold (в т. ч. для кириллицы) и ё → е."""
+    return token.casefold().replace("ё", "е")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Разбивает текст на нормализованные слова (буквы и цифры любых алфавитов)."""
+    return [normalize_token(t) for t in _TOKEN_RE.findall(text or "")]
+
+
+class KeywordIndex:
+    """
+    Инвертированный индекс по словам названия и описания вакансий.
+    Для каждого слова хранится множество внутренних номеров вакансий (posting list),
+    поэтому запросы «любое из слов» и «все слова» решаются объединением или пересечением
+    множеств без просмотра текстов. Вакансии идентифицируются по URL.
+    """
+
+
+    def __init__(self, vacancies: Optional[Iterable[Vacancy]] = None):
+        self._postings: Dict[str, Set[int]] = {}
+        self._docs: Dict[int, Vacancy] = {}  # номер -> вакансия
+        self._tokens: Dict[int, Set[str]] = {}  # номер -> слова вакансии (для удаления)
+        self._ids: Dict[str, int] = {}  # URL -> номер
+        self._next_id = 0
+        for vacancy in vacancies or []:
+            self.add(vacancy)
+
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._ids
+
+
+    def add(self, vacancy: Vacancy) -> None:
+        """Добавляет вакансию; вакансия с тем же URL заменяется, сохраняя свою позицию."""
+        doc_id = self._ids.get(vacancy.url)
+        if doc_id is None:
+            doc_id = self._next_id
+            self._next_id += 1
+            self._ids[vacancy.url] = doc_id
+        else:
+            self._unlink(doc_id)
+
+        tokens = set(tokenize(vacancy.title)) | set(tokenize(vacancy.description))
+        for token in tokens:
+            self._postings.setdefault(token, set()).add(doc_id)
+        self._docs[doc_id] = vacancy
+        self._tokens[doc_id] = tokens
+
+
+    def remove(self, identifier: Union[str, Vacancy]) -> bool:
+        """Удаляет вакансию по URL или объекту Vacancy."""
+        url = identifier.url if isinstance(identifier, Vacancy) else identifier
+        doc_id = self._ids.pop(url, None)
+        if doc_id is None:
+            return False
+        self._unlink(doc_id)
+        del self._docs[doc_id]
+        return True
+
+
+    def _unlink(self, doc_id: int) -> None:
+        """Убирает номер вакансии из posting lists её слов."""
+        for token in self._tokens.pop(doc_id, ()):
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.discard(doc_id)
+                if not postings:
+                    del self._postings[token]
+
+
+    def _keyword_postings(self, keyword: str) -> Set[int]:
+        """Номера вакансий, содержащих все слова ключевой фразы."""
+        tokens = tokenize(keyword)
+        if not tokens:
+            return set()
+        sets = sorted((self._postings.get(t, set()) for t in tokens), key=len)
+        return set.intersection(*sets) if len(sets) > 1 else set(sets[0])
+
+
+    def search(self, keywords: Iterable[str], match_all: bool = False) -> List[Vacancy]:
+        """
+        Возвращает вакансии, содержащие любое (или, при match_all, каждое) из ключевых слов,
+        в порядке добавления в индекс. Слова сравниваются целиком, без учёта регистра.
+        """
+        postings = [self._keyword_postings(k) for k in keywords if k and k.strip()]
+        if not postings:
+            return [self._docs[i] for i in sorted(self._docs)]
+
+        if match_all:
+            postings.sort(key=len)
+            found = postings[0].intersection(*postings[1:])
+        else:
+            found = set().union(*postings)
+        return [self._docs[i] for i in sorted(found)]
@@ -0,0 +1,213 @@
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_Key = Tuple[str, Tuple[Tuple[str, str], ...]]  # (имя метрики, отсортированные метки)
+
+
+def _key(name: str, labels: Dict[str, Any]) -> _Key:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Histogram:
+    """Гистограмма с фиксированными верхними границами корзин (как в Prometheus)."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[int]:
+        """Накопленные значения по корзинам (le=bound), без корзины +Inf."""
+        total, result = 0, []
+        for c in self.counts:
+            total += c
+            result.append(total)
+        return result
+
+
+class MetricsRegistry:
+    """
+    Лёгкий реестр метрик: счётчики, значения (gauge) и гистограммы с метками.
+    По умолчанию выключен: инструментированный код проверяет один флаг enabled
+    и при выключенном реестре ничего не измеряет.
+    """
+
+
+    def __init__(self):
+        self.enabled = False
+        self._counters: Dict[_Key, float] = {}
+        self._gauges: Dict[_Key, float] = {}
+        self._histograms: Dict[_Key, Histogram] = {}
+        self._lock = threading.Lock()
+
+
+    def enable(self) -> None:
+        self.enabled = True
+
+
+    def disable(self) -> None:
+        self.enabled = False
+
+
+    def reset(self) -> None:
+        """Удаляет все накопленные значения."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Увеличивает счётчик."""
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+
+    def set(self, name: str, value: float, **labels: Any) -> None:
+        """Устанавливает значение метрики-показателя (gauge)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._gauges[_key(name, labels)] = value
+
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Добавляет наблюдение в гистограмму."""
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        """Замеряет длительность блока в секундах и пишет её в гистограмму name."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Снимок всех метрик в виде словаря (удобно для JSON и тестов)."""
+        with self._lock:
+            return {
+                "counters": [
+                    {"name": n, "labels": dict(l), "value": v} for (n, l), v in sorted(self._counters.items())
+                ],
+                "gauges": [
+                    {"name": n, "labels": dict(l), "value": v} for (n, l), v in sorted(self._gauges.items())
+                ],
+                "histograms": [
+                    {
+                        "name": n, "labels": dict(l), "count": h.count, "sum": h.sum,
+                        "buckets": dict(zip(map(str, h.buckets), h.cumulative())),
+                    }
+                    for (n, l), h in sorted(self._histograms.items(), key=lambda item: item[0])
+                ],
+            }
+
+
+    def value(self, name: str, **labels: Any) -> float:
+        """Текущее значение счётчика или показателя (0, если его ещё нет)."""
+        key = _key(name, labels)
+        with self._lock:
+            return self._counters.get(key, self._gauges.get(key, 0))
+
+
+    def histogram(self, name: str, **labels: Any) -> Optional[Histogram]:
+        with self._lock:
+            return self._histograms.get(_key(name, labels))
+
+
+    def to_prometheus(self) -> str:
+        """Экспорт в текстовом формате Prometheus (exposition format 0.0.4)."""
+        lines: List[str] = []
+        with self._lock:
+            for kind, store in (("counter", self._counters), ("gauge", self._gauges)):
+                for name in sorted({n for n, _ in store}):
+                    lines.append(f"# TYPE {name} {kind}")
+                    for (n, labels), v in sorted(store.items()):
+                        if n == name:
+                            lines.append(f"{name}{_format_labels(labels)} {_format_value(v)}")
+            for name in sorted({n for n, _ in self._histograms}):
+                lines.append(f"# TYPE {name} histogram")
+                for (n, labels), h in sorted(self._histograms.items(), key=lambda item: item[0]):
+                    if n != name:
+                        continue
+                    for bound, count in zip(h.buckets, h.cumulative()):
+                        le = labels + (("le", _format_value(bound)),)
+                        lines.append(f"{name}_bucket{_format_labels(le)} {count}")
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {h.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(h.sum)}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {h.count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _escape(value: str) -> str:
+    """Экранирует значение метки: обратный слэш, кавычка и перевод строки."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+registry = MetricsRegistry()  # общий реестр приложения; включается registry.enable()
+
+
+def instrumented(name: str, count_result: bool = False, **labels: Any) -> Callable:
+    """
+    Декоратор: замеряет длительность вызова в гистограмме {name}_seconds
+    и считает вызовы в {name}_calls_total. При count_result размер результата
+    добавляется в {name}_records_total. При выключенном реестре — один проверочный if.
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            result = None
+            try:
+                result = func(*args, **kwargs)
+                return result
+            finally:
+                registry.observe(f"{name}_seconds", time.perf_counter() - start, **labels)
+                registry.inc(f"{name}_calls_total", **labels)
+                if count_result and result is not None:
+                    registry.inc(f"{name}_records_total", len(result), **labels)
+        return wrapper
+    return decorator
@@ -0,0 +1,199 @@
+import random
+import zlib
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from vacancy_app.models.vacancy import Vacancy
+from .keyword_index import tokenize
+
+try:  # numpy ускоряет вычисление подписей, но не обязателен
+    import numpy as np
+except ImportError:  # pragma: no cover - зависит от окружения
+    np = None
+
+
+_PRIME = (1 << 31) - 1  # модуль хеш-функций вида (a * x + b) % p; a * x помещается в int64
+
+
+def shingles(vacancy: Vacancy, size: int = 3) -> Set[int]:
+    """
+    Шинглы вакансии: хеши последовательностей из size слов названия, работодателя и описания.
+    Короткий текст (меньше size слов) даёт один шингл из всех слов.
+    """
+    tokens = tokenize(vacancy.title) + tokenize(vacancy.employer) + tokenize(vacancy.description)
+    if len(tokens) < size:
+        grams = [" ".join(tokens)] if tokens else []
+    else:
+        grams = [" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)]
+    return {zlib.crc32(g.encode("utf-8")) % _PRIME for g in grams}
+
+
+class NearDuplicateDetector:
+    """
+    Поиск почти одинаковых вакансий (перепубликаций под новым URL) методом MinHash + LSH.
+    Для каждой вакансии считается MinHash-подпись из num_perm значений, подпись делится
+    на bands полос; вакансии, совпавшие хотя бы в одной полосе, становятся кандидатами
+    и проверяются по оценке сходства Жаккара (доля совпавших значений подписи).
+    Поэтому работа растёт примерно линейно с числом вакансий, без сравнения всех пар.
+    """
+
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        num_perm: int = 128,
+        bands: int = 16,
+        shingle_size: int = 3,
+        seed: int = 1,
+    ):
+        """
+        :param threshold: минимальное оценённое сходство Жаккара для дубликата
+        :param num_perm: длина MinHash-подписи; должна делиться на bands
+        :param bands: число полос LSH (больше полос — больше кандидатов при низком сходстве)
+        :param shingle_size: длина шингла в словах
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm должно делиться на bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self._seed = seed
+        rng = random.Random(seed)
+        self._a = [rng.randrange(1, _PRIME) for _ in range(num_perm)]
+        self._b = [rng.randrange(0, _PRIME) for _ in range(num_perm)]
+        if np is not None:
+            self._np_a = np.array(self._a, dtype=np.int64)[:, None]
+            self._np_b = np.array(self._b, dtype=np.int64)[:, None]
+        self._rows = num_perm // bands
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[str]] = {}  # (полоса, значения) -> URL
+        self._signatures: Dict[str, Tuple[int, ...]] = {}  # URL -> подпись
+
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._signatures
+
+
+    def signature(self, vacancy: Vacancy) -> Tuple[int, ...]:
+        """MinHash-подпись вакансии."""
+        values = shingles(vacancy, self.shingle_size)
+        if not values:
+            return (_PRIME,) * self.num_perm  # пустой текст: значение вне диапазона хешей, в LSH не попадает
+        if np is not None:
+            x = np.fromiter(values, dtype=np.int64, count=len(values))[None, :]
+            return tuple(((self._np_a * x + self._np_b) % _PRIME).min(axis=1).tolist())
+        values = list(values)
+        return tuple([min([(a * x + b) % _PRIME for x in values]) for a, b in zip(self._a, self._b)])
+
+
+    def similarity(self, first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+        """Оценка сходства Жаккара по двум подписям."""
+        return sum(1 for x, y in zip(first, second) if x == y) / self.num_perm
+
+
+    def _bands(self, signature: Tuple[int, ...]) -> Iterable[Tuple[int, Tuple[int, ...]]]:
+        rows = self._rows
+        return ((band, signature[band * rows:(band + 1) * rows]) for band in range(self.bands))
+
+
+    def _find(self, url: str, signature: Tuple[int, ...]) -> List[Tuple[float, str]]:
+        """Дубликаты среди добавленных вакансий: [(сходство, URL)] по убыванию сходства."""
+        if signature[0] == _PRIME:
+            return []
+        candidates: Set[str] = set()
+        for key in self._bands(signature):
+            candidates |= self._buckets.get(key, set())
+        candidates.discard(url)
+        found = []
+        for other in candidates:
+            score = self.similarity(signature, self._signatures[other])
+            if score >= self.threshold:
+                found.append((score, other))
+        found.sort(key=lambda p: (-p[0], p[1]))
+        return found
+
+
+    def add(self, vacancy: Vacancy, signature: Optional[Tuple[int, ...]] = None) -> None:
+        """Добавляет вакансию в индекс; вакансия с тем же URL заменяется."""
+        self.remove(vacancy.url)
+        signature = signature or self.signature(vacancy)
+        self._signatures[vacancy.url] = signature
+        if signature[0] == _PRIME:
+            return
+        for key in self._bands(signature):
+            self._buckets.setdefault(key, set()).add(vacancy.url)
+
+
+    def remove(self, url: str) -> bool:
+        """Удаляет вакансию из индекса."""
+        signature = self._signatures.pop(url, None)
+        if signature is None:
+            return False
+        for key in self._bands(signature):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(url)
+                if not bucket:
+                    del self._buckets[key]
+        return True
+
+
+    def query(self, vacancy: Vacancy) -> List[str]:
+        """URL добавленных вакансий, почти совпадающих с данной (самые похожие — первыми)."""
+        return [url for _, url in self._find(vacancy.url, self.signature(vacancy))]
+
+
+    def check_and_add(self, vacancy: Vacancy) -> Optional[str]:
+        """
+        Инкрементальный режим для загрузки: если вакансия — почти дубликат уже добавленной,
+        возвращает URL оригинала и не добавляет её; иначе добавляет и возвращает None.
+        Вакансия с уже известным URL считается обновлением, а не дубликатом.
+        """
+        signature = self.signature(vacancy)
+        found = self._find(vacancy.url, signature)
+        if found:
+            return found[0][1]
+        self.add(vacancy, signature)
+        return None
+
+
+    def cluster(self, vacancies: Iterable[Vacancy]) -> List[List[Vacancy]]:
+        """
+        Пакетный режим: группирует вакансии в кластеры почти дубликатов (объединение
+        найденных пар, union-find). Возвращает только кластеры из двух и более вакансий,
+        вакансии в кластере — в исходном порядке. Индекс детектора не изменяется.
+        """
+        vacancies = list(vacancies)
+        detector = NearDuplicateDetector(self.threshold, self.num_perm, self.bands, self.shingle_size, self._seed)
+
+        parent = list(range(len(vacancies)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        positions: Dict[str, int] = {}
+        for i, vacancy in enumerate(vacancies):
+            signature = detector.signature(vacancy)
+            for _, url in detector._find(vacancy.url, signature):
+                root, other = find(i), find(positions[url])
+                if root != other:
+                    parent[max(root, other)] = min(root, other)
+            detector.add(vacancy, signature)
+            positions[vacancy.url] = i
+
+        groups: Dict[int, List[Vacancy]] = {}
+        for i, vacancy in enumerate(vacancies):
+            groups.setdefault(find(i), []).append(vacancy)
+        return [group for group in groups.values() if len(group) > 1]
+
+
+    def deduplicate(self, vacancies: Iterable[Vacancy]) -> List[Vacancy]:
+        """Оставляет из каждого кластера почти дубликатов первую вакансию; порядок сохраняется."""
+        vacancies = list(vacancies)
+        extra = {id(v) for group in self.cluster(vacancies) for v in group[1:]}
+        return [v for v in vacancies if id(v) not in extra]
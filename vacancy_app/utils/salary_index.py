@@ -0,0 +1,82 @@
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from vacancy_app.models.vacancy import Vacancy
+
+
+class SalaryIndex:
+    """
+    Индекс вакансий по средней зарплате: отсортированный массив пар
+    (средняя зарплата, номер вакансии). Поиск по диапазону выполняется двумя
+    бинарными поисками (bisect) за O(log n), топ-N берётся с конца массива.
+    Вставка и удаление сохраняют сортировку (bisect + сдвиг элементов списка).
+    Вакансии идентифицируются по URL.
+    """
+
+
+    def __init__(self, vacancies: Optional[Iterable[Vacancy]] = None):
+        self._keys: List[Tuple[float, int]] = []  # (зарплата, -номер) по возрастанию
+        self._salaries: List[float] = []  # параллельный список зарплат для bisect по числу
+        self._docs: Dict[int, Vacancy] = {}
+        self._ids: Dict[str, int] = {}  # URL -> номер
+        self._next_id = 0
+        for vacancy in vacancies or []:
+            self.add(vacancy)
+
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+
+    def add(self, vacancy: Vacancy) -> None:
+        """Добавляет вакансию; вакансия с тем же URL заменяется."""
+        doc_id = self._ids.get(vacancy.url)
+        if doc_id is None:
+            doc_id = self._next_id
+            self._next_id += 1
+            self._ids[vacancy.url] = doc_id
+        else:
+            self._unlink(doc_id)
+
+        key = (vacancy.average_salary(), -doc_id)  # при равной зарплате раньше добавленные — выше в топе
+        pos = bisect_left(self._keys, key)
+        self._keys.insert(pos, key)
+        self._salaries.insert(pos, key[0])
+        self._docs[doc_id] = vacancy
+
+
+    def remove(self, identifier: Union[str, Vacancy]) -> bool:
+        """Удаляет вакансию по URL или объекту Vacancy."""
+        url = identifier.url if isinstance(identifier, Vacancy) else identifier
+        doc_id = self._ids.pop(url, None)
+        if doc_id is None:
+            return False
+        self._unlink(doc_id)
+        return True
+
+
+    def _unlink(self, doc_id: int) -> None:
+        vacancy = self._docs.pop(doc_id)
+        pos = bisect_left(self._keys, (vacancy.average_salary(), -doc_id))
+        del self._keys[pos]
+        del self._salaries[pos]
+
+
+    def range(self, min_salary: Optional[float] = None, max_salary: Optional[float] = None) -> List[Vacancy]:
+        """Вакансии со средней зарплатой в [min_salary, max_salary] в порядке добавления."""
+        lo = 0 if min_salary is None else bisect_left(self._salaries, min_salary)
+        hi = len(self._salaries) if max_salary is None else bisect_right(self._salaries, max_salary)
+        ids = sorted(-neg_id for _, neg_id in self._keys[lo:hi])
+        return [self._docs[i] for i in ids]
+
+
+    def top(self, n: int) -> List[Vacancy]:
+        """N вакансий с наибольшей средней зарплатой, по убыванию."""
+        if n <= 0:
+            return []
+        return [self._docs[-neg_id] for _, neg_id in reversed(self._keys[-n:])]
+
+
+    def descending(self) -> Iterator[Vacancy]:
+        """Вакансии по убыванию средней зарплаты (лениво, с конца массива)."""
+        for _, neg_id in reversed(self._keys):
+            yield self._docs[-neg_id]